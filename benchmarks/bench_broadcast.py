@@ -0,0 +1,90 @@
+import asyncio
+import random
+import statistics
+from datetime import datetime
+from time import perf_counter
+
+from chat_realtime_api.api.v1.routers.ws.manager import (
+    ConnectionManager,
+    Message,
+)
+
+ROOM_SIZES = [10, 1_000, 10_000]
+BROADCASTS = 20
+SEQUENTIAL_MAX_ROOM_SIZE = 1_000
+MEAN_SEND_LATENCY = 0.002
+
+
+class FakeWebSocket:
+    def __init__(self, started: list[float], latencies: list[float]):
+        self.started = started
+        self.latencies = latencies
+
+    async def accept(self):
+        pass
+
+    async def send_text(self, data):
+        await asyncio.sleep(random.expovariate(1 / MEAN_SEND_LATENCY))
+        self.latencies.append(perf_counter() - self.started[0])
+
+
+async def sequential_broadcast(manager, room_id, message):
+    for connection in manager.active_connections[room_id].values():
+        await manager.send_message(message, connection.websocket)
+
+
+async def run(room_size: int, sequential: bool) -> list[float]:
+    manager = ConnectionManager(send_timeout=1.0)
+    started, latencies = [0.0], []
+    writers = []
+    for _ in range(room_size):
+        connection = await manager.connect(
+            'room', FakeWebSocket(started, latencies)
+        )
+        if not sequential:
+            writers.append(
+                asyncio.create_task(manager.run_writer('room', connection))
+            )
+
+    message = Message(content='Hello', user='bench', timestamp=datetime.now())
+    broadcasts = 1 if sequential else BROADCASTS
+    for broadcast in range(1, broadcasts + 1):
+        started[0] = perf_counter()
+        if sequential:
+            await sequential_broadcast(manager, 'room', message)
+            continue
+
+        await manager.broadcast('room', message)
+        while len(latencies) < broadcast * room_size:
+            await asyncio.sleep(0.001)
+
+    for writer in writers:
+        writer.cancel()
+
+    return latencies
+
+
+def p99(latencies: list[float]) -> float:
+    return statistics.quantiles(latencies, n=100)[98] * 1000
+
+
+def main():
+    random.seed(0)
+    print(f'{"members":>8} {"mode":>11} {"p50 ms":>10} {"p99 ms":>10}')
+    for room_size in ROOM_SIZES:
+        modes = [False]
+        if room_size <= SEQUENTIAL_MAX_ROOM_SIZE:
+            modes.append(True)
+
+        for sequential in modes:
+            latencies = asyncio.run(run(room_size, sequential))
+            print(
+                f'{room_size:>8} '
+                f'{"sequential" if sequential else "concurrent":>11} '
+                f'{statistics.median(latencies) * 1000:>10.2f} '
+                f'{p99(latencies):>10.2f}'
+            )
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,189 @@
+import tracemalloc
+from dataclasses import dataclass
+from datetime import datetime, timedelta
+from time import perf_counter
+from uuid import UUID, uuid4
+
+from sqlalchemy import create_engine, insert
+from sqlalchemy.orm import Session
+
+from chat_realtime_api.api.v1.schemas.history import MessageSchema, UserSchema
+from chat_realtime_api.infra.models.base import table_registry
+from chat_realtime_api.infra.models.messages import MessageModel
+from chat_realtime_api.infra.models.rooms import RoomModel
+from chat_realtime_api.infra.models.users import UserModel
+from chat_realtime_api.infra.sqlalchemy_repositories.messages import (
+    SqlAlchemyMessageRepository,
+    history_page_query,
+    message_rows_to_outputs,
+)
+from chat_realtime_api.infra.sqlalchemy_repositories.rooms import (
+    SqlAlchemyRoomRepository,
+)
+from chat_realtime_api.services.rooms.get_history import GetHistoryService
+
+PAGE_SIZE = 1_000
+AUTHORS = 20
+RUNS = 50
+
+
+# the pre-slots DTO chain: repository -> service -> response schema
+@dataclass
+class LegacyUserRepoOutput:
+    id: UUID
+    name: str
+
+
+@dataclass
+class LegacyMessageRepoOutput:
+    id: UUID
+    room_id: UUID
+    user: LegacyUserRepoOutput
+    content: str
+    timestamp: datetime
+
+
+@dataclass
+class LegacyUserOutput:
+    id: UUID
+    name: str
+
+
+@dataclass
+class LegacyMessageOutput:
+    id: UUID
+    room_id: UUID
+    user: LegacyUserOutput
+    content: str
+    timestamp: datetime
+
+
+def legacy_page(rows) -> list[MessageSchema]:
+    repo_outputs = [
+        LegacyMessageRepoOutput(
+            id=row.id,
+            room_id=row.room_id,
+            user=LegacyUserRepoOutput(id=row.user_id, name=row.user_name),
+            content=row.content,
+            timestamp=row.timestamp,
+        )
+        for row in rows
+    ]
+    service_outputs = [
+        LegacyMessageOutput(
+            id=msg.id,
+            room_id=msg.room_id,
+            user=LegacyUserOutput(id=msg.user.id, name=msg.user.name),
+            content=msg.content,
+            timestamp=msg.timestamp,
+        )
+        for msg in repo_outputs
+    ]
+
+    return [
+        MessageSchema(
+            id=msg.id,
+            room_id=msg.room_id,
+            user=UserSchema(id=msg.user.id, name=msg.user.name),
+            content=msg.content,
+            timestamp=msg.timestamp,
+        )
+        for msg in service_outputs
+    ]
+
+
+def lean_page(rows):
+    return message_rows_to_outputs(rows)
+
+
+def seed(session: Session) -> UUID:
+    room_id = uuid4()
+    users = [uuid4() for _ in range(AUTHORS)]
+    session.execute(
+        insert(UserModel),
+        [
+            {
+                'id': user_id,
+                'name': f'bench {i}',
+                'username': f'bench{i}@test.com',
+                'password': 'x',
+            }
+            for i, user_id in enumerate(users)
+        ],
+    )
+    session.commit()
+    session.add(
+        RoomModel(
+            name='bench', description='', id=room_id, creator_id=users[0]
+        )
+    )
+    session.commit()
+
+    start = datetime(2024, 1, 1)
+    session.execute(
+        insert(MessageModel),
+        [
+            {
+                'id': uuid4(),
+                'room_id': room_id,
+                'user_id': users[i % AUTHORS],
+                'content': f'Message {i}',
+                'timestamp': start + timedelta(seconds=i),
+            }
+            for i in range(PAGE_SIZE)
+        ],
+    )
+    session.commit()
+
+    return room_id
+
+
+def measure(build, rows) -> tuple[int, int, int, float]:
+    tracemalloc.start()
+    page = build(rows)
+    retained, peak = tracemalloc.get_traced_memory()
+    blocks = sum(
+        stat.count for stat in tracemalloc.take_snapshot().statistics('lineno')
+    )
+    tracemalloc.stop()
+    del page
+
+    start = perf_counter()
+    for _ in range(RUNS):
+        build(rows)
+    elapsed = (perf_counter() - start) / RUNS * 1_000
+
+    return retained, peak, blocks, elapsed
+
+
+def main():
+    engine = create_engine('sqlite://')
+    table_registry.metadata.create_all(engine)
+
+    with Session(engine) as session:
+        room_id = seed(session)
+        rows = session.execute(history_page_query(room_id, 1, PAGE_SIZE)).all()
+
+        history = GetHistoryService(
+            SqlAlchemyMessageRepository(session),
+            SqlAlchemyRoomRepository(session),
+        ).execute(room_id, 1, PAGE_SIZE)
+        assert len(history.messages) == PAGE_SIZE
+
+    print(f'{PAGE_SIZE} messages per page, {AUTHORS} authors')
+    print(
+        f'{"path":>8} {"retained KiB":>13} {"peak KiB":>9} '
+        f'{"blocks":>7} {"ms/page":>8}'
+    )
+    for name, build in [('legacy', legacy_page), ('lean', lean_page)]:
+        retained, peak, blocks, elapsed = measure(build, rows)
+        print(
+            f'{name:>8} {retained / 1024:>13.1f} {peak / 1024:>9.1f} '
+            f'{blocks:>7} {elapsed:>8.2f}'
+        )
+
+    engine.dispose()
+
+
+if __name__ == '__main__':
+    main()
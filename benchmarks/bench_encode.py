@@ -0,0 +1,50 @@
+import json
+from datetime import datetime
+from time import process_time
+
+from chat_realtime_api.api.v1.routers.ws.manager import (
+    ConnectionManager,
+    Message,
+    encode,
+)
+
+ROOM_SIZE = 2_000
+BROADCASTS = 50
+
+
+def per_recipient(message: Message) -> list[str]:
+    return [
+        json.dumps(
+            ConnectionManager.message_payload(message),
+            separators=(',', ':'),
+            ensure_ascii=False,
+        )
+        for _ in range(ROOM_SIZE)
+    ]
+
+
+def once(message: Message) -> list[str]:
+    frame = encode(ConnectionManager.message_payload(message))
+
+    return [frame for _ in range(ROOM_SIZE)]
+
+
+def measure(encoder) -> float:
+    message = Message(
+        content='Hello ' * 20, user='bench', timestamp=datetime.now()
+    )
+    start = process_time()
+    for _ in range(BROADCASTS):
+        encoder(message)
+
+    return (process_time() - start) / (BROADCASTS * ROOM_SIZE) * 1_000_000
+
+
+def main():
+    print(f'{"mode":>14} {"us/recipient":>14}')
+    for name, encoder in [('per recipient', per_recipient), ('once', once)]:
+        print(f'{name:>14} {measure(encoder):>14.3f}')
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,47 @@
+import asyncio
+import os
+from time import perf_counter
+
+from chat_realtime_api.infra.config.security import (
+    PasswordHasher,
+    get_password_hash,
+)
+from chat_realtime_api.infra.config.settings import Settings
+
+LOGINS = 64
+
+
+async def run(workers: int, hashed_password: str) -> float:
+    hasher = PasswordHasher().init(
+        Settings(HASH_EXECUTOR_WORKERS=workers, HASH_EXECUTOR_QUEUE=LOGINS)
+    )
+
+    start = perf_counter()
+    await asyncio.gather(*[
+        hasher.verify('secret', hashed_password) for _ in range(LOGINS)
+    ])
+    elapsed = perf_counter() - start
+
+    hasher.shutdown()
+
+    return LOGINS / elapsed
+
+
+def main():
+    settings = Settings()
+    hashed_password = get_password_hash('secret')
+    cores = os.cpu_count() or 1
+
+    print(
+        f'argon2 time_cost={settings.ARGON2_TIME_COST} '
+        f'memory_cost={settings.ARGON2_MEMORY_COST} '
+        f'parallelism={settings.ARGON2_PARALLELISM}, {cores} cores'
+    )
+    print(f'{"workers":>8} {"logins/s":>10} {"per worker":>11}')
+    for workers in sorted({1, 2, cores // 2 or 1, cores}):
+        rate = asyncio.run(run(workers, hashed_password))
+        print(f'{workers:>8} {rate:>10.1f} {rate / workers:>11.1f}')
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,110 @@
+import statistics
+import tempfile
+from datetime import datetime, timedelta
+from pathlib import Path
+from time import perf_counter
+from uuid import uuid4
+
+from sqlalchemy import create_engine, insert
+from sqlalchemy.orm import Session
+
+from chat_realtime_api.infra.models.base import table_registry
+from chat_realtime_api.infra.models.messages import MessageModel
+from chat_realtime_api.infra.models.rooms import RoomModel
+from chat_realtime_api.infra.models.users import UserModel
+from chat_realtime_api.infra.sqlalchemy_repositories.messages import (
+    SqlAlchemyMessageRepository,
+)
+from chat_realtime_api.repositories.messages import MessageCursor
+
+MESSAGES = 150_000
+PAGE_SIZE = 10
+PAGES = [1, 100, 10_000]
+RUNS = 20
+BATCH = 10_000
+
+
+def seed(session: Session):
+    user_id, room_id = uuid4(), uuid4()
+    session.add(
+        UserModel(
+            messages=[],
+            name='bench',
+            username='bench@test.com',
+            password='x',
+            id=user_id,
+        )
+    )
+    session.add(
+        RoomModel(name='bench', description='', id=room_id, creator_id=user_id)
+    )
+    session.commit()
+
+    start = datetime(2024, 1, 1)
+    for offset in range(0, MESSAGES, BATCH):
+        session.execute(
+            insert(MessageModel),
+            [
+                {
+                    'id': uuid4(),
+                    'room_id': room_id,
+                    'user_id': user_id,
+                    'content': f'Message {i}',
+                    'timestamp': start + timedelta(seconds=i),
+                }
+                for i in range(offset, offset + BATCH)
+            ],
+        )
+    session.commit()
+
+    return room_id
+
+
+def timed(func) -> float:
+    samples = []
+    for _ in range(RUNS):
+        start = perf_counter()
+        func()
+        samples.append(perf_counter() - start)
+
+    return statistics.median(samples) * 1000
+
+
+def main():
+    with tempfile.TemporaryDirectory() as directory:
+        engine = create_engine(f'sqlite:///{Path(directory) / "bench.db"}')
+        table_registry.metadata.create_all(engine)
+
+        with Session(engine) as session:
+            room_id = seed(session)
+            repo = SqlAlchemyMessageRepository(session)
+
+            print(f'{"page":>8} {"offset ms":>10} {"cursor ms":>10}')
+            for page in PAGES:
+                boundary = repo.get_history_by_room_id(
+                    room_id, page, PAGE_SIZE
+                ).messages[0]
+                cursor = MessageCursor(boundary.timestamp, boundary.id)
+
+                offset_ms = timed(
+                    lambda: repo.get_history_by_room_id(
+                        room_id,
+                        page,
+                        PAGE_SIZE,
+                    )
+                )
+                cursor_ms = timed(
+                    lambda: repo.get_history_by_cursor(
+                        room_id,
+                        PAGE_SIZE,
+                        after=cursor,
+                    )
+                )
+                session.expunge_all()
+                print(f'{page:>8} {offset_ms:>10.2f} {cursor_ms:>10.2f}')
+
+        engine.dispose()
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,111 @@
+from datetime import datetime, timedelta
+from time import perf_counter
+from uuid import uuid4
+
+from fastapi.responses import JSONResponse
+from pydantic import TypeAdapter
+
+from chat_realtime_api.api.v1.responses.fast_json import ORJSONResponse
+from chat_realtime_api.api.v1.schemas.history import (
+    HistorySchema,
+    MessageSchema,
+    PaginationSchema,
+    UserSchema,
+)
+from chat_realtime_api.repositories.messages import (
+    MessageRepoOutput,
+    UserRepoOutput,
+)
+from chat_realtime_api.services.rooms.get_history import GetHistoryOutput
+
+PAGE_SIZE = 100
+RUNS = 2_000
+
+history_adapter = TypeAdapter(HistorySchema)
+
+
+def history_output() -> GetHistoryOutput:
+    room_id, user = uuid4(), UserRepoOutput(id=uuid4(), name='bench')
+    start = datetime(2024, 1, 1)
+
+    return GetHistoryOutput(
+        room_id=room_id,
+        messages=[
+            MessageRepoOutput(
+                id=uuid4(),
+                room_id=room_id,
+                user=user,
+                content=f'Message {i} ' * 5,
+                timestamp=start + timedelta(seconds=i),
+            )
+            for i in range(PAGE_SIZE)
+        ],
+        current_page=1,
+        page_size=PAGE_SIZE,
+        total_pages=10,
+        total_messages=PAGE_SIZE * 10,
+    )
+
+
+def pydantic_response(history: GetHistoryOutput) -> bytes:
+    schema = HistorySchema(
+        room_id=history.room_id,
+        messages=[
+            MessageSchema(
+                id=msg.id,
+                room_id=msg.room_id,
+                user=UserSchema(id=msg.user.id, name=msg.user.name),
+                content=msg.content,
+                timestamp=msg.timestamp,
+            )
+            for msg in history.messages
+        ],
+        pagination=PaginationSchema(
+            current_page=history.current_page,
+            page_size=history.page_size,
+            total_pages=history.total_pages,
+            total_messages=history.total_messages,
+        ),
+    )
+    # what FastAPI does with a response_model: validate, dump, render
+    validated = history_adapter.validate_python(schema, from_attributes=True)
+    content = history_adapter.dump_python(validated, mode='json')
+
+    return JSONResponse(content).body
+
+
+def orjson_response(history: GetHistoryOutput) -> bytes:
+    return ORJSONResponse({
+        'room_id': history.room_id,
+        'messages': history.messages,
+        'pagination': {
+            'current_page': history.current_page,
+            'page_size': history.page_size,
+            'total_pages': history.total_pages,
+            'total_messages': history.total_messages,
+        },
+        'cursors': None,
+    }).body
+
+
+def measure(render, history: GetHistoryOutput) -> float:
+    start = perf_counter()
+    for _ in range(RUNS):
+        render(history)
+
+    return (perf_counter() - start) / RUNS * 1_000_000
+
+
+def main():
+    history = history_output()
+
+    print(f'{"mode":>10} {"us/page":>10}')
+    for name, render in [
+        ('pydantic', pydantic_response),
+        ('orjson', orjson_response),
+    ]:
+        print(f'{name:>10} {measure(render, history):>10.1f}')
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,59 @@
+import json
+import statistics
+import subprocess
+import sys
+from time import perf_counter
+
+RUNS = 10
+
+CHILD = """
+import json
+from time import perf_counter
+
+start = perf_counter()
+from chat_realtime_api.app import app
+imported = perf_counter()
+
+from fastapi.testclient import TestClient
+
+with TestClient(app) as client:
+    started = perf_counter()
+    client.get('/')
+    served = perf_counter()
+
+print(json.dumps({
+    'import': imported - start,
+    'lifespan': started - imported,
+    'first_request': served - start,
+}))
+"""
+
+
+def run() -> dict:
+    start = perf_counter()
+    output = subprocess.run(
+        [sys.executable, '-c', CHILD],
+        capture_output=True,
+        check=True,
+        text=True,
+    ).stdout
+    timings = json.loads(output.splitlines()[-1])
+    timings['process'] = perf_counter() - start
+
+    return timings
+
+
+def main():
+    runs = [run() for _ in range(RUNS)]
+
+    print(f'{"phase":>14} {"median ms":>10} {"max ms":>8}')
+    for phase in ['import', 'lifespan', 'first_request', 'process']:
+        values = [timings[phase] * 1_000 for timings in runs]
+        print(
+            f'{phase:>14} {statistics.median(values):>10.1f} '
+            f'{max(values):>8.1f}'
+        )
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,115 @@
+import tempfile
+from datetime import datetime
+from pathlib import Path
+from time import perf_counter
+from uuid import uuid4
+
+from sqlalchemy import create_engine, insert, select
+from sqlalchemy.orm import Session, sessionmaker
+
+from chat_realtime_api.infra.db.session import enable_sqlite_foreign_keys
+from chat_realtime_api.infra.models.base import table_registry
+from chat_realtime_api.infra.models.messages import MessageModel
+from chat_realtime_api.infra.models.rooms import RoomModel
+from chat_realtime_api.infra.models.users import UserModel
+from chat_realtime_api.infra.sqlalchemy_repositories.messages import (
+    SqlAlchemyMessageRepository,
+)
+from chat_realtime_api.services.messages.create import (
+    CreateMessageInput,
+    CreateMessageService,
+)
+
+MESSAGES = 2_000
+HISTORY = 5_000
+
+
+def legacy_save(session: Session, input: CreateMessageInput):
+    session.scalar(select(RoomModel).where(RoomModel.id == input.room_id))
+    user = session.scalars(
+        select(UserModel).filter(UserModel.id == input.user_id)
+    ).first()
+    message_db = MessageModel(
+        id=uuid4(),
+        room_id=input.room_id,
+        content=input.content,
+        user_id=input.user_id,
+        timestamp=datetime.now(),
+        user=user,
+    )
+    session.add(message_db)
+    session.commit()
+    session.refresh(message_db)
+    return message_db.user.name
+
+
+def lean_save(session: Session, input: CreateMessageInput):
+    CreateMessageService(SqlAlchemyMessageRepository(session)).execute(input)
+
+
+def seed(session: Session) -> CreateMessageInput:
+    user_id, room_id = uuid4(), uuid4()
+    session.add(
+        UserModel(
+            messages=[],
+            name='bench',
+            username='bench@test.com',
+            password='x',
+            id=user_id,
+        )
+    )
+    session.commit()
+    session.add(
+        RoomModel(name='bench', description='', id=room_id, creator_id=user_id)
+    )
+    session.commit()
+    session.execute(
+        insert(MessageModel),
+        [
+            {
+                'id': uuid4(),
+                'room_id': room_id,
+                'user_id': user_id,
+                'content': 'old',
+                'timestamp': datetime.now(),
+            }
+            for _ in range(HISTORY)
+        ],
+    )
+    session.commit()
+
+    return CreateMessageInput(
+        room_id=room_id, content='Hello', user_id=user_id, user_name='bench'
+    )
+
+
+def run(save) -> float:
+    with tempfile.TemporaryDirectory() as directory:
+        engine = enable_sqlite_foreign_keys(
+            create_engine(f'sqlite:///{Path(directory) / "bench.db"}')
+        )
+        table_registry.metadata.create_all(engine)
+        session_factory = sessionmaker(engine)
+
+        with session_factory() as session:
+            input = seed(session)
+
+        start = perf_counter()
+        for _ in range(MESSAGES):
+            with session_factory() as session:
+                save(session, input)
+        elapsed = perf_counter() - start
+
+        engine.dispose()
+
+    return MESSAGES / elapsed
+
+
+def main():
+    print(f'{"path":>8} {"msg/s":>10}')
+    for name, save in [('legacy', legacy_save), ('lean', lean_save)]:
+        print(f'{name:>8} {run(save):>10.0f}')
+
+
+if __name__ == '__main__':
+    main()
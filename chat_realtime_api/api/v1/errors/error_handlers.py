@@ -1,7 +1,9 @@
 from fastapi import HTTPException
 
 from chat_realtime_api.services.errors.exceptions import (
+    ExecutorSaturatedException,
     InvalidCredentialsException,
+    InvalidCursorException,
     RoomAlreadyExistsException,
     RoomNotFoundException,
     UserAlreadyExistsException,
@@ -16,6 +18,8 @@ def handle_error(exception: Exception) -> HTTPException:
         InvalidCredentialsException: (401, 'InvalidCredentials'),
         RoomAlreadyExistsException: (409, 'RoomAlreadyExists'),
         RoomNotFoundException: (404, 'RoomNotFound'),
+        ExecutorSaturatedException: (503, 'ServiceUnavailable'),
+        InvalidCursorException: (400, 'InvalidCursor'),
     }
 
     for exc_type, (status_code, error) in exception_map.items():
@@ -26,6 +30,11 @@ def handle_error(exception: Exception) -> HTTPException:
                     'error': error,
                     'message': exception.message,
                 },
+                headers=(
+                    {'Retry-After': str(exception.retry_after)}
+                    if isinstance(exception, ExecutorSaturatedException)
+                    else None
+                ),
             )
 
     return HTTPException(
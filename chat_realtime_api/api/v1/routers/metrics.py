@@ -0,0 +1,54 @@
+from dataclasses import asdict
+from http import HTTPStatus
+
+from fastapi import APIRouter
+
+from chat_realtime_api.api.v1.routers.ws.chat import get_chat_runtime
+from chat_realtime_api.api.v1.schemas.metrics import (
+    ExecutorStatsSchema,
+    MetricsSchema,
+    PoolStatsSchema,
+    RecentMessagesStatsSchema,
+    TokenCacheStatsSchema,
+    WebSocketStatsSchema,
+    WriteBehindStatsSchema,
+)
+from chat_realtime_api.infra.cache.recent_messages import (
+    get_recent_messages_cache,
+)
+from chat_realtime_api.infra.cache.tokens import get_token_cache
+from chat_realtime_api.infra.config.security import password_hasher
+from chat_realtime_api.infra.db.session import db
+
+router = APIRouter(prefix='/api/v1', tags=['metrics'])
+
+
+@router.get(
+    '/metrics',
+    status_code=HTTPStatus.OK,
+    response_model=MetricsSchema,
+)
+def get_metrics():
+    async_pool_stats = db.async_pool_stats()
+    runtime = get_chat_runtime()
+
+    return MetricsSchema(
+        db_pool=PoolStatsSchema(**asdict(db.pool_stats())),
+        db_async_pool=(
+            PoolStatsSchema(**asdict(async_pool_stats))
+            if async_pool_stats
+            else None
+        ),
+        db_executor=ExecutorStatsSchema(**asdict(db.executor.stats())),
+        hash_executor=ExecutorStatsSchema(**asdict(password_hasher.stats())),
+        websockets=WebSocketStatsSchema(**asdict(runtime.manager.stats())),
+        recent_messages=RecentMessagesStatsSchema(
+            **asdict(get_recent_messages_cache().stats())
+        ),
+        tokens=TokenCacheStatsSchema(**asdict(get_token_cache().stats())),
+        write_behind=(
+            WriteBehindStatsSchema(**asdict(runtime.write_behind.stats()))
+            if runtime.write_behind
+            else None
+        ),
+    )
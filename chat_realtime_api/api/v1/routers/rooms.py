@@ -2,22 +2,36 @@ from http import HTTPStatus
 from typing import Annotated, Dict
 from uuid import UUID
 
-from fastapi import APIRouter, Depends, Query
+from fastapi import APIRouter, Depends, Header, Query, Response
 from sqlalchemy.orm import Session
 
 from chat_realtime_api.api.v1.errors.error_handlers import handle_error
+from chat_realtime_api.api.v1.responses.fast_json import (
+    ORJSONResponse,
+    dumps,
+)
 from chat_realtime_api.api.v1.schemas.history import (
     HistorySchema,
-    MessageSchema,
     PaginationQuerySchema,
-    PaginationSchema,
-    UserSchema,
 )
 from chat_realtime_api.api.v1.schemas.rooms import (
     ListRoomOutputSchema,
     RoomInputSchema,
+    RoomListQuerySchema,
     RoomOutputSchema,
 )
+from chat_realtime_api.infra.cache.recent_messages import (
+    RecentMessagesCache,
+    get_recent_messages_cache,
+)
+from chat_realtime_api.infra.cache.repositories import (
+    CachedMessageRepository,
+    CachedRoomRepository,
+)
+from chat_realtime_api.infra.cache.rooms import (
+    RoomListCache,
+    get_room_list_cache,
+)
 from chat_realtime_api.infra.config.security import get_current_user
 from chat_realtime_api.infra.db.session import get_session
 from chat_realtime_api.infra.sqlalchemy_repositories.messages import (
@@ -26,12 +40,20 @@ from chat_realtime_api.infra.sqlalchemy_repositories.messages import (
 from chat_realtime_api.infra.sqlalchemy_repositories.rooms import (
     SqlAlchemyRoomRepository,
 )
+from chat_realtime_api.repositories.rooms import RoomRepoOutput
 from chat_realtime_api.services.rooms.create import (
     CreateRoomInput,
     CreateRoomService,
 )
-from chat_realtime_api.services.rooms.get import GetRoomService
-from chat_realtime_api.services.rooms.get_history import GetHistoryService
+from chat_realtime_api.services.rooms.get import (
+    GetRoomService,
+    ListRoomsInput,
+    ListRoomsService,
+)
+from chat_realtime_api.services.rooms.get_history import (
+    GetCursorHistoryService,
+    GetHistoryService,
+)
 
 router = APIRouter(prefix='/api/v1', tags=['rooms'])
 
@@ -44,9 +66,10 @@ router = APIRouter(prefix='/api/v1', tags=['rooms'])
 def create_room(
     room_schema: RoomInputSchema,
     session: Session = Depends(get_session),
+    cache: RoomListCache = Depends(get_room_list_cache),
     current_user: Dict = Depends(get_current_user),
 ):
-    repo = SqlAlchemyRoomRepository(session)
+    repo = CachedRoomRepository(SqlAlchemyRoomRepository(session), cache)
     service = CreateRoomService(repo)
     try:
         room = service.execute(
@@ -74,74 +97,128 @@ def create_room(
     response_model=ListRoomOutputSchema,
 )
 def list_rooms(
+    room_list_query_schema: Annotated[RoomListQuerySchema, Query()],
+    if_none_match: Annotated[str | None, Header()] = None,
     session: Session = Depends(get_session),
+    cache: RoomListCache = Depends(get_room_list_cache),
     _: Dict = Depends(get_current_user),
 ):
-    repo = SqlAlchemyRoomRepository(session)
-    service = GetRoomService(repo)
-    try:
-        rooms = service.execute()
-
-        return ListRoomOutputSchema(
-            rooms=[
-                RoomOutputSchema(
-                    id=room.id,
-                    name=room.name,
-                    creator_id=room.creator_id,
-                    description=room.description,
+    key = room_list_query_schema.model_dump_json()
+    entry = cache.get(key)
+
+    if entry is None:
+        generation = cache.generation
+        repo = SqlAlchemyRoomRepository(session)
+        next_cursor = None
+        try:
+            if room_list_query_schema.all:
+                rooms = GetRoomService(repo).execute()
+            else:
+                page = ListRoomsService(repo).execute(
+                    ListRoomsInput(
+                        size=room_list_query_schema.size,
+                        sort=room_list_query_schema.sort,
+                        name_prefix=room_list_query_schema.name_prefix,
+                        after=room_list_query_schema.after,
+                    )
                 )
-                for room in rooms
-            ]
+                rooms, next_cursor = page.rooms, page.next
+        except Exception as e:
+            print(e)
+            raise handle_error(e)
+
+        body = dumps({
+            'rooms': [_to_room_payload(room) for room in rooms],
+            'next': next_cursor,
+        })
+        entry = cache.put(key, body, generation)
+
+    if _etag_matches(if_none_match, entry.etag):
+        return Response(
+            status_code=HTTPStatus.NOT_MODIFIED,
+            headers={'ETag': entry.etag},
         )
-    except Exception as e:
-        print(e)
-        raise handle_error(e)
+
+    return Response(
+        content=entry.body,
+        media_type='application/json',
+        headers={'ETag': entry.etag},
+    )
 
 
 @router.get(
     '/rooms/{room_id}/history/',
     status_code=HTTPStatus.OK,
     response_model=HistorySchema,
+    response_class=ORJSONResponse,
 )
 def get_room_history(
     pagination_query_schema: Annotated[PaginationQuerySchema, Query()],
     room_id: UUID,
     session: Session = Depends(get_session),
+    cache: RecentMessagesCache = Depends(get_recent_messages_cache),
     _: Dict = Depends(get_current_user),
 ):
-    msg_repo = SqlAlchemyMessageRepository(session)
+    msg_repo = CachedMessageRepository(
+        SqlAlchemyMessageRepository(session), cache
+    )
     room_repo = SqlAlchemyRoomRepository(session)
 
-    service = GetHistoryService(msg_repo, room_repo)
     try:
+        if pagination_query_schema.before or pagination_query_schema.after:
+            service = GetCursorHistoryService(msg_repo, room_repo)
+            history = service.execute(
+                room_id=room_id,
+                size=pagination_query_schema.size,
+                before=pagination_query_schema.before,
+                after=pagination_query_schema.after,
+            )
+
+            return ORJSONResponse({
+                'room_id': room_id,
+                'messages': history.messages,
+                'pagination': None,
+                'cursors': {'before': history.before, 'after': history.after},
+            })
+
+        service = GetHistoryService(msg_repo, room_repo)
         history = service.execute(
             room_id=room_id,
             page=pagination_query_schema.page,
             size=pagination_query_schema.size,
+            include_totals=pagination_query_schema.include_totals,
         )
 
-        return HistorySchema(
-            room_id=room_id,
-            messages=[
-                MessageSchema(
-                    id=msg.id,
-                    room_id=msg.room_id,
-                    user=UserSchema(
-                        id=msg.user.id,
-                        name=msg.user.name,
-                    ),
-                    content=msg.content,
-                    timestamp=msg.timestamp,
-                )
-                for msg in history.messages
-            ],
-            pagination=PaginationSchema(
-                current_page=history.current_page,
-                page_size=history.page_size,
-                total_pages=history.total_pages,
-                total_messages=history.total_messages,
-            ),
-        )
+        return ORJSONResponse({
+            'room_id': room_id,
+            'messages': history.messages,
+            'pagination': {
+                'current_page': history.current_page,
+                'page_size': history.page_size,
+                'total_pages': history.total_pages,
+                'total_messages': history.total_messages,
+            },
+            'cursors': None,
+        })
     except Exception as e:
         print(e)
         raise handle_error(e)
+
+
+def _to_room_payload(room: RoomRepoOutput) -> Dict:
+    return {
+        'id': room.id,
+        'name': room.name,
+        'creator_id': room.creator_id,
+        'description': room.description,
+    }
+
+
+def _etag_matches(if_none_match: str | None, etag: str) -> bool:
+    if not if_none_match:
+        return False
+
+    return any(
+        tag.strip().removeprefix('W/') in {etag, '*'}
+        for tag in if_none_match.split(',')
+    )
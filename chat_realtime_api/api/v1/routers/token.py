@@ -2,39 +2,54 @@ from typing import Dict
 
 from fastapi import APIRouter, Depends
 from fastapi.security import OAuth2PasswordRequestForm
-from sqlalchemy.orm import Session
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker
+from sqlalchemy.orm import Session, sessionmaker
 
 from chat_realtime_api.api.v1.errors.error_handlers import handle_error
 from chat_realtime_api.api.v1.schemas.token import TokenOutputSchema
-from chat_realtime_api.infra.config.security import get_current_user
-from chat_realtime_api.infra.db.session import get_session
+from chat_realtime_api.infra.config.security import (
+    PasswordHasher,
+    get_current_user,
+    get_password_hasher,
+)
+from chat_realtime_api.infra.db.executor import BoundedExecutor
+from chat_realtime_api.infra.db.session import (
+    get_async_session_factory,
+    get_db_executor,
+    get_session_factory,
+)
 from chat_realtime_api.infra.sqlalchemy_repositories.users import (
-    SqlAlchemyUserRepository,
+    async_user_repository,
 )
 from chat_realtime_api.services.auth.token import (
+    AsyncTokenService,
     RefreshTokenService,
     TokenInput,
-    TokenService,
 )
 
 router = APIRouter(prefix='/api/v1/auth', tags=['auth'])
 
 
 @router.post('/login', response_model=TokenOutputSchema)
-def login(
+async def login(
     form_data: OAuth2PasswordRequestForm = Depends(),
-    session: Session = Depends(get_session),
+    session_factory: sessionmaker[Session] = Depends(get_session_factory),
+    async_session_factory: async_sessionmaker[AsyncSession] | None = Depends(
+        get_async_session_factory
+    ),
+    executor: BoundedExecutor = Depends(get_db_executor),
+    password_hasher: PasswordHasher = Depends(get_password_hasher),
 ):
-    repo = SqlAlchemyUserRepository(session)
-    service = TokenService(repo)
-
     try:
-        token = service.execute(
-            TokenInput(
-                username=form_data.username,
-                password=form_data.password,
+        async with async_user_repository(
+            session_factory, async_session_factory, executor
+        ) as repo:
+            token = await AsyncTokenService(repo, password_hasher).execute(
+                TokenInput(
+                    username=form_data.username,
+                    password=form_data.password,
+                )
             )
-        )
 
         return TokenOutputSchema(
             id=token.id,
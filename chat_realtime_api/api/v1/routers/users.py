@@ -1,20 +1,30 @@
 from http import HTTPStatus
 
 from fastapi import APIRouter, Depends
-from sqlalchemy.orm import Session
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker
+from sqlalchemy.orm import Session, sessionmaker
 
 from chat_realtime_api.api.v1.errors.error_handlers import handle_error
 from chat_realtime_api.api.v1.schemas.users import (
     UserInputSchema,
     UserOutputSchema,
 )
-from chat_realtime_api.infra.db.session import get_session
+from chat_realtime_api.infra.config.security import (
+    PasswordHasher,
+    get_password_hasher,
+)
+from chat_realtime_api.infra.db.executor import BoundedExecutor
+from chat_realtime_api.infra.db.session import (
+    get_async_session_factory,
+    get_db_executor,
+    get_session_factory,
+)
 from chat_realtime_api.infra.sqlalchemy_repositories.users import (
-    SqlAlchemyUserRepository,
+    async_user_repository,
 )
 from chat_realtime_api.services.users.create import (
+    AsyncCreateUserService,
     CreateUserInput,
-    CreateUserService,
 )
 
 router = APIRouter(prefix='/api/v1', tags=['users'])
@@ -25,20 +35,26 @@ router = APIRouter(prefix='/api/v1', tags=['users'])
     status_code=HTTPStatus.CREATED,
     response_model=UserOutputSchema,
 )
-def create_user(
+async def create_user(
     user_schema: UserInputSchema,
-    session: Session = Depends(get_session),
+    session_factory: sessionmaker[Session] = Depends(get_session_factory),
+    async_session_factory: async_sessionmaker[AsyncSession] | None = Depends(
+        get_async_session_factory
+    ),
+    executor: BoundedExecutor = Depends(get_db_executor),
+    password_hasher: PasswordHasher = Depends(get_password_hasher),
 ):
-    repo = SqlAlchemyUserRepository(session)
-    service = CreateUserService(repo)
     try:
-        user = service.execute(
-            CreateUserInput(
-                name=user_schema.name,
-                username=user_schema.username,
-                password=user_schema.password,
+        async with async_user_repository(
+            session_factory, async_session_factory, executor
+        ) as repo:
+            user = await AsyncCreateUserService(repo, password_hasher).execute(
+                CreateUserInput(
+                    name=user_schema.name,
+                    username=user_schema.username,
+                    password=user_schema.password,
+                )
             )
-        )
 
         return UserOutputSchema(
             id=user.id,
@@ -1,6 +1,4 @@
-from dataclasses import dataclass
 from datetime import datetime
-from typing import Dict, List
 from uuid import UUID
 
 import anyio
@@ -8,83 +6,236 @@ from fastapi import (
     APIRouter,
     Depends,
     WebSocket,
-    WebSocketDisconnect,
     status,
 )
-from sqlalchemy.orm import Session
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker
+from sqlalchemy.orm import Session, sessionmaker
 
 from chat_realtime_api.api.v1.errors.error_handlers import handle_error
+from chat_realtime_api.api.v1.routers.ws.manager import (
+    Connection,
+    ConnectionManager,
+    Message,
+    encode,
+)
+from chat_realtime_api.infra.broker.factory import create_broker
+from chat_realtime_api.infra.cache.recent_messages import (
+    get_recent_messages_cache,
+)
+from chat_realtime_api.infra.cache.repositories import (
+    AsyncCachedMessageRepository,
+    CachedMessageRepository,
+)
 from chat_realtime_api.infra.config.security import (
     get_current_user_ws,
 )
-from chat_realtime_api.infra.db.session import get_session
+from chat_realtime_api.infra.config.settings import (
+    Settings,
+    get_settings,
+)
+from chat_realtime_api.infra.db.executor import BoundedExecutor
+from chat_realtime_api.infra.db.session import (
+    get_async_session_factory,
+    get_db_executor,
+    get_session_factory,
+)
 from chat_realtime_api.infra.sqlalchemy_repositories.messages import (
+    AsyncSqlAlchemyMessageRepository,
     SqlAlchemyMessageRepository,
 )
 from chat_realtime_api.infra.sqlalchemy_repositories.rooms import (
+    AsyncSqlAlchemyRoomRepository,
     SqlAlchemyRoomRepository,
 )
+from chat_realtime_api.repositories.messages import MessageRepoOutput
+from chat_realtime_api.services.errors.exceptions import (
+    BusinessException,
+    ExecutorSaturatedException,
+)
 from chat_realtime_api.services.messages.create import (
+    AsyncCreateMessageService,
+    AsyncCreateMessagesService,
     CreateMessageInput,
     CreateMessageService,
+    CreateMessagesService,
+)
+from chat_realtime_api.services.messages.get import (
+    AsyncGetMessageService,
+    GetMessageService,
+)
+from chat_realtime_api.services.messages.write_behind import (
+    WriteBehindBuffer,
 )
-from chat_realtime_api.services.messages.get import GetMessageService
 
 
-@dataclass
-class Message:
-    content: str
-    user: str
-    timestamp: datetime
+def invalidate_recent_messages(room_id: str):
+    get_recent_messages_cache().invalidate(UUID(room_id))
+
+
+async def get_room_messages(
+    room_id: UUID,
+    limit: int,
+    session_factory: sessionmaker[Session],
+    async_session_factory: async_sessionmaker[AsyncSession] | None,
+    executor: BoundedExecutor,
+) -> list[MessageRepoOutput]:
+    cache = get_recent_messages_cache()
+
+    if async_session_factory is not None:
+        async with async_session_factory() as session:
+            service = AsyncGetMessageService(
+                AsyncCachedMessageRepository(
+                    AsyncSqlAlchemyMessageRepository(session), cache
+                ),
+                AsyncSqlAlchemyRoomRepository(session),
+            )
+            return await service.execute(room_id, limit)
+
+    def execute() -> list[MessageRepoOutput]:
+        with session_factory() as session:
+            service = GetMessageService(
+                CachedMessageRepository(
+                    SqlAlchemyMessageRepository(session), cache
+                ),
+                SqlAlchemyRoomRepository(session),
+            )
+            return service.execute(room_id, limit)
+
+    return await executor.run(execute)
+
 
+async def create_message(
+    input: CreateMessageInput,
+    session_factory: sessionmaker[Session],
+    async_session_factory: async_sessionmaker[AsyncSession] | None,
+    executor: BoundedExecutor,
+) -> MessageRepoOutput:
+    cache = get_recent_messages_cache()
 
-class ConnectionManager:
+    if async_session_factory is not None:
+        async with async_session_factory() as session:
+            service = AsyncCreateMessageService(
+                AsyncCachedMessageRepository(
+                    AsyncSqlAlchemyMessageRepository(session), cache
+                )
+            )
+            return await service.execute(input)
+
+    def execute() -> MessageRepoOutput:
+        with session_factory() as session:
+            service = CreateMessageService(
+                CachedMessageRepository(
+                    SqlAlchemyMessageRepository(session), cache
+                )
+            )
+            return service.execute(input)
+
+    return await executor.run(execute)
+
+
+async def create_messages(
+    inputs: list[CreateMessageInput],
+) -> list[MessageRepoOutput | BusinessException]:
+    async_session_factory = get_async_session_factory()
+    cache = get_recent_messages_cache()
+
+    if async_session_factory is not None:
+        async with async_session_factory() as session:
+            service = AsyncCreateMessagesService(
+                AsyncCachedMessageRepository(
+                    AsyncSqlAlchemyMessageRepository(session), cache
+                )
+            )
+            return await service.execute(inputs)
+
+    session_factory = get_session_factory()
+
+    def execute() -> list[MessageRepoOutput | BusinessException]:
+        with session_factory() as session:
+            service = CreateMessagesService(
+                CachedMessageRepository(
+                    SqlAlchemyMessageRepository(session), cache
+                )
+            )
+            return service.execute(inputs)
+
+    return await get_db_executor().run(execute)
+
+
+class ChatRuntime:
     def __init__(self):
-        self.active_connections: Dict[str, List[WebSocket]] = {}
+        self.settings: Settings | None = None
+        self.manager: ConnectionManager | None = None
+        self.write_behind: WriteBehindBuffer | None = None
 
-    async def connect(self, room_id: str, websocket: WebSocket):
-        if room_id not in self.active_connections:
-            self.active_connections[room_id] = []
-        self.active_connections[room_id].append(websocket)
-        await websocket.accept()
+    def init(self, settings: Settings | None = None) -> 'ChatRuntime':
+        if self.manager is None:
+            self.settings = settings or get_settings()
+            self.manager = ConnectionManager(
+                send_timeout=self.settings.WS_SEND_TIMEOUT,
+                queue_size=self.settings.WS_QUEUE_SIZE,
+                overflow_policy=self.settings.WS_OVERFLOW_POLICY,
+                overflow_close_code=self.settings.WS_OVERFLOW_CLOSE_CODE,
+                broker=create_broker(self.settings),
+            )
+            self.manager.on_remote_message(invalidate_recent_messages)
 
-    def disconnect(self, room_id: str, websocket: WebSocket):
-        if room_id in self.active_connections:
-            self.active_connections[room_id].remove(websocket)
-            if not self.active_connections[room_id]:
-                del self.active_connections[room_id]
+            if self.settings.WRITE_BEHIND_ENABLED:
+                self.write_behind = WriteBehindBuffer(
+                    create_messages,
+                    interval=self.settings.WRITE_BEHIND_INTERVAL,
+                    max_batch=self.settings.WRITE_BEHIND_MAX_BATCH,
+                )
 
-    async def send_message(  # noqa: PLR6301
-        self, message: Message, websocket: WebSocket
-    ):
-        await websocket.send_json({
-            'content': message.content,
-            'user': message.user,
-            'timestamp': message.timestamp.strftime('%Y-%m-%d %H:%M:%S'),
-        })
+        return self
 
-    async def send_json(self, data: Dict, websocket: WebSocket):  # noqa: PLR6301
-        await websocket.send_json(data)
+    async def start(self):
+        await self.manager.start()
+        if self.write_behind is not None:
+            await self.write_behind.start()
 
-    async def broadcast(
-        self, room_id: str, message: Message, exclude: List[WebSocket] = None
-    ):
-        if room_id in self.active_connections:
-            for connection in self.active_connections[room_id]:
-                if exclude and connection in exclude:
-                    continue
+    async def stop(self):
+        if self.write_behind is not None:
+            await self.write_behind.stop()
+        await self.manager.stop()
 
-                try:
-                    await self.send_message(message, connection)
-                except Exception as e:
-                    print(e)
-                    self.disconnect(room_id, connection)
+        self.settings = None
+        self.manager = None
+        self.write_behind = None
 
-    async def close(self, code: int, websocket: WebSocket):  # noqa: PLR6301
-        await websocket.close(code=code)
+    def fits(
+        self, room_id: str, connection: Connection, content: str, user: str
+    ) -> bool:
+        if len(content) > self.settings.WS_MAX_MESSAGE_LENGTH:
+            return False
 
+        return self.manager.fits(
+            room_id,
+            Message(content=content, user=user, timestamp=datetime.now()),
+            exclude={connection.id},
+        )
+
+    async def persist(
+        self,
+        input: CreateMessageInput,
+        session_factory: sessionmaker[Session],
+        async_session_factory: async_sessionmaker[AsyncSession] | None,
+        executor: BoundedExecutor,
+    ) -> MessageRepoOutput:
+        if self.write_behind is not None:
+            return await self.write_behind.submit(input)
+
+        return await create_message(
+            input, session_factory, async_session_factory, executor
+        )
+
+
+chat_runtime = ChatRuntime()
+
+
+def get_chat_runtime() -> ChatRuntime:
+    return chat_runtime.init()
 
-manager = ConnectionManager()
 
 router = APIRouter(prefix='/api/v1', tags=['chat'])
 
@@ -93,22 +244,25 @@ router = APIRouter(prefix='/api/v1', tags=['chat'])
 async def chat_websocket(
     websocket: WebSocket,
     room_id: UUID,
-    session: Session = Depends(get_session),
+    session_factory: sessionmaker[Session] = Depends(get_session_factory),
+    async_session_factory: async_sessionmaker[AsyncSession] | None = Depends(
+        get_async_session_factory
+    ),
+    executor: BoundedExecutor = Depends(get_db_executor),
 ):
+    runtime = get_chat_runtime()
+    manager = runtime.manager
+
     try:
         current_user = await get_current_user_ws(websocket)
     except Exception:
         await manager.close(status.WS_1008_POLICY_VIOLATION, websocket)
         return
 
-    room_repo = SqlAlchemyRoomRepository(session)
-    msg_repo = SqlAlchemyMessageRepository(session)
-
-    create_service = CreateMessageService(msg_repo, room_repo)
-    get_service = GetMessageService(msg_repo, room_repo)
-
+    # join before reading the history so broadcasts made while it loads
+    # wait in the connection's queue; frames the replay covered are dropped
     room_id_str = str(room_id)
-    await manager.connect(room_id_str, websocket)
+    connection = manager.register(room_id_str, websocket)
 
     await manager.broadcast(
         room_id_str,
@@ -117,22 +271,21 @@ async def chat_websocket(
             user=current_user['name'],
             timestamp=datetime.now(),
         ),
-        exclude=[websocket],
+        exclude={connection.id},
     )
 
     try:
-        messages = get_service.execute(room_id)
-        for msg in reversed(messages):
-            await manager.send_message(
-                Message(
-                    content=msg.content,
-                    user=msg.user.name,
-                    timestamp=msg.timestamp,
-                ),
-                websocket,
-            )
+        messages = await get_room_messages(
+            room_id,
+            runtime.settings.WS_HISTORY_LIMIT,
+            session_factory,
+            async_session_factory,
+            executor,
+        )
     except Exception as e:
         print(e)
+        manager.disconnect(room_id_str, connection)
+        await websocket.accept()
         await manager.send_json(
             {'error': 'Failed to fetch messages.'},
             websocket,
@@ -140,28 +293,65 @@ async def chat_websocket(
         await manager.close(status.WS_1008_POLICY_VIOLATION, websocket)
         return
 
+    await websocket.accept()
+
+    if messages:
+        await manager.send_history(
+            [
+                Message(
+                    content=msg.content,
+                    user=msg.user.name,
+                    timestamp=msg.timestamp,
+                )
+                for msg in messages
+            ],
+            websocket,
+        )
+        connection.skip_replayed((messages[-1].timestamp, messages[-1].id))
+
     try:
         async with anyio.create_task_group() as task_group:
 
+            async def run_chatroom_ws_sender() -> None:
+                await manager.run_writer(room_id_str, connection)
+                task_group.cancel_scope.cancel()
+
             async def run_chatroom_ws_receiver() -> None:
                 async for message in websocket.iter_json():
-                    if (
-                        not isinstance(message, dict)
-                        or 'content' not in message
+                    if not isinstance(message, dict) or not isinstance(
+                        message.get('content'), str
                     ):
-                        await manager.send_json(
-                            {'error': 'Invalid message format.'},
-                            websocket,
+                        manager.push(
+                            room_id_str,
+                            connection,
+                            encode({'error': 'Invalid message format.'}),
+                        )
+                        continue
+
+                    if not runtime.fits(
+                        room_id_str,
+                        connection,
+                        message['content'],
+                        current_user['name'],
+                    ):
+                        manager.push(
+                            room_id_str,
+                            connection,
+                            encode({'error': 'Message is too long.'}),
                         )
                         continue
 
                     try:
-                        msg = create_service.execute(
+                        msg = await runtime.persist(
                             CreateMessageInput(
                                 room_id=room_id,
                                 content=message['content'],
                                 user_id=UUID(current_user['uid']),
-                            )
+                                user_name=current_user['name'],
+                            ),
+                            session_factory,
+                            async_session_factory,
+                            executor,
                         )
 
                         await manager.broadcast(
@@ -170,8 +360,18 @@ async def chat_websocket(
                                 content=msg.content,
                                 user=current_user['name'],
                                 timestamp=msg.timestamp,
+                                id=msg.id,
                             ),
-                            exclude=[websocket],
+                            exclude={connection.id},
+                        )
+                    except ExecutorSaturatedException as e:
+                        manager.push(
+                            room_id_str,
+                            connection,
+                            encode({
+                                'error': e.message,
+                                'content': message['content'],
+                            }),
                         )
                     except Exception as e:
                         print(e)
@@ -179,9 +379,10 @@ async def chat_websocket(
 
                 task_group.cancel_scope.cancel()
 
+            task_group.start_soon(run_chatroom_ws_sender)
             task_group.start_soon(run_chatroom_ws_receiver)
-    except WebSocketDisconnect:
-        manager.disconnect(room_id_str, websocket)
+    finally:
+        manager.disconnect(room_id_str, connection)
         await manager.broadcast(
             room_id_str,
             message=Message(
@@ -189,5 +390,5 @@ async def chat_websocket(
                 user=current_user['name'],
                 timestamp=datetime.now(),
             ),
-            exclude=[websocket],
+            exclude={connection.id},
         )
@@ -0,0 +1,308 @@
+import asyncio
+import logging
+from dataclasses import dataclass
+from datetime import datetime
+from itertools import count
+from typing import Callable, Dict, List, Set
+from uuid import UUID, uuid4
+
+import anyio
+import orjson
+from fastapi import WebSocket, status
+
+from chat_realtime_api.infra.broker.base import Broker, Envelope
+from chat_realtime_api.infra.broker.memory import MemoryBroker
+
+logger = logging.getLogger(__name__)
+
+DROP_OLDEST = 'drop_oldest'
+DROP_NEWEST = 'drop_newest'
+DISCONNECT = 'disconnect'
+
+
+MessageKey = tuple[datetime, UUID]
+
+
+def encode(data: Dict) -> str:
+    return orjson.dumps(data).decode()
+
+
+def decode_key(key: list[str] | None) -> MessageKey | None:
+    if key is None:
+        return None
+
+    timestamp, message_id = key
+    return datetime.fromisoformat(timestamp), UUID(message_id)
+
+
+@dataclass
+class Message:
+    content: str
+    user: str
+    timestamp: datetime
+    id: UUID | None = None
+
+    def key(self) -> list[str] | None:
+        if self.id is None:
+            return None
+
+        return [self.timestamp.isoformat(), str(self.id)]
+
+
+@dataclass
+class RoomStats:
+    dropped: int = 0
+    evicted: int = 0
+
+
+@dataclass
+class ManagerStats:
+    connections: int
+    rooms: int
+    dropped: int
+    evicted: int
+    per_room: Dict[str, RoomStats]
+
+
+class Connection:
+    ids = count(1)
+
+    def __init__(self, websocket: WebSocket, queue_size: int):
+        self.id = next(self.ids)
+        self.websocket = websocket
+        self.queue: asyncio.Queue[tuple[str, MessageKey | None] | None] = (
+            asyncio.Queue(queue_size)
+        )
+        self.close_code: int | None = None
+        self.replayed: MessageKey | None = None
+
+    def is_replayed(self, key: MessageKey | None) -> bool:
+        return (
+            key is not None
+            and self.replayed is not None
+            and key <= self.replayed
+        )
+
+    def skip_replayed(self, last: MessageKey):
+        self.replayed = last
+        items = []
+        while not self.queue.empty():
+            items.append(self.queue.get_nowait())
+
+        for item in items:
+            if item is None or not self.is_replayed(item[1]):
+                self.queue.put_nowait(item)
+
+    def close(self, code: int):
+        self.close_code = code
+
+        while not self.queue.empty():
+            self.queue.get_nowait()
+
+        self.queue.put_nowait(None)
+
+
+class ConnectionManager:
+    def __init__(
+        self,
+        send_timeout: float = 5.0,
+        queue_size: int = 100,
+        overflow_policy: str = DROP_OLDEST,
+        overflow_close_code: int = status.WS_1013_TRY_AGAIN_LATER,
+        broker: Broker | None = None,
+    ):
+        self.active_connections: Dict[str, Dict[int, Connection]] = {}
+        self.room_stats: Dict[str, RoomStats] = {}
+        self.dropped = 0
+        self.evicted = 0
+        self.send_timeout = send_timeout
+        self.queue_size = queue_size
+        self.overflow_policy = overflow_policy
+        self.overflow_close_code = overflow_close_code
+        self.worker_id = uuid4().hex
+        self.broker = broker or MemoryBroker()
+        self.remote_handler: Callable[[str], None] | None = None
+        self.broker.subscribe(self.deliver)
+
+    def on_remote_message(self, handler: Callable[[str], None]):
+        self.remote_handler = handler
+
+    async def start(self):
+        await self.broker.start()
+
+    async def stop(self):
+        await self.broker.stop()
+
+    def register(self, room_id: str, websocket: WebSocket) -> Connection:
+        connection = Connection(websocket, self.queue_size)
+
+        if room_id not in self.active_connections:
+            self.active_connections[room_id] = {}
+        self.active_connections[room_id][connection.id] = connection
+        self.room_stats.setdefault(room_id, RoomStats())
+
+        return connection
+
+    async def connect(self, room_id: str, websocket: WebSocket) -> Connection:
+        connection = self.register(room_id, websocket)
+        await websocket.accept()
+
+        return connection
+
+    def disconnect(self, room_id: str, connection: Connection) -> bool:
+        connections = self.active_connections.get(room_id)
+        if not connections or connections.pop(connection.id, None) is None:
+            return False
+
+        if not connections:
+            del self.active_connections[room_id]
+            self.room_stats.pop(room_id, None)
+
+        return True
+
+    @staticmethod
+    def message_payload(message: Message) -> Dict:
+        return {
+            'content': message.content,
+            'user': message.user,
+            'timestamp': message.timestamp.strftime('%Y-%m-%d %H:%M:%S'),
+        }
+
+    async def send_message(self, message: Message, websocket: WebSocket):
+        await websocket.send_text(encode(self.message_payload(message)))
+
+    async def send_history(
+        self, messages: List[Message], websocket: WebSocket
+    ):
+        await websocket.send_text(
+            encode({
+                'messages': [
+                    self.message_payload(message) for message in messages
+                ]
+            })
+        )
+
+    async def send_json(self, data: Dict, websocket: WebSocket):  # noqa: PLR6301
+        await websocket.send_json(data)
+
+    def push(
+        self,
+        room_id: str,
+        connection: Connection,
+        frame: str,
+        key: MessageKey | None = None,
+    ):
+        if connection.is_replayed(key):
+            return
+
+        try:
+            connection.queue.put_nowait((frame, key))
+            return
+        except asyncio.QueueFull:
+            pass
+
+        if self.overflow_policy == DROP_NEWEST:
+            self._count_dropped(room_id)
+        elif self.overflow_policy == DROP_OLDEST:
+            connection.queue.get_nowait()
+            connection.queue.put_nowait((frame, key))
+            self._count_dropped(room_id)
+        else:
+            self.evict(room_id, connection, self.overflow_close_code)
+
+    def _count_dropped(self, room_id: str):
+        self.dropped += 1
+        if room_id in self.room_stats:
+            self.room_stats[room_id].dropped += 1
+
+    def evict(self, room_id: str, connection: Connection, code: int):
+        if connection.id in self.active_connections.get(room_id, {}):
+            self.evicted += 1
+            self.room_stats[room_id].evicted += 1
+            self.disconnect(room_id, connection)
+        connection.close(code)
+
+    def envelope(
+        self, room_id: str, message: Message, exclude: Set[int] = None
+    ) -> Envelope:
+        return Envelope(
+            room_id=room_id,
+            frame=encode(self.message_payload(message)),
+            origin=self.worker_id,
+            exclude=list(exclude or ()),
+            key=message.key(),
+        )
+
+    def fits(
+        self, room_id: str, message: Message, exclude: Set[int] = None
+    ) -> bool:
+        return self.broker.fits(self.envelope(room_id, message, exclude))
+
+    async def broadcast(
+        self, room_id: str, message: Message, exclude: Set[int] = None
+    ):
+        try:
+            await self.broker.publish(self.envelope(room_id, message, exclude))
+        except Exception:
+            logger.exception('Failed to broadcast to room %s', room_id)
+
+    def deliver(self, envelope: Envelope):
+        exclude = ()
+        if envelope.origin == self.worker_id:
+            exclude = envelope.exclude
+        elif self.remote_handler is not None:
+            self.remote_handler(envelope.room_id)
+
+        key = decode_key(envelope.key)
+        connections = self.active_connections.get(envelope.room_id, {})
+        for connection in list(connections.values()):
+            if connection.id in exclude:
+                continue
+
+            self.push(envelope.room_id, connection, envelope.frame, key)
+
+    async def run_writer(self, room_id: str, connection: Connection):
+        while True:
+            item = await connection.queue.get()
+
+            if item is None:
+                with anyio.move_on_after(self.send_timeout):
+                    await self.close(
+                        connection.close_code, connection.websocket
+                    )
+                return
+
+            frame, _ = item
+            try:
+                with anyio.fail_after(self.send_timeout):
+                    await connection.websocket.send_text(frame)
+            except TimeoutError:
+                logger.warning(
+                    'Send timed out for connection %s in room %s',
+                    connection.id,
+                    room_id,
+                )
+                self.evict(room_id, connection, status.WS_1013_TRY_AGAIN_LATER)
+            except Exception:
+                logger.exception(
+                    'Failed to send to connection %s in room %s',
+                    connection.id,
+                    room_id,
+                )
+                self.disconnect(room_id, connection)
+                return
+
+    def stats(self) -> ManagerStats:
+        return ManagerStats(
+            connections=sum(
+                len(connections)
+                for connections in self.active_connections.values()
+            ),
+            rooms=len(self.active_connections),
+            dropped=self.dropped,
+            evicted=self.evicted,
+            per_room=dict(self.room_stats),
+        )
+
+    async def close(self, code: int, websocket: WebSocket):  # noqa: PLR6301
+        await websocket.close(code=code)
@@ -1,12 +1,22 @@
 from datetime import datetime
 from uuid import UUID
 
-from pydantic import BaseModel
+from pydantic import BaseModel, Field, model_validator
 
 
 class PaginationQuerySchema(BaseModel):
-    page: int = 1
-    size: int = 10
+    page: int = Field(1, gt=0)
+    size: int = Field(10, gt=0, le=100)
+    include_totals: bool = True
+    before: str | None = None
+    after: str | None = None
+
+    @model_validator(mode='after')
+    def check_single_cursor(self):
+        if self.before and self.after:
+            raise ValueError('Use either before or after, not both.')
+
+        return self
 
 
 class UserSchema(BaseModel):
@@ -25,11 +35,17 @@ class MessageSchema(BaseModel):
 class PaginationSchema(BaseModel):
     current_page: int
     page_size: int
-    total_pages: int
-    total_messages: int
+    total_pages: int | None = None
+    total_messages: int | None = None
+
+
+class CursorSchema(BaseModel):
+    before: str | None = None
+    after: str | None = None
 
 
 class HistorySchema(BaseModel):
     room_id: UUID
     messages: list[MessageSchema]
-    pagination: PaginationSchema
+    pagination: PaginationSchema | None = None
+    cursors: CursorSchema | None = None
@@ -0,0 +1,71 @@
+from pydantic import BaseModel
+
+
+class PoolStatsSchema(BaseModel):
+    pool: str
+    size: int
+    checked_out: int
+    checked_in: int
+    overflow: int
+    waits: int
+    wait_time: float
+    timeouts: int
+
+
+class ExecutorStatsSchema(BaseModel):
+    max_workers: int
+    max_queue: int
+    running: int
+    queued: int
+    completed: int
+    rejected: int
+    saturation: float
+
+
+class RoomStatsSchema(BaseModel):
+    dropped: int
+    evicted: int
+
+
+class WebSocketStatsSchema(BaseModel):
+    connections: int
+    rooms: int
+    dropped: int
+    evicted: int
+    per_room: dict[str, RoomStatsSchema]
+
+
+class RecentMessagesStatsSchema(BaseModel):
+    rooms: int
+    messages: int
+    bytes: int
+    hits: int
+    misses: int
+    evictions: int
+
+
+class TokenCacheStatsSchema(BaseModel):
+    size: int
+    max_entries: int
+    hits: int
+    misses: int
+    evictions: int
+    hit_rate: float
+
+
+class WriteBehindStatsSchema(BaseModel):
+    pending: int
+    batches: int
+    messages: int
+    failed: int
+
+
+class MetricsSchema(BaseModel):
+    db_pool: PoolStatsSchema
+    db_async_pool: PoolStatsSchema | None = None
+    db_executor: ExecutorStatsSchema
+    hash_executor: ExecutorStatsSchema
+    websockets: WebSocketStatsSchema
+    recent_messages: RecentMessagesStatsSchema
+    tokens: TokenCacheStatsSchema
+    write_behind: WriteBehindStatsSchema | None = None
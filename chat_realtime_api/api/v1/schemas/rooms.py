@@ -1,6 +1,7 @@
+from typing import Literal
 from uuid import UUID
 
-from pydantic import BaseModel
+from pydantic import BaseModel, Field
 
 
 class RoomInputSchema(BaseModel):
@@ -15,5 +16,14 @@ class RoomOutputSchema(BaseModel):
     description: str | None = None
 
 
+class RoomListQuerySchema(BaseModel):
+    size: int = Field(20, gt=0, le=100)
+    after: str | None = None
+    name_prefix: str | None = None
+    sort: Literal['name', '-name', 'created_at', '-created_at'] = 'name'
+    all: bool = False
+
+
 class ListRoomOutputSchema(BaseModel):
     rooms: list[RoomOutputSchema]
+    next: str | None = None
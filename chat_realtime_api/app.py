@@ -1,20 +1,66 @@
+from contextlib import asynccontextmanager
+from dataclasses import asdict
 from http import HTTPStatus
 
+import anyio
 from fastapi import FastAPI
+from fastapi.responses import JSONResponse
 
+from chat_realtime_api.api.v1.routers.metrics import router as metrics_router
 from chat_realtime_api.api.v1.routers.rooms import router as rooms_router
 from chat_realtime_api.api.v1.routers.token import router as token_router
 from chat_realtime_api.api.v1.routers.users import router as users_router
+from chat_realtime_api.api.v1.routers.ws.chat import chat_runtime
 from chat_realtime_api.api.v1.routers.ws.chat import router as chat_router
+from chat_realtime_api.infra.cache.recent_messages import recent_messages
+from chat_realtime_api.infra.cache.rooms import room_list
+from chat_realtime_api.infra.cache.tokens import verified_tokens
+from chat_realtime_api.infra.config.security import password_hasher
+from chat_realtime_api.infra.config.settings import get_settings
+from chat_realtime_api.infra.db.session import db
+from chat_realtime_api.infra.db.warmup import warmup
 
-app = FastAPI()
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    settings = get_settings()
+    db.init(settings)
+    password_hasher.init(settings)
+    recent_messages.init(settings)
+    room_list.init(settings)
+    verified_tokens.init(settings)
+    await chat_runtime.init(settings).start()
+    warmup.start(settings, db, password_hasher)
+    yield
+    await warmup.stop()
+    await chat_runtime.stop()
+    await anyio.to_thread.run_sync(password_hasher.shutdown)
+    await db.dispose()
+
+
+app = FastAPI(lifespan=lifespan)
 
 app.include_router(users_router)
 app.include_router(token_router)
 app.include_router(rooms_router)
 app.include_router(chat_router)
+app.include_router(metrics_router)
 
 
 @app.get('/', status_code=HTTPStatus.OK)
 def read_root():
     return {'message': '/'}
+
+
+@app.get('/ready', status_code=HTTPStatus.OK)
+def read_ready():
+    stats = warmup.stats()
+
+    if not stats.ready:
+        return JSONResponse(
+            asdict(stats),
+            status_code=HTTPStatus.SERVICE_UNAVAILABLE,
+            headers={'Retry-After': '1'},
+        )
+
+    return asdict(stats)
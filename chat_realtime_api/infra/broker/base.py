@@ -0,0 +1,74 @@
+import logging
+from dataclasses import dataclass, field
+from typing import Callable
+
+import orjson
+
+logger = logging.getLogger(__name__)
+
+
+@dataclass
+class Envelope:
+    room_id: str
+    frame: str
+    origin: str
+    exclude: list[int] = field(default_factory=list)
+    key: list[str] | None = None
+
+    def encode(self) -> bytes:
+        return orjson.dumps(self)
+
+    @classmethod
+    def decode(cls, data: bytes | str) -> 'Envelope':
+        return cls(**orjson.loads(data))
+
+
+Handler = Callable[[Envelope], None]
+
+
+class Broker:
+    max_payload: int | None = None
+
+    def __init__(self):
+        self.handler: Handler | None = None
+
+    def fits(self, envelope: Envelope) -> bool:
+        return (
+            self.max_payload is None
+            or len(envelope.encode()) <= self.max_payload
+        )
+
+    def subscribe(self, handler: Handler):
+        self.handler = handler
+
+    async def start(self):
+        pass
+
+    async def publish(self, envelope: Envelope):
+        raise NotImplementedError
+
+    async def stop(self):
+        pass
+
+    def deliver(self, data: bytes | str):
+        try:
+            envelope = Envelope.decode(data)
+        except Exception:
+            logger.exception(
+                '%s received an undecodable payload: %r',
+                type(self).__name__,
+                data[:200],
+            )
+            return
+
+        if self.handler is None:
+            return
+
+        try:
+            self.handler(envelope)
+        except Exception:
+            logger.exception(
+                '%s failed to dispatch a message to room %s',
+                type(self).__name__,
+                envelope.room_id,
+            )
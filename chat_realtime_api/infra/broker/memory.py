@@ -0,0 +1,7 @@
+from chat_realtime_api.infra.broker.base import Broker, Envelope
+
+
+class MemoryBroker(Broker):
+    async def publish(self, envelope: Envelope):
+        if self.handler is not None:
+            self.handler(envelope)
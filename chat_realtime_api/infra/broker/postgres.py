@@ -0,0 +1,90 @@
+import asyncio
+import logging
+
+from psycopg import AsyncConnection
+from sqlalchemy import make_url
+
+from chat_realtime_api.infra.broker.base import Broker, Envelope
+
+logger = logging.getLogger(__name__)
+
+MAX_PAYLOAD = 7999
+RECONNECT_DELAY = 1.0
+
+
+def conninfo(database_url: str) -> str:
+    return (
+        make_url(database_url)
+        .set(drivername='postgresql')
+        .render_as_string(hide_password=False)
+    )
+
+
+class PostgresBroker(Broker):
+    max_payload = MAX_PAYLOAD
+
+    def __init__(self, database_url: str, channel: str):
+        super().__init__()
+        self.conninfo = conninfo(database_url)
+        self.channel = channel
+        self._publisher: AsyncConnection | None = None
+        self._publish_lock = asyncio.Lock()
+        self._listener: asyncio.Task | None = None
+
+    async def start(self):
+        self._publisher = await AsyncConnection.connect(
+            self.conninfo, autocommit=True
+        )
+        ready = asyncio.Event()
+        self._listener = asyncio.create_task(self._listen(ready))
+        await ready.wait()
+
+    async def _listen(self, ready: asyncio.Event):
+        while True:
+            try:
+                async with await AsyncConnection.connect(
+                    self.conninfo, autocommit=True
+                ) as connection:
+                    await connection.execute(f'LISTEN "{self.channel}"')
+                    ready.set()
+
+                    async for notify in connection.notifies():
+                        self.deliver(notify.payload)
+            except asyncio.CancelledError:
+                raise
+            except Exception:
+                logger.exception(
+                    'Lost the LISTEN connection on channel %s, reconnecting',
+                    self.channel,
+                )
+                ready.set()
+                await asyncio.sleep(RECONNECT_DELAY)
+
+    async def publish(self, envelope: Envelope):
+        if not self.fits(envelope):
+            raise ValueError('Broadcast payload exceeds the NOTIFY limit.')
+        payload = envelope.encode().decode()
+
+        async with self._publish_lock:
+            if self._publisher is None or self._publisher.closed:
+                self._publisher = await AsyncConnection.connect(
+                    self.conninfo, autocommit=True
+                )
+
+            await self._publisher.execute(
+                'SELECT pg_notify(%s, %s)', (self.channel, payload)
+            )
+
+    async def stop(self):
+        if self._listener is not None:
+            self._listener.cancel()
+            try:
+                await self._listener
+            except asyncio.CancelledError:
+                pass
+
+        if self._publisher is not None:
+            await self._publisher.close()
+
+        self._listener = None
+        self._publisher = None
@@ -0,0 +1,68 @@
+import asyncio
+import logging
+import os
+import socket
+from pathlib import Path
+from uuid import uuid4
+
+from chat_realtime_api.infra.broker.base import Broker, Envelope
+
+logger = logging.getLogger(__name__)
+
+MAX_DATAGRAM = 262144
+
+
+class UnixSocketBroker(Broker):
+    def __init__(self, directory: str):
+        super().__init__()
+        self.directory = Path(directory)
+        self.path = self.directory / f'{os.getpid()}-{uuid4().hex[:8]}.sock'
+        self._socket: socket.socket | None = None
+        self._reader: asyncio.Task | None = None
+
+    async def start(self):
+        self.directory.mkdir(parents=True, exist_ok=True)
+        self._socket = socket.socket(socket.AF_UNIX, socket.SOCK_DGRAM)
+        self._socket.setblocking(False)
+        self._socket.bind(str(self.path))
+        self._reader = asyncio.create_task(self._read())
+
+    async def _read(self):
+        loop = asyncio.get_running_loop()
+
+        while True:
+            data = await loop.sock_recv(self._socket, MAX_DATAGRAM)
+            self.deliver(data)
+
+    def peers(self) -> list[Path]:
+        return list(self.directory.glob('*.sock'))
+
+    async def publish(self, envelope: Envelope):
+        data = envelope.encode()
+
+        for peer in self.peers():
+            try:
+                self._socket.sendto(data, str(peer))
+            except (ConnectionRefusedError, FileNotFoundError):
+                peer.unlink(missing_ok=True)
+            except OSError:
+                logger.exception(
+                    'Failed to publish to peer %s for room %s',
+                    peer,
+                    envelope.room_id,
+                )
+
+    async def stop(self):
+        if self._reader is not None:
+            self._reader.cancel()
+            try:
+                await self._reader
+            except asyncio.CancelledError:
+                pass
+
+        if self._socket is not None:
+            self._socket.close()
+            self.path.unlink(missing_ok=True)
+
+        self._reader = None
+        self._socket = None
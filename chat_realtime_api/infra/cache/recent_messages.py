@@ -0,0 +1,273 @@
+from bisect import insort
+from collections import OrderedDict, deque
+from contextlib import contextmanager
+from dataclasses import dataclass
+from itertools import chain
+from threading import Lock
+from typing import Iterator
+from uuid import UUID
+
+from chat_realtime_api.infra.config.settings import Settings, get_settings
+from chat_realtime_api.repositories.messages import MessageRepoOutput
+
+MESSAGE_OVERHEAD = 256
+
+
+@dataclass
+class RecentMessagesStats:
+    rooms: int
+    messages: int
+    bytes: int
+    hits: int
+    misses: int
+    evictions: int
+
+
+def _message_key(message: MessageRepoOutput):
+    return message.timestamp, message.id
+
+
+def _message_size(message: MessageRepoOutput) -> int:
+    return MESSAGE_OVERHEAD + len(message.content) + len(message.user.name)
+
+
+class RoomBuffer:
+    def __init__(self, per_room: int):
+        self.per_room = per_room
+        self.recent: deque[MessageRepoOutput] | None = None
+        self.oldest: list[MessageRepoOutput] | None = None
+        self.total: int | None = None
+
+    def append(self, message: MessageRepoOutput):
+        if self.recent is not None:
+            self._append_recent(message)
+
+        if self.oldest is not None:
+            if len(self.oldest) < self.per_room:
+                insort(self.oldest, message, key=_message_key)
+            elif _message_key(message) < _message_key(self.oldest[-1]):
+                self.oldest = None
+
+        if self.total is not None:
+            self.total += 1
+
+    def _append_recent(self, message: MessageRepoOutput):
+        key = _message_key(message)
+
+        if len(self.recent) == self.per_room:
+            if key < _message_key(self.recent[0]):
+                return
+            self.recent.popleft()
+
+        index = len(self.recent)
+        while index > 0 and _message_key(self.recent[index - 1]) > key:
+            index -= 1
+        self.recent.insert(index, message)
+
+    def messages(self) -> int:
+        return len(self.recent or ()) + len(self.oldest or ())
+
+    def size(self) -> int:
+        return sum(
+            _message_size(message)
+            for message in chain(self.recent or (), self.oldest or ())
+        )
+
+
+class RecentMessagesCache:
+    def __init__(self):
+        self.per_room = 0
+        self.max_rooms = 0
+        self.max_bytes = 0
+        self._rooms: OrderedDict[UUID, RoomBuffer] = OrderedDict()
+        self._sizes: dict[UUID, int] = {}
+        self._generations: dict[UUID, int] = {}
+        self._fills: dict[UUID, int] = {}
+        self._lock = Lock()
+        self._initialized = False
+        self._bytes = 0
+        self._hits = 0
+        self._misses = 0
+        self._evictions = 0
+
+    def init(self, settings: Settings | None = None) -> 'RecentMessagesCache':
+        if not self._initialized:
+            settings = settings or get_settings()
+            self.per_room = settings.RECENT_MESSAGES_PER_ROOM
+            self.max_rooms = settings.RECENT_MESSAGES_MAX_ROOMS
+            self.max_bytes = settings.RECENT_MESSAGES_MAX_BYTES
+            self._initialized = True
+
+        return self
+
+    def fits(self, limit: int) -> bool:
+        return 0 < limit <= self.per_room
+
+    def get_recent(
+        self, room_id: UUID, limit: int
+    ) -> list[MessageRepoOutput] | None:
+        with self._lock:
+            room = self._rooms.get(room_id)
+            if room is None or room.recent is None:
+                self._misses += 1
+                return None
+
+            self._rooms.move_to_end(room_id)
+            self._hits += 1
+            messages = list(room.recent)
+
+        return messages[max(len(messages) - limit, 0) :]
+
+    @contextmanager
+    def fill(self, room_id: UUID) -> Iterator[int]:
+        with self._lock:
+            self._fills[room_id] = self._fills.get(room_id, 0) + 1
+            generation = self._generations.get(room_id, 0)
+
+        try:
+            yield generation
+        finally:
+            with self._lock:
+                self._fills[room_id] -= 1
+                if not self._fills[room_id]:
+                    del self._fills[room_id]
+                self._forget(room_id)
+
+    def put_recent(
+        self,
+        room_id: UUID,
+        messages: list[MessageRepoOutput],
+        generation: int | None = None,
+    ):
+        if not messages or self.per_room <= 0:
+            return
+
+        with self._lock:
+            if not self._is_current(room_id, generation):
+                return
+
+            room = self._room(room_id)
+            room.recent = deque(
+                messages[-self.per_room :], maxlen=self.per_room
+            )
+            self._resize(room_id, room)
+
+    def get_first_page(
+        self, room_id: UUID, size: int, include_totals: bool
+    ) -> tuple[list[MessageRepoOutput], int | None] | None:
+        with self._lock:
+            room = self._rooms.get(room_id)
+            if (
+                room is None
+                or room.oldest is None
+                or (include_totals and room.total is None)
+            ):
+                self._misses += 1
+                return None
+
+            self._rooms.move_to_end(room_id)
+            self._hits += 1
+
+            return room.oldest[:size], room.total
+
+    def put_first_page(
+        self,
+        room_id: UUID,
+        messages: list[MessageRepoOutput],
+        total: int | None,
+        generation: int | None = None,
+    ):
+        if not messages or self.per_room <= 0:
+            return
+
+        with self._lock:
+            if not self._is_current(room_id, generation):
+                return
+
+            room = self._room(room_id)
+            room.oldest = messages[: self.per_room]
+            room.total = total
+            self._resize(room_id, room)
+
+    def append(self, message: MessageRepoOutput):
+        with self._lock:
+            self._bump(message.room_id)
+            room = self._rooms.get(message.room_id)
+            if room is None:
+                return
+
+            room.append(message)
+            self._resize(message.room_id, room)
+
+    def invalidate(self, room_id: UUID):
+        with self._lock:
+            self._bump(room_id)
+            if self._rooms.pop(room_id, None) is not None:
+                self._bytes -= self._sizes.pop(room_id)
+            self._forget(room_id)
+
+    def clear(self):
+        with self._lock:
+            self._rooms.clear()
+            self._sizes.clear()
+            self._generations = {
+                room_id: generation
+                for room_id, generation in self._generations.items()
+                if room_id in self._fills
+            }
+            self._bytes = 0
+
+    def stats(self) -> RecentMessagesStats:
+        with self._lock:
+            return RecentMessagesStats(
+                rooms=len(self._rooms),
+                messages=sum(room.messages() for room in self._rooms.values()),
+                bytes=self._bytes,
+                hits=self._hits,
+                misses=self._misses,
+                evictions=self._evictions,
+            )
+
+    def _bump(self, room_id: UUID):
+        self._generations[room_id] = self._generations.get(room_id, 0) + 1
+        self._forget(room_id)
+
+    def _forget(self, room_id: UUID):
+        # a generation only matters to a cached room or a fill in flight,
+        # so it lives no longer than they do
+        if room_id not in self._rooms and room_id not in self._fills:
+            self._generations.pop(room_id, None)
+
+    def _is_current(self, room_id: UUID, generation: int | None) -> bool:
+        return generation is None or generation == self._generations.get(
+            room_id, 0
+        )
+
+    def _room(self, room_id: UUID) -> RoomBuffer:
+        room = self._rooms.get(room_id)
+        if room is None:
+            room = self._rooms[room_id] = RoomBuffer(self.per_room)
+            self._sizes[room_id] = 0
+        self._rooms.move_to_end(room_id)
+
+        return room
+
+    def _resize(self, room_id: UUID, room: RoomBuffer):
+        size = room.size()
+        self._bytes += size - self._sizes[room_id]
+        self._sizes[room_id] = size
+
+        while self._rooms and (
+            len(self._rooms) > self.max_rooms or self._bytes > self.max_bytes
+        ):
+            evicted, _ = self._rooms.popitem(last=False)
+            self._bytes -= self._sizes.pop(evicted)
+            self._forget(evicted)
+            self._evictions += 1
+
+
+recent_messages = RecentMessagesCache()
+
+
+def get_recent_messages_cache() -> RecentMessagesCache:
+    return recent_messages.init()
@@ -0,0 +1,246 @@
+from math import ceil
+from uuid import UUID
+
+from chat_realtime_api.infra.cache.recent_messages import RecentMessagesCache
+from chat_realtime_api.infra.cache.rooms import RoomListCache
+from chat_realtime_api.repositories.messages import (
+    AsyncMessageRepository,
+    CursorHistoryRepoOutput,
+    HistoryRepoOutput,
+    MessageCursor,
+    MessageRepoInput,
+    MessageRepoOutput,
+    MessageRepository,
+)
+from chat_realtime_api.repositories.rooms import (
+    RoomCursor,
+    RoomPageRepoOutput,
+    RoomRepoInput,
+    RoomRepoOutput,
+    RoomRepository,
+    RoomSort,
+)
+
+
+def _first_page(
+    room_id: UUID,
+    size: int,
+    messages: list[MessageRepoOutput],
+    total_messages: int | None,
+    include_totals: bool,
+) -> HistoryRepoOutput:
+    if not include_totals:
+        total_messages = None
+
+    return HistoryRepoOutput(
+        room_id=room_id,
+        messages=messages[:size],
+        current_page=1,
+        page_size=size,
+        total_pages=(
+            ceil(total_messages / size) if total_messages is not None else None
+        ),
+        total_messages=total_messages,
+    )
+
+
+def _last(messages: list[MessageRepoOutput], limit: int):
+    return messages[max(len(messages) - limit, 0) :]
+
+
+class CachedMessageRepository(MessageRepository):
+    def __init__(
+        self, msg_repo: MessageRepository, cache: RecentMessagesCache
+    ):
+        self._msg_repo = msg_repo
+        self._cache = cache
+
+    def save(self, msg_input: MessageRepoInput) -> MessageRepoOutput | None:
+        output = self._msg_repo.save(msg_input)
+        if output is not None:
+            self._cache.append(output)
+
+        return output
+
+    def save_many(
+        self, msg_inputs: list[MessageRepoInput]
+    ) -> list[MessageRepoOutput | None]:
+        outputs = self._msg_repo.save_many(msg_inputs)
+        for output in outputs:
+            if output is not None:
+                self._cache.append(output)
+
+        return outputs
+
+    def get_history_by_room_id(
+        self, room_id: UUID, page: int, size: int, include_totals: bool = True
+    ) -> HistoryRepoOutput:
+        if page != 1 or not self._cache.fits(size):
+            return self._msg_repo.get_history_by_room_id(
+                room_id, page, size, include_totals
+            )
+
+        cached = self._cache.get_first_page(room_id, size, include_totals)
+        if cached is not None:
+            return _first_page(room_id, size, *cached, include_totals)
+
+        with self._cache.fill(room_id) as generation:
+            history = self._msg_repo.get_history_by_room_id(
+                room_id, 1, self._cache.per_room, include_totals
+            )
+            self._cache.put_first_page(
+                room_id, history.messages, history.total_messages, generation
+            )
+
+        return _first_page(
+            room_id,
+            size,
+            history.messages,
+            history.total_messages,
+            include_totals,
+        )
+
+    def get_history_by_cursor(
+        self,
+        room_id: UUID,
+        size: int,
+        before: MessageCursor | None = None,
+        after: MessageCursor | None = None,
+    ) -> CursorHistoryRepoOutput:
+        return self._msg_repo.get_history_by_cursor(
+            room_id, size, before, after
+        )
+
+    def get_recent_messages_by_room_id(
+        self, room_id: UUID, limit: int
+    ) -> list[MessageRepoOutput]:
+        if not self._cache.fits(limit):
+            return self._msg_repo.get_recent_messages_by_room_id(
+                room_id, limit
+            )
+
+        messages = self._cache.get_recent(room_id, limit)
+        if messages is not None:
+            return messages
+
+        with self._cache.fill(room_id) as generation:
+            messages = self._msg_repo.get_recent_messages_by_room_id(
+                room_id, self._cache.per_room
+            )
+            self._cache.put_recent(room_id, messages, generation)
+
+        return _last(messages, limit)
+
+
+class AsyncCachedMessageRepository(AsyncMessageRepository):
+    def __init__(
+        self, msg_repo: AsyncMessageRepository, cache: RecentMessagesCache
+    ):
+        self._msg_repo = msg_repo
+        self._cache = cache
+
+    async def save(
+        self, msg_input: MessageRepoInput
+    ) -> MessageRepoOutput | None:
+        output = await self._msg_repo.save(msg_input)
+        if output is not None:
+            self._cache.append(output)
+
+        return output
+
+    async def save_many(
+        self, msg_inputs: list[MessageRepoInput]
+    ) -> list[MessageRepoOutput | None]:
+        outputs = await self._msg_repo.save_many(msg_inputs)
+        for output in outputs:
+            if output is not None:
+                self._cache.append(output)
+
+        return outputs
+
+    async def get_history_by_room_id(
+        self, room_id: UUID, page: int, size: int, include_totals: bool = True
+    ) -> HistoryRepoOutput:
+        if page != 1 or not self._cache.fits(size):
+            return await self._msg_repo.get_history_by_room_id(
+                room_id, page, size, include_totals
+            )
+
+        cached = self._cache.get_first_page(room_id, size, include_totals)
+        if cached is not None:
+            return _first_page(room_id, size, *cached, include_totals)
+
+        with self._cache.fill(room_id) as generation:
+            history = await self._msg_repo.get_history_by_room_id(
+                room_id, 1, self._cache.per_room, include_totals
+            )
+            self._cache.put_first_page(
+                room_id, history.messages, history.total_messages, generation
+            )
+
+        return _first_page(
+            room_id,
+            size,
+            history.messages,
+            history.total_messages,
+            include_totals,
+        )
+
+    async def get_history_by_cursor(
+        self,
+        room_id: UUID,
+        size: int,
+        before: MessageCursor | None = None,
+        after: MessageCursor | None = None,
+    ) -> CursorHistoryRepoOutput:
+        return await self._msg_repo.get_history_by_cursor(
+            room_id, size, before, after
+        )
+
+    async def get_recent_messages_by_room_id(
+        self, room_id: UUID, limit: int
+    ) -> list[MessageRepoOutput]:
+        if not self._cache.fits(limit):
+            return await self._msg_repo.get_recent_messages_by_room_id(
+                room_id, limit
+            )
+
+        messages = self._cache.get_recent(room_id, limit)
+        if messages is not None:
+            return messages
+
+        with self._cache.fill(room_id) as generation:
+            messages = await self._msg_repo.get_recent_messages_by_room_id(
+                room_id, self._cache.per_room
+            )
+            self._cache.put_recent(room_id, messages, generation)
+
+        return _last(messages, limit)
+
+
+class CachedRoomRepository(RoomRepository):
+    def __init__(self, room_repo: RoomRepository, cache: RoomListCache):
+        self._room_repo = room_repo
+        self._cache = cache
+
+    def save(self, room_input: RoomRepoInput) -> RoomRepoOutput | str:
+        output = self._room_repo.save(room_input)
+        if not isinstance(output, str):
+            self._cache.invalidate()
+
+        return output
+
+    def get_all(self) -> list[RoomRepoOutput]:
+        return self._room_repo.get_all()
+
+    def get_page(
+        self,
+        size: int,
+        sort: RoomSort = 'name',
+        name_prefix: str | None = None,
+        after: RoomCursor | None = None,
+    ) -> RoomPageRepoOutput:
+        return self._room_repo.get_page(size, sort, name_prefix, after)
+
+    def room_exists(self, room_id: UUID) -> bool:
+        return self._room_repo.room_exists(room_id)
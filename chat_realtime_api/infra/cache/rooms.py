@@ -0,0 +1,72 @@
+from dataclasses import dataclass
+from hashlib import blake2b
+from threading import Lock
+from time import monotonic
+from typing import Dict
+
+from chat_realtime_api.infra.config.settings import Settings, get_settings
+
+MAX_ENTRIES = 256
+
+
+@dataclass
+class RoomListEntry:
+    body: bytes
+    etag: str
+    expires_at: float
+
+
+def make_etag(body: bytes) -> str:
+    return f'"{blake2b(body, digest_size=16).hexdigest()}"'
+
+
+class RoomListCache:
+    def __init__(self):
+        self.ttl = 0.0
+        self.generation = 0
+        self._entries: Dict[str, RoomListEntry] = {}
+        self._lock = Lock()
+        self._initialized = False
+
+    def init(self, settings: Settings | None = None) -> 'RoomListCache':
+        if not self._initialized:
+            settings = settings or get_settings()
+            self.ttl = settings.ROOM_LIST_CACHE_TTL
+            self._initialized = True
+
+        return self
+
+    def get(self, key: str) -> RoomListEntry | None:
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None or entry.expires_at <= monotonic():
+                return None
+
+            return entry
+
+    def put(self, key: str, body: bytes, generation: int) -> RoomListEntry:
+        entry = RoomListEntry(
+            body=body, etag=make_etag(body), expires_at=monotonic() + self.ttl
+        )
+
+        with self._lock:
+            if self.ttl > 0 and generation == self.generation:
+                self._entries.pop(key, None)
+                self._entries[key] = entry
+
+                while len(self._entries) > MAX_ENTRIES:
+                    del self._entries[next(iter(self._entries))]
+
+        return entry
+
+    def invalidate(self):
+        with self._lock:
+            self.generation += 1
+            self._entries.clear()
+
+
+room_list = RoomListCache()
+
+
+def get_room_list_cache() -> RoomListCache:
+    return room_list.init()
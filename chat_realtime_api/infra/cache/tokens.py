@@ -0,0 +1,106 @@
+from collections import OrderedDict
+from dataclasses import dataclass
+from hashlib import sha256
+from threading import Lock
+from time import time
+from typing import Dict
+
+from chat_realtime_api.infra.config.settings import Settings, get_settings
+
+
+@dataclass
+class TokenCacheStats:
+    size: int
+    max_entries: int
+    hits: int
+    misses: int
+    evictions: int
+    hit_rate: float
+
+
+@dataclass
+class TokenEntry:
+    claims: Dict
+    expires_at: float
+
+
+def token_digest(token: str) -> bytes:
+    return sha256(token.encode()).digest()
+
+
+class TokenCache:
+    def __init__(self):
+        self.max_entries = 0
+        self._entries: OrderedDict[bytes, TokenEntry] = OrderedDict()
+        self._lock = Lock()
+        self._initialized = False
+        self._hits = 0
+        self._misses = 0
+        self._evictions = 0
+
+    def init(self, settings: Settings | None = None) -> 'TokenCache':
+        if not self._initialized:
+            settings = settings or get_settings()
+            self.max_entries = settings.TOKEN_CACHE_MAX_ENTRIES
+            self._initialized = True
+
+        return self
+
+    def get(self, token: str) -> Dict | None:
+        key = token_digest(token)
+
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                self._misses += 1
+                return None
+
+            if entry.expires_at <= time():
+                del self._entries[key]
+                self._misses += 1
+                return None
+
+            self._entries.move_to_end(key)
+            self._hits += 1
+
+            return dict(entry.claims)
+
+    def put(self, token: str, claims: Dict, expires_at: float):
+        if self.max_entries <= 0 or expires_at <= time():
+            return
+
+        key = token_digest(token)
+
+        with self._lock:
+            self._entries[key] = TokenEntry(
+                claims=dict(claims), expires_at=expires_at
+            )
+            self._entries.move_to_end(key)
+
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+                self._evictions += 1
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+
+    def stats(self) -> TokenCacheStats:
+        with self._lock:
+            lookups = self._hits + self._misses
+
+            return TokenCacheStats(
+                size=len(self._entries),
+                max_entries=self.max_entries,
+                hits=self._hits,
+                misses=self._misses,
+                evictions=self._evictions,
+                hit_rate=self._hits / lookups if lookups else 0.0,
+            )
+
+
+verified_tokens = TokenCache()
+
+
+def get_token_cache() -> TokenCache:
+    return verified_tokens.init()
@@ -1,4 +1,5 @@
 from datetime import datetime, timedelta
+from functools import lru_cache
 from http import HTTPStatus
 from typing import Dict
 
@@ -6,82 +7,135 @@ from fastapi import Depends, HTTPException, WebSocket
 from fastapi.security import OAuth2PasswordBearer
 from jwt import DecodeError, ExpiredSignatureError, decode, encode
 from pwdlib import PasswordHash
+from pwdlib.hashers.argon2 import Argon2Hasher
 from zoneinfo import ZoneInfo
 
-from chat_realtime_api.infra.config.settings import Settings
+from chat_realtime_api.infra.cache.tokens import get_token_cache
+from chat_realtime_api.infra.config.settings import Settings, get_settings
+from chat_realtime_api.infra.db.executor import BoundedExecutor, ExecutorStats
 
-SECRET_KEY = Settings().SECRET_KEY
-ALGORITHM = Settings().ALGORITHM
-ACCESS_TOKEN_EXPIRE_MINUTES = Settings().ACCESS_TOKEN_EXPIRE_MINUTES
-pwd_context = PasswordHash.recommended()
+
+@lru_cache
+def get_password_context() -> PasswordHash:
+    settings = get_settings()
+
+    return PasswordHash((
+        Argon2Hasher(
+            time_cost=settings.ARGON2_TIME_COST,
+            memory_cost=settings.ARGON2_MEMORY_COST,
+            parallelism=settings.ARGON2_PARALLELISM,
+        ),
+    ))
 
 
 def create_access_token(data: dict):
+    settings = get_settings()
     to_encode = data.copy()
     expire = datetime.now(tz=ZoneInfo('UTC')) + timedelta(
-        minutes=ACCESS_TOKEN_EXPIRE_MINUTES
+        minutes=settings.ACCESS_TOKEN_EXPIRE_MINUTES
     )
     to_encode.update({'exp': expire})
-    encoded_jwt = encode(to_encode, SECRET_KEY, algorithm=ALGORITHM)
+    encoded_jwt = encode(
+        to_encode, settings.SECRET_KEY, algorithm=settings.ALGORITHM
+    )
 
     return encoded_jwt
 
 
 def get_password_hash(password: str) -> str:
-    return pwd_context.hash(password)
+    return get_password_context().hash(password)
 
 
 def verify_password(plain_password: str, hashed_password: str) -> bool:
-    return pwd_context.verify(plain_password, hashed_password)
+    return get_password_context().verify(plain_password, hashed_password)
+
+
+class PasswordHasher:
+    def __init__(self):
+        self.executor: BoundedExecutor | None = None
+
+    def init(self, settings: Settings | None = None) -> 'PasswordHasher':
+        if self.executor is None:
+            settings = settings or get_settings()
+            self.executor = BoundedExecutor(
+                max_workers=settings.HASH_EXECUTOR_WORKERS,
+                max_queue=settings.HASH_EXECUTOR_QUEUE,
+                name='hash',
+                retry_after=settings.HASH_EXECUTOR_RETRY_AFTER,
+            )
+
+        return self
+
+    async def hash(self, password: str) -> str:
+        return await self.init().executor.run(get_password_hash, password)
+
+    async def verify(self, plain_password: str, hashed_password: str) -> bool:
+        return await self.init().executor.run(
+            verify_password, plain_password, hashed_password
+        )
+
+    def stats(self) -> ExecutorStats:
+        return self.init().executor.stats()
+
+    def shutdown(self):
+        if self.executor is not None:
+            self.executor.shutdown()
+            self.executor = None
+
+
+password_hasher = PasswordHasher()
+
+
+def get_password_hasher() -> PasswordHasher:
+    return password_hasher.init()
 
 
 oauth2_scheme = OAuth2PasswordBearer(tokenUrl='/api/v1/auth/login')
 
 
-def get_current_user(
-    token: str = Depends(oauth2_scheme),
-) -> Dict:
+def decode_access_token(token: str | None) -> Dict:
     credentials_exception = HTTPException(
         status_code=HTTPStatus.UNAUTHORIZED,
         detail='Could not validate credentials',
         headers={'WWW-Authenticate': 'Bearer'},
     )
 
+    if not token:
+        raise credentials_exception
+
+    cache = get_token_cache()
+    claims = cache.get(token)
+    if claims is not None:
+        return claims
+
     try:
-        payload = decode(token, SECRET_KEY, algorithms=[ALGORITHM])
+        settings = get_settings()
+        payload = decode(
+            token, settings.SECRET_KEY, algorithms=[settings.ALGORITHM]
+        )
         uid: str = payload.get('uid')
         name: str = payload.get('name')
         username: str = payload.get('sub')
 
-        if not id or not username or not name:
+        if not uid or not username or not name:
             raise credentials_exception
     except DecodeError:
         raise credentials_exception
     except ExpiredSignatureError:
         raise credentials_exception
 
-    return {'uid': uid, 'name': name, 'username': username}
+    claims = {'uid': uid, 'name': name, 'username': username}
+    if isinstance(payload.get('exp'), (int, float)):
+        cache.put(token, claims, payload['exp'])
 
+    return claims
 
-async def get_current_user_ws(websocket: WebSocket):
-    credentials_exception = HTTPException(
-        status_code=HTTPStatus.UNAUTHORIZED,
-        detail='Could not validate credentials',
-        headers={'WWW-Authenticate': 'Bearer'},
-    )
 
-    token = websocket.query_params.get('token')
-    try:
-        payload = decode(token, SECRET_KEY, algorithms=[ALGORITHM])
-        uid: str = payload.get('uid')
-        name: str = payload.get('name')
-        username: str = payload.get('sub')
+def get_current_user(
+    token: str = Depends(oauth2_scheme),
+) -> Dict:
+    return decode_access_token(token)
 
-        if not id or not username or not name:
-            raise credentials_exception
-    except DecodeError:
-        raise credentials_exception
-    except ExpiredSignatureError:
-        raise credentials_exception
 
-    return {'uid': uid, 'name': name, 'username': username}
+async def get_current_user_ws(websocket: WebSocket):
+    return decode_access_token(websocket.query_params.get('token'))
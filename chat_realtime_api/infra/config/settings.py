@@ -1,3 +1,6 @@
+from functools import lru_cache
+from typing import Literal
+
 from pydantic_settings import BaseSettings, SettingsConfigDict
 
 
@@ -13,3 +16,54 @@ class Settings(BaseSettings):
     SECRET_KEY: str
     ALGORITHM: str
     ACCESS_TOKEN_EXPIRE_MINUTES: int
+
+    DB_POOL_SIZE: int = 10
+    DB_MAX_OVERFLOW: int = 20
+    DB_POOL_TIMEOUT: float = 30.0
+    DB_POOL_RECYCLE: int = 1800
+    DB_POOL_PRE_PING: bool = True
+    DB_PGBOUNCER: bool = False
+    DB_ASYNC: bool = False
+    DB_EXECUTOR_WORKERS: int = 10
+    DB_EXECUTOR_QUEUE: int = 100
+    DB_EXECUTOR_RETRY_AFTER: int = 1
+
+    HASH_EXECUTOR_WORKERS: int = 2
+    HASH_EXECUTOR_QUEUE: int = 32
+    HASH_EXECUTOR_RETRY_AFTER: int = 1
+    ARGON2_TIME_COST: int = 3
+    ARGON2_MEMORY_COST: int = 65536
+    ARGON2_PARALLELISM: int = 4
+
+    WS_SEND_TIMEOUT: float = 5.0
+    WS_QUEUE_SIZE: int = 100
+    WS_OVERFLOW_POLICY: Literal['drop_oldest', 'drop_newest', 'disconnect'] = (
+        'drop_oldest'
+    )
+    WS_OVERFLOW_CLOSE_CODE: Literal[1008, 1013] = 1013
+    WS_HISTORY_LIMIT: int = 50
+    WS_MAX_MESSAGE_LENGTH: int = 1000
+
+    RECENT_MESSAGES_PER_ROOM: int = 50
+    RECENT_MESSAGES_MAX_ROOMS: int = 1000
+    RECENT_MESSAGES_MAX_BYTES: int = 64 * 1024 * 1024
+
+    ROOM_LIST_CACHE_TTL: float = 5.0
+
+    TOKEN_CACHE_MAX_ENTRIES: int = 10_000
+
+    WARMUP_ENABLED: bool = False
+    WARMUP_CONNECTIONS: int = 2
+
+    WRITE_BEHIND_ENABLED: bool = False
+    WRITE_BEHIND_INTERVAL: float = 0.005
+    WRITE_BEHIND_MAX_BATCH: int = 100
+
+    BROKER_BACKEND: Literal['memory', 'postgres', 'unix'] = 'memory'
+    BROKER_CHANNEL: str = 'chat_broadcast'
+    BROKER_UNIX_DIR: str = '/tmp/chat_realtime_api'
+
+
+@lru_cache
+def get_settings() -> Settings:
+    return Settings()
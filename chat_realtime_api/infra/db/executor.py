@@ -0,0 +1,86 @@
+import asyncio
+from concurrent.futures import Future, ThreadPoolExecutor
+from dataclasses import dataclass
+from threading import Lock
+from typing import Callable, TypeVar
+
+from chat_realtime_api.services.errors.exceptions import (
+    ExecutorSaturatedException,
+)
+
+T = TypeVar('T')
+
+
+@dataclass
+class ExecutorStats:
+    max_workers: int
+    max_queue: int
+    running: int
+    queued: int
+    completed: int
+    rejected: int
+    saturation: float
+
+
+class BoundedExecutor:
+    def __init__(
+        self,
+        max_workers: int,
+        max_queue: int,
+        name: str = 'db',
+        retry_after: int = 1,
+    ):
+        self.max_workers = max_workers
+        self.max_queue = max_queue
+        self.retry_after = retry_after
+        self._executor = ThreadPoolExecutor(
+            max_workers=max_workers, thread_name_prefix=name
+        )
+        self._lock = Lock()
+        self._pending = 0
+        self._running = 0
+        self._completed = 0
+        self._rejected = 0
+
+    async def run(self, func: Callable[..., T], *args) -> T:
+        with self._lock:
+            if self._pending >= self.max_workers + self.max_queue:
+                self._rejected += 1
+                raise ExecutorSaturatedException(self.retry_after)
+
+            self._pending += 1
+
+        future = self._executor.submit(self._call, func, *args)
+        future.add_done_callback(self._done)
+
+        return await asyncio.wrap_future(future)
+
+    def _call(self, func: Callable[..., T], *args) -> T:
+        with self._lock:
+            self._running += 1
+
+        try:
+            return func(*args)
+        finally:
+            with self._lock:
+                self._running -= 1
+
+    def _done(self, _: Future):
+        with self._lock:
+            self._pending -= 1
+            self._completed += 1
+
+    def stats(self) -> ExecutorStats:
+        with self._lock:
+            return ExecutorStats(
+                max_workers=self.max_workers,
+                max_queue=self.max_queue,
+                running=self._running,
+                queued=self._pending - self._running,
+                completed=self._completed,
+                rejected=self._rejected,
+                saturation=self._pending / (self.max_workers + self.max_queue),
+            )
+
+    def shutdown(self):
+        self._executor.shutdown(wait=True)
@@ -1,11 +1,249 @@
-from sqlalchemy import create_engine
-from sqlalchemy.orm import Session
+from dataclasses import dataclass
+from time import perf_counter
 
-from chat_realtime_api.infra.config.settings import Settings
+import anyio
+from sqlalchemy import URL, Engine, create_engine, event, exc, make_url
+from sqlalchemy.ext.asyncio import (
+    AsyncEngine,
+    AsyncSession,
+    async_sessionmaker,
+    create_async_engine,
+)
+from sqlalchemy.orm import Session, sessionmaker
+from sqlalchemy.pool import (
+    AsyncAdaptedQueuePool,
+    NullPool,
+    Pool,
+    QueuePool,
+)
+
+from chat_realtime_api.infra.config.settings import Settings, get_settings
+from chat_realtime_api.infra.db.executor import BoundedExecutor
+
+ASYNC_DRIVERS = {
+    'postgresql': 'postgresql+psycopg',
+    'sqlite': 'sqlite+aiosqlite',
+}
+
+
+class PoolWaitsMixin:
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.waits = 0
+        self.wait_time = 0.0
+        self.timeouts = 0
+
+    def _do_get(self):
+        if self.checkedin() > 0 or self._max_overflow < 0:
+            return super()._do_get()
+
+        if self.overflow() < self._max_overflow:
+            return super()._do_get()
+
+        self.waits += 1
+        start = perf_counter()
+        try:
+            return super()._do_get()
+        except exc.TimeoutError:
+            self.timeouts += 1
+            raise
+        finally:
+            self.wait_time += perf_counter() - start
+
+
+class InstrumentedQueuePool(PoolWaitsMixin, QueuePool):
+    pass
+
+
+class InstrumentedAsyncAdaptedQueuePool(PoolWaitsMixin, AsyncAdaptedQueuePool):
+    pass
+
+
+@dataclass
+class PoolStats:
+    pool: str
+    size: int
+    checked_out: int
+    checked_in: int
+    overflow: int
+    waits: int
+    wait_time: float
+    timeouts: int
+
+
+def async_database_url(database_url: str) -> URL:
+    url = make_url(database_url)
+    driver = ASYNC_DRIVERS.get(url.get_backend_name())
+
+    if driver is None or url.get_driver_name() in {'psycopg', 'aiosqlite'}:
+        return url
+
+    return url.set(drivername=driver)
+
+
+def _engine_options(settings: Settings, url: URL, pool_class: type[Pool]):
+    if settings.DB_PGBOUNCER:
+        connect_args = {}
+        if url.get_driver_name() == 'psycopg':
+            connect_args['prepare_threshold'] = None
+
+        return {
+            'poolclass': NullPool,
+            'pool_pre_ping': settings.DB_POOL_PRE_PING,
+            'connect_args': connect_args,
+        }
+
+    return {
+        'poolclass': pool_class,
+        'pool_size': settings.DB_POOL_SIZE,
+        'max_overflow': settings.DB_MAX_OVERFLOW,
+        'pool_timeout': settings.DB_POOL_TIMEOUT,
+        'pool_recycle': settings.DB_POOL_RECYCLE,
+        'pool_pre_ping': settings.DB_POOL_PRE_PING,
+    }
+
+
+def _enable_foreign_keys(dbapi_connection, _):
+    cursor = dbapi_connection.cursor()
+    cursor.execute('PRAGMA foreign_keys=ON')
+    cursor.close()
+
+
+def enable_sqlite_foreign_keys(engine: Engine) -> Engine:
+    if engine.dialect.name == 'sqlite':
+        event.listen(engine, 'connect', _enable_foreign_keys)
+
+    return engine
+
+
+def create_db_engine(settings: Settings) -> Engine:
+    url = make_url(settings.DATABASE_URL)
+
+    return enable_sqlite_foreign_keys(
+        create_engine(
+            url, **_engine_options(settings, url, InstrumentedQueuePool)
+        )
+    )
+
+
+def create_async_db_engine(settings: Settings) -> AsyncEngine:
+    url = async_database_url(settings.DATABASE_URL)
+    engine = create_async_engine(
+        url,
+        **_engine_options(settings, url, InstrumentedAsyncAdaptedQueuePool),
+    )
+    enable_sqlite_foreign_keys(engine.sync_engine)
+
+    return engine
+
+
+def _pool_stats(pool: Pool) -> PoolStats:
+    if not isinstance(pool, QueuePool):
+        return PoolStats(
+            pool=type(pool).__name__,
+            size=0,
+            checked_out=0,
+            checked_in=0,
+            overflow=0,
+            waits=0,
+            wait_time=0.0,
+            timeouts=0,
+        )
+
+    return PoolStats(
+        pool=type(pool).__name__,
+        size=pool.size(),
+        checked_out=pool.checkedout(),
+        checked_in=pool.checkedin(),
+        overflow=max(pool.overflow(), 0),
+        waits=getattr(pool, 'waits', 0),
+        wait_time=getattr(pool, 'wait_time', 0.0),
+        timeouts=getattr(pool, 'timeouts', 0),
+    )
+
+
+class Database:
+    def __init__(self):
+        self.settings: Settings | None = None
+        self.engine: Engine | None = None
+        self.session_factory: sessionmaker[Session] | None = None
+        self.async_engine: AsyncEngine | None = None
+        self.async_session_factory: async_sessionmaker[AsyncSession] | None = (
+            None
+        )
+        self.executor: BoundedExecutor | None = None
+
+    def init(self, settings: Settings | None = None) -> Engine:
+        if self.engine is None:
+            self.settings = settings or get_settings()
+            self.engine = create_db_engine(self.settings)
+            self.session_factory = sessionmaker(self.engine)
+            self.executor = BoundedExecutor(
+                max_workers=self.settings.DB_EXECUTOR_WORKERS,
+                max_queue=self.settings.DB_EXECUTOR_QUEUE,
+                retry_after=self.settings.DB_EXECUTOR_RETRY_AFTER,
+            )
+
+            if self.settings.DB_ASYNC:
+                self.async_engine = create_async_db_engine(self.settings)
+                self.async_session_factory = async_sessionmaker(
+                    self.async_engine, expire_on_commit=False
+                )
+
+        return self.engine
+
+    async def dispose(self):
+        if self.async_engine is not None:
+            await self.async_engine.dispose()
+
+        if self.executor is not None:
+            await anyio.to_thread.run_sync(self.executor.shutdown)
+
+        if self.engine is not None:
+            await anyio.to_thread.run_sync(self.engine.dispose)
+
+        self.settings = None
+        self.engine = None
+        self.session_factory = None
+        self.async_engine = None
+        self.async_session_factory = None
+        self.executor = None
+
+    def pool_stats(self) -> PoolStats:
+        return _pool_stats(self.init().pool)
+
+    def async_pool_stats(self) -> PoolStats | None:
+        self.init()
+
+        if self.async_engine is None:
+            return None
+
+        return _pool_stats(self.async_engine.pool)
+
+
+db = Database()
 
 
 def get_session():
-    engine = create_engine(Settings().DATABASE_URL)
+    db.init()
 
-    with Session(engine) as session:
+    with db.session_factory() as session:
         yield session
+
+
+def get_session_factory() -> sessionmaker[Session]:
+    db.init()
+
+    return db.session_factory
+
+
+def get_async_session_factory() -> async_sessionmaker[AsyncSession] | None:
+    db.init()
+
+    return db.async_session_factory
+
+
+def get_db_executor() -> BoundedExecutor:
+    db.init()
+
+    return db.executor
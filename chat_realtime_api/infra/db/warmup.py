@@ -0,0 +1,231 @@
+import asyncio
+import logging
+from contextlib import AsyncExitStack, ExitStack
+from dataclasses import dataclass
+from datetime import datetime
+from functools import partial
+from time import perf_counter
+from typing import Callable
+from uuid import uuid4
+
+from sqlalchemy import Engine
+from sqlalchemy.ext.asyncio import AsyncEngine, AsyncSession
+from sqlalchemy.orm import Session
+from sqlalchemy.pool import QueuePool
+
+from chat_realtime_api.infra.config.security import PasswordHasher
+from chat_realtime_api.infra.config.settings import Settings
+from chat_realtime_api.infra.db.session import Database
+from chat_realtime_api.infra.sqlalchemy_repositories.messages import (
+    AsyncSqlAlchemyMessageRepository,
+    SqlAlchemyMessageRepository,
+)
+from chat_realtime_api.infra.sqlalchemy_repositories.rooms import (
+    AsyncSqlAlchemyRoomRepository,
+    SqlAlchemyRoomRepository,
+)
+from chat_realtime_api.infra.sqlalchemy_repositories.users import (
+    AsyncSqlAlchemyUserRepository,
+    SqlAlchemyUserRepository,
+)
+from chat_realtime_api.repositories.messages import (
+    AsyncMessageRepository,
+    MessageCursor,
+    MessageRepository,
+)
+from chat_realtime_api.repositories.rooms import (
+    AsyncRoomRepository,
+    RoomRepository,
+    RoomSort,
+)
+from chat_realtime_api.repositories.users import (
+    AsyncUserRepository,
+    UserRepository,
+)
+
+logger = logging.getLogger(__name__)
+
+ROOM_SORTS: list[RoomSort] = ['name', '-name', 'created_at', '-created_at']
+
+
+@dataclass
+class WarmupStats:
+    enabled: bool
+    ready: bool
+    connections: int
+    statements: int
+    duration: float
+    error: str | None
+
+
+def _pool_target(engine: Engine, connections: int) -> int:
+    if not isinstance(engine.pool, QueuePool):
+        return 0
+
+    return min(connections, engine.pool.size())
+
+
+def open_connections(engine: Engine, connections: int) -> int:
+    target = _pool_target(engine, connections)
+
+    with ExitStack() as stack:
+        for _ in range(target):
+            stack.enter_context(engine.connect())
+
+    return target
+
+
+async def open_async_connections(engine: AsyncEngine, connections: int) -> int:
+    target = _pool_target(engine.sync_engine, connections)
+
+    async with AsyncExitStack() as stack:
+        for _ in range(target):
+            await stack.enter_async_context(engine.connect())
+
+    return target
+
+
+def hot_calls(
+    messages: MessageRepository | AsyncMessageRepository,
+    rooms: RoomRepository | AsyncRoomRepository,
+    users: UserRepository | AsyncUserRepository,
+) -> list[Callable]:
+    # lookups for a room that does not exist: every statement gets compiled
+    # into the engine's cache without reading or writing any rows
+    room_id = uuid4()
+    cursor = MessageCursor(timestamp=datetime.now(), id=room_id)
+
+    return [
+        partial(messages.get_history_by_room_id, room_id, 1, 10),
+        partial(
+            messages.get_history_by_room_id,
+            room_id,
+            1,
+            10,
+            include_totals=False,
+        ),
+        partial(messages.get_history_by_cursor, room_id, 10),
+        partial(messages.get_history_by_cursor, room_id, 10, before=cursor),
+        partial(messages.get_history_by_cursor, room_id, 10, after=cursor),
+        partial(messages.get_recent_messages_by_room_id, room_id, 10),
+        *[partial(rooms.get_page, 20, sort) for sort in ROOM_SORTS],
+        partial(rooms.room_exists, room_id),
+        partial(users.get_by_username, ''),
+    ]
+
+
+def run_hot_statements(session: Session) -> int:
+    calls = hot_calls(
+        SqlAlchemyMessageRepository(session),
+        SqlAlchemyRoomRepository(session),
+        SqlAlchemyUserRepository(session),
+    )
+    for call in calls:
+        call()
+    session.rollback()
+
+    return len(calls)
+
+
+async def run_async_hot_statements(session: AsyncSession) -> int:
+    calls = hot_calls(
+        AsyncSqlAlchemyMessageRepository(session),
+        AsyncSqlAlchemyRoomRepository(session),
+        AsyncSqlAlchemyUserRepository(session),
+    )
+    for call in calls:
+        await call()
+    await session.rollback()
+
+    return len(calls)
+
+
+class Warmup:
+    def __init__(self):
+        self.enabled = False
+        self.ready = False
+        self.connections = 0
+        self.statements = 0
+        self.duration = 0.0
+        self.error: str | None = None
+        self._task: asyncio.Task | None = None
+
+    def start(
+        self, settings: Settings, database: Database, hasher: PasswordHasher
+    ):
+        self.enabled = settings.WARMUP_ENABLED
+        self.ready = not self.enabled
+        self.connections = 0
+        self.statements = 0
+        self.duration = 0.0
+        self.error = None
+
+        if self.enabled:
+            self._task = asyncio.create_task(
+                self.run(settings, database, hasher)
+            )
+
+    async def run(
+        self, settings: Settings, database: Database, hasher: PasswordHasher
+    ):
+        start = perf_counter()
+
+        try:
+            await self._warm_sync(settings, database)
+            await self._warm_async(settings, database)
+            await hasher.hash('warmup')
+        except Exception as e:
+            logger.exception('Warm-up failed')
+            self.error = str(e)
+        else:
+            self.ready = True
+        finally:
+            self.duration = perf_counter() - start
+
+    async def _warm_sync(self, settings: Settings, database: Database):
+        def execute():
+            connections = open_connections(
+                database.engine, settings.WARMUP_CONNECTIONS
+            )
+            with database.session_factory() as session:
+                return connections, run_hot_statements(session)
+
+        connections, statements = await database.executor.run(execute)
+        self.connections += connections
+        self.statements += statements
+
+    async def _warm_async(self, settings: Settings, database: Database):
+        if database.async_engine is None:
+            return
+
+        self.connections += await open_async_connections(
+            database.async_engine, settings.WARMUP_CONNECTIONS
+        )
+        async with database.async_session_factory() as session:
+            self.statements += await run_async_hot_statements(session)
+
+    async def wait(self):
+        if self._task is not None:
+            await self._task
+
+    async def stop(self):
+        if self._task is not None:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+
+    def stats(self) -> WarmupStats:
+        return WarmupStats(
+            enabled=self.enabled,
+            ready=self.ready,
+            connections=self.connections,
+            statements=self.statements,
+            duration=self.duration,
+            error=self.error,
+        )
+
+
+warmup = Warmup()
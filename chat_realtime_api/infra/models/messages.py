@@ -1,15 +1,29 @@
 from datetime import datetime
 from uuid import UUID
 
-from sqlalchemy import ForeignKey, func
+from sqlalchemy import DDL, ForeignKey, Index, event, func
 from sqlalchemy.orm import Mapped, mapped_column, relationship
 
 from chat_realtime_api.infra.models.base import table_registry
+from chat_realtime_api.infra.models.triggers import (
+    DROP_MESSAGE_COUNT_FUNCTIONS,
+    MESSAGE_COUNT_TRIGGERS,
+)
 
 
 @table_registry.mapped_as_dataclass
 class MessageModel:
     __tablename__ = 'messages'
+    __table_args__ = (
+        Index(
+            'ix_messages_room_id_timestamp_id',
+            'room_id',
+            'timestamp',
+            'id',
+            postgresql_include=['user_id'],
+        ),
+        Index('ix_messages_user_id_timestamp', 'user_id', 'timestamp'),
+    )
 
     content: Mapped[str] = mapped_column(nullable=False)
     timestamp: Mapped[datetime] = mapped_column(nullable=False)
@@ -26,3 +40,18 @@ class MessageModel:
         ForeignKey('users.id'), nullable=False
     )
     user: Mapped['UserModel'] = relationship(back_populates='messages')  # type: ignore # noqa: F821
+
+
+for dialect, statements in MESSAGE_COUNT_TRIGGERS.items():
+    for statement in statements:
+        event.listen(
+            MessageModel.__table__,
+            'after_create',
+            DDL(statement).execute_if(dialect=dialect),
+        )
+
+event.listen(
+    MessageModel.__table__,
+    'after_drop',
+    DDL(DROP_MESSAGE_COUNT_FUNCTIONS).execute_if(dialect='postgresql'),
+)
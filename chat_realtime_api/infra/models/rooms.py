@@ -1,7 +1,7 @@
 from datetime import datetime
 from uuid import UUID
 
-from sqlalchemy import ForeignKey, func
+from sqlalchemy import ForeignKey, Index, func, text
 from sqlalchemy.orm import Mapped, mapped_column
 
 from chat_realtime_api.infra.models.base import table_registry
@@ -10,12 +10,23 @@ from chat_realtime_api.infra.models.base import table_registry
 @table_registry.mapped_as_dataclass
 class RoomModel:
     __tablename__ = 'rooms'
+    __table_args__ = (
+        Index('ix_rooms_created_at_id', 'created_at', 'id'),
+        Index(
+            'ix_rooms_name_pattern',
+            'name',
+            postgresql_ops={'name': 'text_pattern_ops'},
+        ).ddl_if(dialect='postgresql'),
+    )
 
     name: Mapped[str] = mapped_column(unique=True)
     description: Mapped[str] = mapped_column(nullable=True)
     created_at: Mapped[datetime] = mapped_column(
         init=False, server_default=func.now()
     )
+    message_count: Mapped[int] = mapped_column(
+        init=False, default=0, server_default=text('0')
+    )
     id: Mapped[UUID] = mapped_column(primary_key=True, nullable=False)
 
     creator_id: Mapped[UUID] = mapped_column(
@@ -0,0 +1,64 @@
+# migration 8f2d4b6a1e90 keeps its own copy of these statements;
+# tests/test_migrations.py checks that the two stay identical
+MESSAGE_COUNT_TRIGGERS = {
+    'sqlite': [
+        """
+        CREATE TRIGGER messages_count_insert AFTER INSERT ON messages
+        BEGIN
+            UPDATE rooms SET message_count = message_count + 1
+            WHERE id = NEW.room_id;
+        END
+        """,
+        """
+        CREATE TRIGGER messages_count_delete AFTER DELETE ON messages
+        BEGIN
+            UPDATE rooms SET message_count = message_count - 1
+            WHERE id = OLD.room_id;
+        END
+        """,
+    ],
+    'postgresql': [
+        """
+        CREATE OR REPLACE FUNCTION messages_count_insert()
+        RETURNS trigger AS $$
+        BEGIN
+            UPDATE rooms SET message_count = rooms.message_count + counts.total
+            FROM (
+                SELECT room_id, count(*) AS total FROM new_messages
+                GROUP BY room_id
+            ) AS counts
+            WHERE rooms.id = counts.room_id;
+            RETURN NULL;
+        END;
+        $$ LANGUAGE plpgsql
+        """,
+        """
+        CREATE OR REPLACE FUNCTION messages_count_delete()
+        RETURNS trigger AS $$
+        BEGIN
+            UPDATE rooms SET message_count = rooms.message_count - counts.total
+            FROM (
+                SELECT room_id, count(*) AS total FROM old_messages
+                GROUP BY room_id
+            ) AS counts
+            WHERE rooms.id = counts.room_id;
+            RETURN NULL;
+        END;
+        $$ LANGUAGE plpgsql
+        """,
+        """
+        CREATE TRIGGER messages_count_insert AFTER INSERT ON messages
+        REFERENCING NEW TABLE AS new_messages
+        FOR EACH STATEMENT EXECUTE FUNCTION messages_count_insert()
+        """,
+        """
+        CREATE TRIGGER messages_count_delete AFTER DELETE ON messages
+        REFERENCING OLD TABLE AS old_messages
+        FOR EACH STATEMENT EXECUTE FUNCTION messages_count_delete()
+        """,
+    ],
+}
+
+DROP_MESSAGE_COUNT_FUNCTIONS = (
+    'DROP FUNCTION IF EXISTS messages_count_insert(), messages_count_delete()'
+)
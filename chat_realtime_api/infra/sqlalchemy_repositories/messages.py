@@ -1,13 +1,21 @@
 from datetime import datetime
+from math import ceil
+from typing import Sequence
 from uuid import UUID, uuid4
 
-from sqlalchemy import func, select
+from sqlalchemy import Insert, Row, Select, insert, select, tuple_
+from sqlalchemy.exc import IntegrityError
+from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.orm import Session
 
 from chat_realtime_api.infra.models.messages import MessageModel
+from chat_realtime_api.infra.models.rooms import RoomModel
 from chat_realtime_api.infra.models.users import UserModel
 from chat_realtime_api.repositories.messages import (
+    AsyncMessageRepository,
+    CursorHistoryRepoOutput,
     HistoryRepoOutput,
+    MessageCursor,
     MessageRepoInput,
     MessageRepoOutput,
     MessageRepository,
@@ -15,104 +23,315 @@ from chat_realtime_api.repositories.messages import (
 )
 
 
+def _message_values(msg_input: MessageRepoInput) -> dict:
+    return {
+        'id': uuid4(),
+        'room_id': msg_input.room_id,
+        'content': msg_input.content,
+        'user_id': msg_input.user_id,
+        'timestamp': datetime.now(),
+    }
+
+
+def insert_message_query(msg_input: MessageRepoInput) -> Insert:
+    return (
+        insert(MessageModel)
+        .values(**_message_values(msg_input))
+        .returning(
+            MessageModel.id,
+            MessageModel.room_id,
+            MessageModel.content,
+            MessageModel.timestamp,
+        )
+    )
+
+
+def insert_messages_query() -> Insert:
+    return insert(MessageModel).returning(
+        MessageModel.id,
+        MessageModel.room_id,
+        MessageModel.content,
+        MessageModel.timestamp,
+        sort_by_parameter_order=True,
+    )
+
+
+def _inserted_row_to_output(
+    row: Row, msg_input: MessageRepoInput
+) -> MessageRepoOutput:
+    return MessageRepoOutput(
+        id=row.id,
+        room_id=row.room_id,
+        user=UserRepoOutput(id=msg_input.user_id, name=msg_input.user_name),
+        content=row.content,
+        timestamp=row.timestamp,
+    )
+
+
+def message_rows_to_outputs(rows: Sequence[Row]) -> list[MessageRepoOutput]:
+    # DTOs are frozen, so one author object is shared by all their messages
+    users: dict[UUID, UserRepoOutput] = {}
+    outputs = []
+
+    for row in rows:
+        user = users.get(row.user_id)
+        if user is None:
+            user = users[row.user_id] = UserRepoOutput(
+                id=row.user_id, name=row.user_name
+            )
+
+        outputs.append(
+            MessageRepoOutput(
+                id=row.id,
+                room_id=row.room_id,
+                user=user,
+                content=row.content,
+                timestamp=row.timestamp,
+            )
+        )
+
+    return outputs
+
+
+def messages_query() -> Select:
+    return select(
+        MessageModel.id,
+        MessageModel.room_id,
+        MessageModel.content,
+        MessageModel.timestamp,
+        UserModel.id.label('user_id'),
+        UserModel.name.label('user_name'),
+    ).join(UserModel, MessageModel.user_id == UserModel.id)
+
+
+def history_page_query(room_id: UUID, page: int, size: int) -> Select:
+    return (
+        messages_query()
+        .filter(MessageModel.room_id == room_id)
+        .order_by(MessageModel.timestamp, MessageModel.id)
+        .offset((page - 1) * size)
+        .limit(size)
+    )
+
+
+def message_count_query(room_id: UUID) -> Select:
+    return select(RoomModel.message_count).filter(RoomModel.id == room_id)
+
+
+def recent_messages_query(room_id: UUID, limit: int) -> Select:
+    return (
+        messages_query()
+        .filter(MessageModel.room_id == room_id)
+        .order_by(MessageModel.timestamp.desc(), MessageModel.id.desc())
+        .limit(limit)
+    )
+
+
+def cursor_history_query(
+    room_id: UUID,
+    size: int,
+    before: MessageCursor | None,
+    after: MessageCursor | None,
+) -> Select:
+    key = tuple_(MessageModel.timestamp, MessageModel.id)
+    query = (
+        messages_query()
+        .filter(MessageModel.room_id == room_id)
+        .limit(size + 1)
+    )
+
+    if after is not None:
+        return query.filter(key > (after.timestamp, after.id)).order_by(
+            MessageModel.timestamp, MessageModel.id
+        )
+
+    if before is not None:
+        query = query.filter(key < (before.timestamp, before.id))
+
+    return query.order_by(
+        MessageModel.timestamp.desc(), MessageModel.id.desc()
+    )
+
+
+def _to_history_output(
+    room_id: UUID,
+    page: int,
+    size: int,
+    rows: Sequence[Row],
+    total_messages: int | None,
+) -> HistoryRepoOutput:
+    return HistoryRepoOutput(
+        room_id=room_id,
+        messages=message_rows_to_outputs(rows),
+        current_page=page,
+        page_size=size,
+        total_pages=(
+            ceil(total_messages / size) if total_messages is not None else None
+        ),
+        total_messages=total_messages,
+    )
+
+
+def _to_cursor_history_output(
+    room_id: UUID,
+    size: int,
+    rows: Sequence[Row],
+    after: MessageCursor | None,
+) -> CursorHistoryRepoOutput:
+    page = rows[:size]
+    if after is None:
+        page.reverse()
+
+    return CursorHistoryRepoOutput(
+        room_id=room_id,
+        messages=message_rows_to_outputs(page),
+        has_more=len(rows) > size,
+    )
+
+
 class SqlAlchemyMessageRepository(MessageRepository):
     def __init__(self, session: Session):
         self._session = session
 
-    def save(self, msg_input: MessageRepoInput) -> MessageRepoOutput:
-        user = self._session.scalars(
-            select(UserModel).filter(UserModel.id == msg_input.user_id)
-        ).first()
-
-        message_db = MessageModel(
-            id=uuid4(),
-            room_id=msg_input.room_id,
-            content=msg_input.content,
-            user_id=msg_input.user_id,
-            timestamp=datetime.now(),
-            user=user,
-        )
+    def save(self, msg_input: MessageRepoInput) -> MessageRepoOutput | None:
+        try:
+            row = self._session.execute(insert_message_query(msg_input)).one()
+            self._session.commit()
+        except IntegrityError:
+            self._session.rollback()
+            return None
 
-        self._session.add(message_db)
-        self._session.commit()
-        self._session.refresh(message_db)
-
-        return MessageRepoOutput(
-            id=message_db.id,
-            room_id=message_db.room_id,
-            user=UserRepoOutput(
-                id=message_db.user.id,
-                name=message_db.user.name,
-            ),
-            content=message_db.content,
-            timestamp=message_db.timestamp,
-        )
+        return _inserted_row_to_output(row, msg_input)
+
+    def save_many(
+        self, msg_inputs: list[MessageRepoInput]
+    ) -> list[MessageRepoOutput | None]:
+        try:
+            rows = self._session.execute(
+                insert_messages_query(),
+                [_message_values(msg_input) for msg_input in msg_inputs],
+            ).all()
+            self._session.commit()
+        except IntegrityError:
+            self._session.rollback()
+            return [self.save(msg_input) for msg_input in msg_inputs]
+
+        return [
+            _inserted_row_to_output(row, msg_input)
+            for row, msg_input in zip(rows, msg_inputs)
+        ]
 
     def get_history_by_room_id(
-        self, room_id: UUID, page: int, size: int
+        self, room_id: UUID, page: int, size: int, include_totals: bool = True
     ) -> HistoryRepoOutput:
-        messages_db = self._session.scalars(
-            select(MessageModel)
-            .filter(MessageModel.room_id == room_id)
-            .offset((page - 1) * size)
-            .limit(size)
+        rows = self._session.execute(
+            history_page_query(room_id, page, size)
         ).all()
 
-        if not messages_db:
-            return HistoryRepoOutput(
-                room_id=room_id,
-                messages=[],
-                current_page=page,
-                page_size=size,
-                total_pages=0,
-                total_messages=0,
-            )
+        total_messages = None
+        if include_totals:
+            total_messages = self._session.scalar(message_count_query(room_id))
 
-        total_messages = self._session.scalars(
-            select(func.count(MessageModel.id)).filter(
-                MessageModel.room_id == room_id
-            )
-        ).first()
-
-        return HistoryRepoOutput(
-            room_id=room_id,
-            messages=[
-                MessageRepoOutput(
-                    id=msg_db.id,
-                    room_id=msg_db.room_id,
-                    user=UserRepoOutput(
-                        id=msg_db.user.id,
-                        name=msg_db.user.name,
-                    ),
-                    content=msg_db.content,
-                    timestamp=msg_db.timestamp,
-                )
-                for msg_db in messages_db
-            ],
-            current_page=page,
-            page_size=size,
-            total_pages=(total_messages // size) + 1,
-            total_messages=total_messages,
-        )
+        return _to_history_output(room_id, page, size, rows, total_messages)
 
-    def get_messages_by_room_id(self, room_id):
-        messages_db = self._session.scalars(
-            select(MessageModel).filter(MessageModel.room_id == room_id)
+    def get_history_by_cursor(
+        self,
+        room_id: UUID,
+        size: int,
+        before: MessageCursor | None = None,
+        after: MessageCursor | None = None,
+    ) -> CursorHistoryRepoOutput:
+        rows = self._session.execute(
+            cursor_history_query(room_id, size, before, after)
         ).all()
 
-        if not messages_db:
-            return []
+        return _to_cursor_history_output(room_id, size, rows, after)
+
+    def get_recent_messages_by_room_id(
+        self, room_id: UUID, limit: int
+    ) -> list[MessageRepoOutput]:
+        rows = self._session.execute(
+            recent_messages_query(room_id, limit)
+        ).all()
+
+        return message_rows_to_outputs(rows[::-1])
+
+
+class AsyncSqlAlchemyMessageRepository(AsyncMessageRepository):
+    def __init__(self, session: AsyncSession):
+        self._session = session
+
+    async def save(
+        self, msg_input: MessageRepoInput
+    ) -> MessageRepoOutput | None:
+        try:
+            row = (
+                await self._session.execute(insert_message_query(msg_input))
+            ).one()
+            await self._session.commit()
+        except IntegrityError:
+            await self._session.rollback()
+            return None
+
+        return _inserted_row_to_output(row, msg_input)
+
+    async def save_many(
+        self, msg_inputs: list[MessageRepoInput]
+    ) -> list[MessageRepoOutput | None]:
+        try:
+            rows = (
+                await self._session.execute(
+                    insert_messages_query(),
+                    [_message_values(msg_input) for msg_input in msg_inputs],
+                )
+            ).all()
+            await self._session.commit()
+        except IntegrityError:
+            await self._session.rollback()
+            return [await self.save(msg_input) for msg_input in msg_inputs]
 
         return [
-            MessageRepoOutput(
-                id=msg_db.id,
-                room_id=msg_db.room_id,
-                user=UserRepoOutput(
-                    id=msg_db.user.id,
-                    name=msg_db.user.name,
-                ),
-                content=msg_db.content,
-                timestamp=msg_db.timestamp,
-            )
-            for msg_db in messages_db
+            _inserted_row_to_output(row, msg_input)
+            for row, msg_input in zip(rows, msg_inputs)
         ]
+
+    async def get_history_by_room_id(
+        self, room_id: UUID, page: int, size: int, include_totals: bool = True
+    ) -> HistoryRepoOutput:
+        rows = (
+            await self._session.execute(
+                history_page_query(room_id, page, size)
+            )
+        ).all()
+
+        total_messages = None
+        if include_totals:
+            total_messages = await self._session.scalar(
+                message_count_query(room_id)
+            )
+
+        return _to_history_output(room_id, page, size, rows, total_messages)
+
+    async def get_history_by_cursor(
+        self,
+        room_id: UUID,
+        size: int,
+        before: MessageCursor | None = None,
+        after: MessageCursor | None = None,
+    ) -> CursorHistoryRepoOutput:
+        rows = (
+            await self._session.execute(
+                cursor_history_query(room_id, size, before, after)
+            )
+        ).all()
+
+        return _to_cursor_history_output(room_id, size, rows, after)
+
+    async def get_recent_messages_by_room_id(
+        self, room_id: UUID, limit: int
+    ) -> list[MessageRepoOutput]:
+        rows = (
+            await self._session.execute(recent_messages_query(room_id, limit))
+        ).all()
+
+        return message_rows_to_outputs(rows[::-1])
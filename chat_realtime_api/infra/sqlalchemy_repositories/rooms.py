@@ -1,16 +1,70 @@
+from typing import Sequence
 from uuid import UUID, uuid4
 
-from sqlalchemy import select
+from sqlalchemy import Row, Select, select, tuple_
+from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.orm import Session
 
 from chat_realtime_api.infra.models.rooms import RoomModel
 from chat_realtime_api.repositories.rooms import (
+    AsyncRoomRepository,
+    RoomCursor,
+    RoomPageRepoOutput,
     RoomRepoInput,
     RoomRepoOutput,
     RoomRepository,
+    RoomSort,
 )
 
 
+def rooms_page_query(
+    size: int,
+    sort: RoomSort = 'name',
+    name_prefix: str | None = None,
+    after: RoomCursor | None = None,
+) -> Select:
+    descending = sort.startswith('-')
+    column = getattr(RoomModel, sort.removeprefix('-'))
+    keys = [column] if column is RoomModel.name else [column, RoomModel.id]
+
+    query = select(
+        RoomModel.id,
+        RoomModel.name,
+        RoomModel.creator_id,
+        RoomModel.description,
+        RoomModel.created_at,
+    ).limit(size + 1)
+
+    if name_prefix:
+        query = query.filter(
+            RoomModel.name.startswith(name_prefix, autoescape=True)
+        )
+
+    if after is not None:
+        key = tuple_(*keys)
+        values = (after.value,) if len(keys) == 1 else (after.value, after.id)
+        query = query.filter(key < values if descending else key > values)
+
+    return query.order_by(*[key.desc() if descending else key for key in keys])
+
+
+def _room_row_to_output(row: Row) -> RoomRepoOutput:
+    return RoomRepoOutput(
+        id=row.id,
+        name=row.name,
+        creator_id=row.creator_id,
+        description=row.description,
+        created_at=row.created_at,
+    )
+
+
+def _to_page_output(rows: Sequence[Row], size: int) -> RoomPageRepoOutput:
+    return RoomPageRepoOutput(
+        rooms=[_room_row_to_output(row) for row in rows[:size]],
+        has_more=len(rows) > size,
+    )
+
+
 class SqlAlchemyRoomRepository(RoomRepository):
     def __init__(self, session: Session):
         self._session = session
@@ -39,6 +93,7 @@ class SqlAlchemyRoomRepository(RoomRepository):
             name=room_db.name,
             creator_id=room_db.creator_id,
             description=room_db.description,
+            created_at=room_db.created_at,
         )
 
     def get_all(self) -> list[RoomRepoOutput]:
@@ -53,13 +108,95 @@ class SqlAlchemyRoomRepository(RoomRepository):
                 name=room_db.name,
                 creator_id=room_db.creator_id,
                 description=room_db.description,
+                created_at=room_db.created_at,
             )
             for room_db in rooms_db
         ]
 
+    def get_page(
+        self,
+        size: int,
+        sort: RoomSort = 'name',
+        name_prefix: str | None = None,
+        after: RoomCursor | None = None,
+    ) -> RoomPageRepoOutput:
+        rows = self._session.execute(
+            rooms_page_query(size, sort, name_prefix, after)
+        ).all()
+
+        return _to_page_output(rows, size)
+
     def room_exists(self, room_id: UUID) -> bool:
         room_db = self._session.scalar(
             select(RoomModel).where(RoomModel.id == room_id)
         )
 
         return room_db is not None
+
+
+class AsyncSqlAlchemyRoomRepository(AsyncRoomRepository):
+    def __init__(self, session: AsyncSession):
+        self._session = session
+
+    async def save(self, room_input: RoomRepoInput) -> RoomRepoOutput | str:
+        room_db = await self._session.scalar(
+            select(RoomModel).where(RoomModel.name == room_input.name)
+        )
+
+        if room_db:
+            return 'Room already exists'
+
+        room_db = RoomModel(
+            id=uuid4(),
+            name=room_input.name,
+            creator_id=room_input.creator_id,
+            description=room_input.description,
+        )
+
+        self._session.add(room_db)
+        await self._session.commit()
+        await self._session.refresh(room_db)
+
+        return RoomRepoOutput(
+            id=room_db.id,
+            name=room_db.name,
+            creator_id=room_db.creator_id,
+            description=room_db.description,
+            created_at=room_db.created_at,
+        )
+
+    async def get_all(self) -> list[RoomRepoOutput]:
+        rooms_db = (await self._session.scalars(select(RoomModel))).all()
+
+        return [
+            RoomRepoOutput(
+                id=room_db.id,
+                name=room_db.name,
+                creator_id=room_db.creator_id,
+                description=room_db.description,
+                created_at=room_db.created_at,
+            )
+            for room_db in rooms_db
+        ]
+
+    async def get_page(
+        self,
+        size: int,
+        sort: RoomSort = 'name',
+        name_prefix: str | None = None,
+        after: RoomCursor | None = None,
+    ) -> RoomPageRepoOutput:
+        rows = (
+            await self._session.execute(
+                rooms_page_query(size, sort, name_prefix, after)
+            )
+        ).all()
+
+        return _to_page_output(rows, size)
+
+    async def room_exists(self, room_id: UUID) -> bool:
+        room_db = await self._session.scalar(
+            select(RoomModel).where(RoomModel.id == room_id)
+        )
+
+        return room_db is not None
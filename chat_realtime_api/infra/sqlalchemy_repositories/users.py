@@ -1,10 +1,15 @@
+from contextlib import asynccontextmanager
+from typing import AsyncIterator
 from uuid import uuid4
 
 from sqlalchemy import select
-from sqlalchemy.orm import Session
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker
+from sqlalchemy.orm import Session, sessionmaker
 
+from chat_realtime_api.infra.db.executor import BoundedExecutor
 from chat_realtime_api.infra.models.users import UserModel
 from chat_realtime_api.repositories.users import (
+    AsyncUserRepository,
     UserRepoInput,
     UserRepoOutput,
     UserRepository,
@@ -55,3 +60,87 @@ class SqlAlchemyUserRepository(UserRepository):
             username=user_db.username,
             password=user_db.password,
         )
+
+
+class AsyncSqlAlchemyUserRepository(AsyncUserRepository):
+    def __init__(self, session: AsyncSession):
+        self._session = session
+
+    async def save(self, user_input: UserRepoInput) -> UserRepoOutput | str:
+        user_db = await self._session.scalar(
+            select(UserModel).where(UserModel.username == user_input.username)
+        )
+
+        if user_db:
+            return 'User already exists'
+
+        user_db = UserModel(
+            id=uuid4(),
+            name=user_input.name,
+            username=user_input.username,
+            password=user_input.password,
+            messages=[],
+        )
+
+        self._session.add(user_db)
+        await self._session.commit()
+        await self._session.refresh(user_db)
+
+        return UserRepoOutput(
+            id=user_db.id,
+            name=user_db.name,
+            username=user_db.username,
+        )
+
+    async def get_by_username(self, username: str) -> UserRepoOutput | None:
+        user_db = await self._session.scalar(
+            select(UserModel).where(UserModel.username == username)
+        )
+
+        if not user_db:
+            return None
+
+        return UserRepoOutput(
+            id=user_db.id,
+            name=user_db.name,
+            username=user_db.username,
+            password=user_db.password,
+        )
+
+
+class ExecutorUserRepository(AsyncUserRepository):
+    def __init__(
+        self, session_factory: sessionmaker[Session], executor: BoundedExecutor
+    ):
+        self._session_factory = session_factory
+        self._executor = executor
+
+    async def save(self, user_input: UserRepoInput) -> UserRepoOutput | str:
+        def execute() -> UserRepoOutput | str:
+            with self._session_factory() as session:
+                return SqlAlchemyUserRepository(session).save(user_input)
+
+        return await self._executor.run(execute)
+
+    async def get_by_username(self, username: str) -> UserRepoOutput | None:
+        def execute() -> UserRepoOutput | None:
+            with self._session_factory() as session:
+                return SqlAlchemyUserRepository(session).get_by_username(
+                    username
+                )
+
+        return await self._executor.run(execute)
+
+
+@asynccontextmanager
+async def async_user_repository(
+    session_factory: sessionmaker[Session],
+    async_session_factory: async_sessionmaker[AsyncSession] | None,
+    executor: BoundedExecutor,
+) -> AsyncIterator[AsyncUserRepository]:
+    if async_session_factory is None:
+        yield ExecutorUserRepository(session_factory, executor)
+        return
+
+    async with async_session_factory() as session:
+        yield AsyncSqlAlchemyUserRepository(session)
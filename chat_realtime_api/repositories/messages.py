@@ -3,20 +3,21 @@ from datetime import datetime
 from uuid import UUID
 
 
-@dataclass
+@dataclass(frozen=True, slots=True)
 class MessageRepoInput:
     room_id: UUID
     content: str
     user_id: UUID
+    user_name: str
 
 
-@dataclass
+@dataclass(frozen=True, slots=True)
 class UserRepoOutput:
     id: UUID
     name: str
 
 
-@dataclass
+@dataclass(frozen=True, slots=True)
 class MessageRepoOutput:
     id: UUID
     room_id: UUID
@@ -25,24 +26,84 @@ class MessageRepoOutput:
     timestamp: datetime
 
 
-@dataclass
+@dataclass(frozen=True, slots=True)
 class HistoryRepoOutput:
     room_id: UUID
     messages: list[MessageRepoOutput]
     current_page: int
     page_size: int
-    total_pages: int
-    total_messages: int
+    total_pages: int | None
+    total_messages: int | None
+
+
+@dataclass(frozen=True, slots=True)
+class MessageCursor:
+    timestamp: datetime
+    id: UUID
+
+
+@dataclass(frozen=True, slots=True)
+class CursorHistoryRepoOutput:
+    room_id: UUID
+    messages: list[MessageRepoOutput]
+    has_more: bool
 
 
 class MessageRepository:
-    def save(self, msg_input: MessageRepoInput) -> MessageRepoOutput:
+    def save(self, msg_input: MessageRepoInput) -> MessageRepoOutput | None:
+        raise NotImplementedError
+
+    def save_many(
+        self, msg_inputs: list[MessageRepoInput]
+    ) -> list[MessageRepoOutput | None]:
         raise NotImplementedError
 
     def get_history_by_room_id(
-        self, room_id: UUID, page: int, size: int
+        self, room_id: UUID, page: int, size: int, include_totals: bool = True
+    ) -> HistoryRepoOutput:
+        raise NotImplementedError
+
+    def get_history_by_cursor(
+        self,
+        room_id: UUID,
+        size: int,
+        before: MessageCursor | None = None,
+        after: MessageCursor | None = None,
+    ) -> CursorHistoryRepoOutput:
+        raise NotImplementedError
+
+    def get_recent_messages_by_room_id(
+        self, room_id: UUID, limit: int
+    ) -> list[MessageRepoOutput]:
+        raise NotImplementedError
+
+
+class AsyncMessageRepository:
+    async def save(
+        self, msg_input: MessageRepoInput
+    ) -> MessageRepoOutput | None:
+        raise NotImplementedError
+
+    async def save_many(
+        self, msg_inputs: list[MessageRepoInput]
+    ) -> list[MessageRepoOutput | None]:
+        raise NotImplementedError
+
+    async def get_history_by_room_id(
+        self, room_id: UUID, page: int, size: int, include_totals: bool = True
     ) -> HistoryRepoOutput:
         raise NotImplementedError
 
-    def get_messages_by_room_id(self, room_id: UUID) -> MessageRepoOutput:
+    async def get_history_by_cursor(
+        self,
+        room_id: UUID,
+        size: int,
+        before: MessageCursor | None = None,
+        after: MessageCursor | None = None,
+    ) -> CursorHistoryRepoOutput:
+        raise NotImplementedError
+
+    async def get_recent_messages_by_room_id(
+        self, room_id: UUID, limit: int
+    ) -> list[MessageRepoOutput]:
         raise NotImplementedError
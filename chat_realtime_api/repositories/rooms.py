@@ -1,20 +1,37 @@
 from dataclasses import dataclass
+from datetime import datetime
+from typing import Literal
 from uuid import UUID
 
+RoomSort = Literal['name', '-name', 'created_at', '-created_at']
 
-@dataclass
+
+@dataclass(frozen=True, slots=True)
 class RoomRepoInput:
     name: str
     creator_id: UUID
     description: str | None = None
 
 
-@dataclass
+@dataclass(frozen=True, slots=True)
 class RoomRepoOutput:
     id: UUID
     name: str
     creator_id: UUID
     description: str | None = None
+    created_at: datetime | None = None
+
+
+@dataclass(frozen=True, slots=True)
+class RoomCursor:
+    value: str | datetime
+    id: UUID
+
+
+@dataclass(frozen=True, slots=True)
+class RoomPageRepoOutput:
+    rooms: list[RoomRepoOutput]
+    has_more: bool
 
 
 class RoomRepository:
@@ -24,5 +41,34 @@ class RoomRepository:
     def get_all(self) -> list[RoomRepoOutput]:
         raise NotImplementedError
 
+    def get_page(
+        self,
+        size: int,
+        sort: RoomSort = 'name',
+        name_prefix: str | None = None,
+        after: RoomCursor | None = None,
+    ) -> RoomPageRepoOutput:
+        raise NotImplementedError
+
     def room_exists(self, room_id: UUID) -> bool:
         raise NotImplementedError
+
+
+class AsyncRoomRepository:
+    async def save(self, room_input: RoomRepoInput) -> RoomRepoOutput | str:
+        raise NotImplementedError
+
+    async def get_all(self) -> list[RoomRepoOutput]:
+        raise NotImplementedError
+
+    async def get_page(
+        self,
+        size: int,
+        sort: RoomSort = 'name',
+        name_prefix: str | None = None,
+        after: RoomCursor | None = None,
+    ) -> RoomPageRepoOutput:
+        raise NotImplementedError
+
+    async def room_exists(self, room_id: UUID) -> bool:
+        raise NotImplementedError
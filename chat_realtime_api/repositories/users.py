@@ -2,14 +2,14 @@ from dataclasses import dataclass
 from uuid import UUID
 
 
-@dataclass
+@dataclass(frozen=True, slots=True)
 class UserRepoInput:
     name: str
     username: str
     password: str
 
 
-@dataclass
+@dataclass(frozen=True, slots=True)
 class UserRepoOutput:
     id: UUID
     name: str
@@ -23,3 +23,11 @@ class UserRepository:
 
     def get_by_username(self, username: str) -> UserRepoOutput | None:
         raise NotImplementedError
+
+
+class AsyncUserRepository:
+    async def save(self, user_input: UserRepoInput) -> UserRepoOutput | str:
+        raise NotImplementedError
+
+    async def get_by_username(self, username: str) -> UserRepoOutput | None:
+        raise NotImplementedError
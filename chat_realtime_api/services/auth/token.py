@@ -3,23 +3,26 @@ from typing import Optional
 from uuid import UUID
 
 from chat_realtime_api.infra.config.security import (
+    PasswordHasher,
     create_access_token,
-    verify_password,
 )
-from chat_realtime_api.repositories.users import UserRepository
+from chat_realtime_api.repositories.users import (
+    AsyncUserRepository,
+    UserRepoOutput,
+)
 from chat_realtime_api.services.errors.exceptions import (
     InvalidCredentialsException,
     UserNotFoundException,
 )
 
 
-@dataclass
+@dataclass(frozen=True, slots=True)
 class TokenInput:
     username: str
     password: str
 
 
-@dataclass
+@dataclass(frozen=True, slots=True)
 class TokenOutput:
     id: UUID
     name: str
@@ -28,34 +31,43 @@ class TokenOutput:
     token_type: Optional[str] = None
 
 
-class TokenService:
-    def __init__(self, repository: UserRepository):
+def _issue_token(user: UserRepoOutput) -> TokenOutput:
+    access_token = create_access_token(
+        data={
+            'uid': str(user.id),
+            'name': user.name,
+            'sub': user.username,
+        }
+    )
+
+    return TokenOutput(
+        id=user.id,
+        name=user.name,
+        username=user.username,
+        access_token=access_token,
+        token_type='bearer',
+    )
+
+
+class AsyncTokenService:
+    def __init__(
+        self, repository: AsyncUserRepository, password_hasher: PasswordHasher
+    ):
         self.repository = repository
+        self.password_hasher = password_hasher
 
-    def execute(self, input: TokenInput) -> TokenOutput:
-        user = self.repository.get_by_username(input.username)
+    async def execute(self, input: TokenInput) -> TokenOutput:
+        user = await self.repository.get_by_username(input.username)
 
         if not user:
             raise UserNotFoundException(input.username)
 
-        if not verify_password(input.password, user.password):
+        if not await self.password_hasher.verify(
+            input.password, user.password
+        ):
             raise InvalidCredentialsException()
 
-        access_token = create_access_token(
-            data={
-                'uid': str(user.id),
-                'name': user.name,
-                'sub': user.username,
-            }
-        )
-
-        return TokenOutput(
-            id=user.id,
-            name=user.name,
-            username=user.username,
-            access_token=access_token,
-            token_type='bearer',
-        )
+        return _issue_token(user)
 
 
 class RefreshTokenService:
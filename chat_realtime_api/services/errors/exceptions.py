@@ -32,3 +32,16 @@ class InvalidCredentialsException(BusinessException):
     def __init__(self):
         message = 'Incorrect email or password'
         super().__init__(message)
+
+
+class ExecutorSaturatedException(BusinessException):
+    def __init__(self, retry_after: int = 1):
+        message = 'Server is busy, try again later.'
+        self.retry_after = retry_after
+        super().__init__(message)
+
+
+class InvalidCursorException(BusinessException):
+    def __init__(self, cursor: str):
+        message = f'Cursor {cursor} is invalid.'
+        super().__init__(message)
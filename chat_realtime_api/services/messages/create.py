@@ -1,52 +1,99 @@
 from dataclasses import dataclass
-from datetime import datetime
 from uuid import UUID
 
 from chat_realtime_api.repositories.messages import (
+    AsyncMessageRepository,
     MessageRepoInput,
+    MessageRepoOutput,
     MessageRepository,
 )
-from chat_realtime_api.repositories.rooms import RoomRepository
 from chat_realtime_api.services.errors.exceptions import RoomNotFoundException
 
 
-@dataclass
+@dataclass(frozen=True, slots=True)
 class CreateMessageInput:
     room_id: UUID
     content: str
     user_id: UUID
+    user_name: str
 
 
-@dataclass
-class CreateMessageOutput:
-    id: UUID
-    room_id: UUID
-    user_id: UUID
-    content: str
-    timestamp: datetime
+def _to_repo_input(message_input: CreateMessageInput) -> MessageRepoInput:
+    return MessageRepoInput(
+        room_id=message_input.room_id,
+        content=message_input.content,
+        user_id=message_input.user_id,
+        user_name=message_input.user_name,
+    )
+
+
+def _to_output(
+    message_input: CreateMessageInput,
+    message_output: MessageRepoOutput | None,
+) -> MessageRepoOutput | RoomNotFoundException:
+    if message_output is None:
+        return RoomNotFoundException(message_input.room_id)
+
+    return message_output
 
 
 class CreateMessageService:
-    def __init__(self, msg_repo: MessageRepository, room_repo: RoomRepository):
+    def __init__(self, msg_repo: MessageRepository):
+        self.msg_repo = msg_repo
+
+    def execute(self, input: CreateMessageInput) -> MessageRepoOutput:
+        output = _to_output(input, self.msg_repo.save(_to_repo_input(input)))
+
+        if isinstance(output, RoomNotFoundException):
+            raise output
+
+        return output
+
+
+class AsyncCreateMessageService:
+    def __init__(self, msg_repo: AsyncMessageRepository):
         self.msg_repo = msg_repo
-        self.room_repo = room_repo
-
-    def execute(self, input: CreateMessageInput) -> CreateMessageOutput:
-        if not self.room_repo.room_exists(input.room_id):
-            raise RoomNotFoundException(input.room_id)
-
-        room_output = self.msg_repo.save(
-            MessageRepoInput(
-                room_id=input.room_id,
-                content=input.content,
-                user_id=input.user_id,
-            )
-        )
 
-        return CreateMessageOutput(
-            id=room_output.id,
-            room_id=room_output.room_id,
-            user_id=room_output.user.id,
-            content=room_output.content,
-            timestamp=room_output.timestamp,
+    async def execute(self, input: CreateMessageInput) -> MessageRepoOutput:
+        output = _to_output(
+            input, await self.msg_repo.save(_to_repo_input(input))
         )
+
+        if isinstance(output, RoomNotFoundException):
+            raise output
+
+        return output
+
+
+class CreateMessagesService:
+    def __init__(self, msg_repo: MessageRepository):
+        self.msg_repo = msg_repo
+
+    def execute(
+        self, inputs: list[CreateMessageInput]
+    ) -> list[MessageRepoOutput | RoomNotFoundException]:
+        message_outputs = self.msg_repo.save_many([
+            _to_repo_input(message_input) for message_input in inputs
+        ])
+
+        return [
+            _to_output(message_input, message_output)
+            for message_input, message_output in zip(inputs, message_outputs)
+        ]
+
+
+class AsyncCreateMessagesService:
+    def __init__(self, msg_repo: AsyncMessageRepository):
+        self.msg_repo = msg_repo
+
+    async def execute(
+        self, inputs: list[CreateMessageInput]
+    ) -> list[MessageRepoOutput | RoomNotFoundException]:
+        message_outputs = await self.msg_repo.save_many([
+            _to_repo_input(message_input) for message_input in inputs
+        ])
+
+        return [
+            _to_output(message_input, message_output)
+            for message_input, message_output in zip(inputs, message_outputs)
+        ]
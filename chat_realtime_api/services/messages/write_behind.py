@@ -0,0 +1,135 @@
+import asyncio
+import logging
+from dataclasses import dataclass
+from typing import Awaitable, Callable
+
+from chat_realtime_api.repositories.messages import MessageRepoOutput
+from chat_realtime_api.services.errors.exceptions import BusinessException
+from chat_realtime_api.services.messages.create import CreateMessageInput
+
+logger = logging.getLogger(__name__)
+
+SaveMany = Callable[
+    [list[CreateMessageInput]],
+    Awaitable[list[MessageRepoOutput | BusinessException]],
+]
+
+
+@dataclass(frozen=True, slots=True)
+class WriteBehindStats:
+    pending: int
+    batches: int
+    messages: int
+    failed: int
+
+
+class WriteBehindBuffer:
+    def __init__(self, save_many: SaveMany, interval: float, max_batch: int):
+        self.save_many = save_many
+        self.interval = interval
+        self.max_batch = max_batch
+        self._pending: list[
+            tuple[CreateMessageInput, asyncio.Future[MessageRepoOutput]]
+        ] = []
+        self._ready: asyncio.Event | None = None
+        self._full: asyncio.Event | None = None
+        self._task: asyncio.Task | None = None
+        self._closing = False
+        self._batches = 0
+        self._messages = 0
+        self._failed = 0
+
+    async def start(self):
+        self._closing = False
+        self._ready = asyncio.Event()
+        self._full = asyncio.Event()
+        self._task = asyncio.create_task(self._run())
+
+    async def stop(self):
+        self._closing = True
+
+        if self._task is not None:
+            self._ready.set()
+            self._full.set()
+            await self._task
+            self._task = None
+
+        await self.flush()
+
+    async def submit(self, input: CreateMessageInput) -> MessageRepoOutput:
+        future = asyncio.get_running_loop().create_future()
+        self._pending.append((input, future))
+
+        if self._task is None:
+            await self.flush()
+        else:
+            self._ready.set()
+            if len(self._pending) >= self.max_batch:
+                self._full.set()
+
+        return await future
+
+    async def _run(self):
+        while not self._closing:
+            await self._ready.wait()
+
+            try:
+                async with asyncio.timeout(self.interval):
+                    await self._full.wait()
+            except TimeoutError:
+                pass
+
+            await self.flush()
+
+    async def flush(self):
+        while self._pending:
+            batch = self._pending[: self.max_batch]
+            del self._pending[: self.max_batch]
+
+            if self._task is not None:
+                if not self._pending:
+                    self._ready.clear()
+                if len(self._pending) < self.max_batch:
+                    self._full.clear()
+
+            await self._write(batch)
+
+    async def _write(
+        self,
+        batch: list[
+            tuple[CreateMessageInput, asyncio.Future[MessageRepoOutput]]
+        ],
+    ):
+        try:
+            outputs = await self.save_many([input for input, _ in batch])
+        except Exception as e:
+            logger.exception(
+                'Failed to write a batch of %s messages for rooms %s',
+                len(batch),
+                ', '.join(sorted({str(input.room_id) for input, _ in batch})),
+            )
+            self._failed += len(batch)
+            for _, future in batch:
+                if not future.done():
+                    future.set_exception(e)
+            return
+
+        self._batches += 1
+        self._messages += len(batch)
+
+        for (_, future), output in zip(batch, outputs):
+            if future.done():
+                continue
+
+            if isinstance(output, BusinessException):
+                future.set_exception(output)
+            else:
+                future.set_result(output)
+
+    def stats(self) -> WriteBehindStats:
+        return WriteBehindStats(
+            pending=len(self._pending),
+            batches=self._batches,
+            messages=self._messages,
+            failed=self._failed,
+        )
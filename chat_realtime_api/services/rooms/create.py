@@ -10,14 +10,14 @@ from chat_realtime_api.services.errors.exceptions import (
 )
 
 
-@dataclass
+@dataclass(frozen=True, slots=True)
 class CreateRoomInput:
     name: str
     creator_id: UUID
     description: str | None = None
 
 
-@dataclass
+@dataclass(frozen=True, slots=True)
 class CreateRoomOutput:
     id: str
     name: str
@@ -0,0 +1,51 @@
+from base64 import urlsafe_b64decode, urlsafe_b64encode
+from datetime import datetime
+from uuid import UUID
+
+from chat_realtime_api.repositories.messages import MessageCursor
+from chat_realtime_api.repositories.rooms import RoomCursor, RoomSort
+from chat_realtime_api.services.errors.exceptions import (
+    InvalidCursorException,
+)
+
+
+def encode_cursor(timestamp: datetime, id: UUID) -> str:
+    raw = f'{timestamp.isoformat()}|{id.hex}'
+
+    return urlsafe_b64encode(raw.encode()).decode()
+
+
+def decode_cursor(cursor: str) -> MessageCursor:
+    try:
+        timestamp, id = urlsafe_b64decode(cursor.encode()).decode().split('|')
+
+        return MessageCursor(
+            timestamp=datetime.fromisoformat(timestamp), id=UUID(id)
+        )
+    except ValueError:
+        raise InvalidCursorException(cursor)
+
+
+def encode_room_cursor(sort: RoomSort, value: str | datetime, id: UUID) -> str:
+    if isinstance(value, datetime):
+        value = value.isoformat()
+    raw = f'{sort}|{id.hex}|{value}'
+
+    return urlsafe_b64encode(raw.encode()).decode()
+
+
+def decode_room_cursor(cursor: str, sort: RoomSort) -> RoomCursor:
+    try:
+        cursor_sort, id, value = (
+            urlsafe_b64decode(cursor.encode()).decode().split('|', 2)
+        )
+
+        if cursor_sort != sort:
+            raise ValueError(cursor_sort)
+
+        if sort.removeprefix('-') == 'created_at':
+            value = datetime.fromisoformat(value)
+
+        return RoomCursor(value=value, id=UUID(id))
+    except ValueError:
+        raise InvalidCursorException(cursor)
@@ -1,9 +1,30 @@
+from dataclasses import dataclass
+
 from chat_realtime_api.repositories.rooms import (
     RoomRepoOutput,
     RoomRepository,
+    RoomSort,
+)
+from chat_realtime_api.services.rooms.cursor import (
+    decode_room_cursor,
+    encode_room_cursor,
 )
 
 
+@dataclass(frozen=True, slots=True)
+class ListRoomsInput:
+    size: int
+    sort: RoomSort = 'name'
+    name_prefix: str | None = None
+    after: str | None = None
+
+
+@dataclass(frozen=True, slots=True)
+class ListRoomsOutput:
+    rooms: list[RoomRepoOutput]
+    next: str | None
+
+
 class GetRoomService:
     def __init__(self, repository: RoomRepository):
         self.repository = repository
@@ -12,3 +33,30 @@ class GetRoomService:
         room_output = self.repository.get_all()
 
         return room_output
+
+
+class ListRoomsService:
+    def __init__(self, repository: RoomRepository):
+        self.repository = repository
+
+    def execute(self, input: ListRoomsInput) -> ListRoomsOutput:
+        after = (
+            decode_room_cursor(input.after, input.sort)
+            if input.after
+            else None
+        )
+
+        page = self.repository.get_page(
+            size=input.size,
+            sort=input.sort,
+            name_prefix=input.name_prefix,
+            after=after,
+        )
+
+        next_cursor = None
+        if page.has_more:
+            last = page.rooms[-1]
+            value = getattr(last, input.sort.removeprefix('-'))
+            next_cursor = encode_room_cursor(input.sort, value, last.id)
+
+        return ListRoomsOutput(rooms=page.rooms, next=next_cursor)
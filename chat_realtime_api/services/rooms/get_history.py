@@ -2,35 +2,33 @@ from dataclasses import dataclass
 from uuid import UUID
 
 from chat_realtime_api.repositories.messages import (
+    MessageRepoOutput,
     MessageRepository,
 )
 from chat_realtime_api.repositories.rooms import RoomRepository
 from chat_realtime_api.services.errors.exceptions import RoomNotFoundException
+from chat_realtime_api.services.rooms.cursor import (
+    decode_cursor,
+    encode_cursor,
+)
 
 
-@dataclass
-class UserOutput:
-    id: str
-    name: str
-
-
-@dataclass
-class MessageOutput:
-    id: str
-    room_id: str
-    user: UserOutput
-    content: str
-    timestamp: str
-
-
-@dataclass
+@dataclass(frozen=True, slots=True)
 class GetHistoryOutput:
     room_id: str
-    messages: list[MessageOutput]
+    messages: list[MessageRepoOutput]
     current_page: int
     page_size: int
-    total_pages: int
-    total_messages: int
+    total_pages: int | None
+    total_messages: int | None
+
+
+@dataclass(frozen=True, slots=True)
+class GetCursorHistoryOutput:
+    room_id: str
+    messages: list[MessageRepoOutput]
+    before: str | None
+    after: str | None
 
 
 class GetHistoryService:
@@ -42,31 +40,77 @@ class GetHistoryService:
         self.msg_repo = msg_repo
         self.room_repo = room_repo
 
-    def execute(self, room_id: UUID, page: int, size: int) -> GetHistoryOutput:
-        if not self.room_repo.room_exists(room_id):
-            raise RoomNotFoundException(room_id)
-
+    def execute(
+        self, room_id: UUID, page: int, size: int, include_totals: bool = True
+    ) -> GetHistoryOutput:
         room_output = self.msg_repo.get_history_by_room_id(
-            room_id=room_id, page=page, size=size
+            room_id=room_id,
+            page=page,
+            size=size,
+            include_totals=include_totals,
         )
 
+        if not room_output.messages and not self.room_repo.room_exists(
+            room_id
+        ):
+            raise RoomNotFoundException(room_id)
+
         return GetHistoryOutput(
             room_id=room_output.room_id,
-            messages=[
-                MessageOutput(
-                    id=message.id,
-                    room_id=message.room_id,
-                    user=UserOutput(
-                        id=message.user.id,
-                        name=message.user.name,
-                    ),
-                    content=message.content,
-                    timestamp=message.timestamp,
-                )
-                for message in room_output.messages
-            ],
+            messages=room_output.messages,
             current_page=room_output.current_page,
             page_size=room_output.page_size,
             total_pages=room_output.total_pages,
             total_messages=room_output.total_messages,
         )
+
+
+class GetCursorHistoryService:
+    def __init__(
+        self,
+        msg_repo: MessageRepository,
+        room_repo: RoomRepository,
+    ):
+        self.msg_repo = msg_repo
+        self.room_repo = room_repo
+
+    def execute(
+        self,
+        room_id: UUID,
+        size: int,
+        before: str | None = None,
+        after: str | None = None,
+    ) -> GetCursorHistoryOutput:
+        before_cursor = decode_cursor(before) if before else None
+        after_cursor = decode_cursor(after) if after else None
+
+        history = self.msg_repo.get_history_by_cursor(
+            room_id=room_id,
+            size=size,
+            before=before_cursor,
+            after=after_cursor,
+        )
+        messages = history.messages
+
+        if not messages and not self.room_repo.room_exists(room_id):
+            raise RoomNotFoundException(room_id)
+
+        if after_cursor is None:
+            has_older, has_newer = history.has_more, before_cursor is not None
+        else:
+            has_older, has_newer = True, history.has_more
+
+        return GetCursorHistoryOutput(
+            room_id=history.room_id,
+            messages=messages,
+            before=(
+                encode_cursor(messages[0].timestamp, messages[0].id)
+                if messages and has_older
+                else None
+            ),
+            after=(
+                encode_cursor(messages[-1].timestamp, messages[-1].id)
+                if messages and has_newer
+                else None
+            ),
+        )
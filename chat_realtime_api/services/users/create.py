@@ -2,24 +2,25 @@ from dataclasses import dataclass
 from typing import Optional
 from uuid import UUID
 
-from chat_realtime_api.infra.config.security import get_password_hash
+from chat_realtime_api.infra.config.security import PasswordHasher
 from chat_realtime_api.repositories.users import (
+    AsyncUserRepository,
     UserRepoInput,
-    UserRepository,
+    UserRepoOutput,
 )
 from chat_realtime_api.services.errors.exceptions import (
     UserAlreadyExistsException,
 )
 
 
-@dataclass
+@dataclass(frozen=True, slots=True)
 class CreateUserInput:
     name: str
     username: str
     password: str
 
 
-@dataclass
+@dataclass(frozen=True, slots=True)
 class CreateUserOutput:
     id: UUID
     name: str
@@ -28,12 +29,28 @@ class CreateUserOutput:
     token_type: Optional[str] = None
 
 
-class CreateUserService:
-    def __init__(self, repository: UserRepository):
+def _to_output(
+    user_input: UserRepoInput, user_output: UserRepoOutput | str
+) -> CreateUserOutput:
+    if isinstance(user_output, str):
+        raise UserAlreadyExistsException(user_input.username)
+
+    return CreateUserOutput(
+        id=user_output.id,
+        name=user_output.name,
+        username=user_output.username,
+    )
+
+
+class AsyncCreateUserService:
+    def __init__(
+        self, repository: AsyncUserRepository, password_hasher: PasswordHasher
+    ):
         self.repository = repository
+        self.password_hasher = password_hasher
 
-    def execute(self, input: CreateUserInput) -> CreateUserOutput:
-        hashed_password = get_password_hash(input.password)
+    async def execute(self, input: CreateUserInput) -> CreateUserOutput:
+        hashed_password = await self.password_hasher.hash(input.password)
 
         user_input = UserRepoInput(
             name=input.name,
@@ -41,13 +58,4 @@ class CreateUserService:
             password=hashed_password,
         )
 
-        user_output = self.repository.save(user_input)
-
-        if isinstance(user_output, str):
-            raise UserAlreadyExistsException(user_input.username)
-
-        return CreateUserOutput(
-            id=user_output.id,
-            name=user_output.name,
-            username=user_output.username,
-        )
+        return _to_output(user_input, await self.repository.save(user_input))
@@ -0,0 +1,50 @@
+"""Add message indexes
+
+Revision ID: 3c8e1f2a9d47
+Revises: b71ab88295b1
+Create Date: 2026-10-18 10:12:31.482913
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '3c8e1f2a9d47'
+down_revision: Union[str, None] = 'b71ab88295b1'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    # CONCURRENTLY cannot run inside a transaction on Postgres
+    with op.get_context().autocommit_block():
+        op.create_index(
+            'ix_messages_room_id_timestamp_id',
+            'messages',
+            ['room_id', 'timestamp', 'id'],
+            postgresql_include=['user_id'],
+            postgresql_concurrently=True,
+        )
+        op.create_index(
+            'ix_messages_user_id_timestamp',
+            'messages',
+            ['user_id', 'timestamp'],
+            postgresql_concurrently=True,
+        )
+
+
+def downgrade() -> None:
+    with op.get_context().autocommit_block():
+        op.drop_index(
+            'ix_messages_user_id_timestamp',
+            table_name='messages',
+            postgresql_concurrently=True,
+        )
+        op.drop_index(
+            'ix_messages_room_id_timestamp_id',
+            table_name='messages',
+            postgresql_concurrently=True,
+        )
@@ -0,0 +1,61 @@
+"""Add room listing indexes
+
+Revision ID: 5d1a7c3e9b42
+Revises: 8f2d4b6a1e90
+Create Date: 2026-10-18 14:05:52.903114
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.dialects import postgresql
+
+
+# revision identifiers, used by Alembic.
+revision: str = '5d1a7c3e9b42'
+down_revision: Union[str, None] = '8f2d4b6a1e90'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    bind = op.get_bind()
+
+    # CONCURRENTLY cannot run inside a transaction on Postgres
+    with op.get_context().autocommit_block():
+        op.create_index(
+            'ix_rooms_created_at_id',
+            'rooms',
+            ['created_at', 'id'],
+            postgresql_concurrently=True,
+        )
+
+        # name LIKE 'prefix%' can only use a text_pattern_ops index on
+        # databases whose collation is not C
+        if isinstance(bind.dialect, postgresql.dialect):
+            op.create_index(
+                'ix_rooms_name_pattern',
+                'rooms',
+                ['name'],
+                postgresql_ops={'name': 'text_pattern_ops'},
+                postgresql_concurrently=True,
+            )
+
+
+def downgrade() -> None:
+    bind = op.get_bind()
+
+    with op.get_context().autocommit_block():
+        if isinstance(bind.dialect, postgresql.dialect):
+            op.drop_index(
+                'ix_rooms_name_pattern',
+                table_name='rooms',
+                postgresql_concurrently=True,
+            )
+
+        op.drop_index(
+            'ix_rooms_created_at_id',
+            table_name='rooms',
+            postgresql_concurrently=True,
+        )
@@ -0,0 +1,119 @@
+"""Add message_count to rooms
+
+Revision ID: 8f2d4b6a1e90
+Revises: 3c8e1f2a9d47
+Create Date: 2026-10-18 11:40:07.215634
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.dialects import sqlite
+
+
+# revision identifiers, used by Alembic.
+revision: str = '8f2d4b6a1e90'
+down_revision: Union[str, None] = '3c8e1f2a9d47'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+SQLITE_TRIGGERS = [
+    """
+    CREATE TRIGGER messages_count_insert AFTER INSERT ON messages
+    BEGIN
+        UPDATE rooms SET message_count = message_count + 1
+        WHERE id = NEW.room_id;
+    END
+    """,
+    """
+    CREATE TRIGGER messages_count_delete AFTER DELETE ON messages
+    BEGIN
+        UPDATE rooms SET message_count = message_count - 1
+        WHERE id = OLD.room_id;
+    END
+    """,
+]
+
+POSTGRESQL_TRIGGERS = [
+    """
+    CREATE OR REPLACE FUNCTION messages_count_insert() RETURNS trigger AS $$
+    BEGIN
+        UPDATE rooms SET message_count = rooms.message_count + counts.total
+        FROM (
+            SELECT room_id, count(*) AS total FROM new_messages
+            GROUP BY room_id
+        ) AS counts
+        WHERE rooms.id = counts.room_id;
+        RETURN NULL;
+    END;
+    $$ LANGUAGE plpgsql
+    """,
+    """
+    CREATE OR REPLACE FUNCTION messages_count_delete() RETURNS trigger AS $$
+    BEGIN
+        UPDATE rooms SET message_count = rooms.message_count - counts.total
+        FROM (
+            SELECT room_id, count(*) AS total FROM old_messages
+            GROUP BY room_id
+        ) AS counts
+        WHERE rooms.id = counts.room_id;
+        RETURN NULL;
+    END;
+    $$ LANGUAGE plpgsql
+    """,
+    """
+    CREATE TRIGGER messages_count_insert AFTER INSERT ON messages
+    REFERENCING NEW TABLE AS new_messages
+    FOR EACH STATEMENT EXECUTE FUNCTION messages_count_insert()
+    """,
+    """
+    CREATE TRIGGER messages_count_delete AFTER DELETE ON messages
+    REFERENCING OLD TABLE AS old_messages
+    FOR EACH STATEMENT EXECUTE FUNCTION messages_count_delete()
+    """,
+]
+
+
+def upgrade() -> None:
+    op.add_column(
+        'rooms',
+        sa.Column(
+            'message_count',
+            sa.Integer(),
+            server_default=sa.text('0'),
+            nullable=False,
+        ),
+    )
+    op.execute(
+        'UPDATE rooms SET message_count = '
+        '(SELECT count(*) FROM messages WHERE messages.room_id = rooms.id)'
+    )
+
+    bind = op.get_bind()
+    if isinstance(bind.dialect, sqlite.dialect):
+        statements = SQLITE_TRIGGERS
+    else:
+        statements = POSTGRESQL_TRIGGERS
+
+    for statement in statements:
+        op.execute(statement)
+
+
+def downgrade() -> None:
+    bind = op.get_bind()
+    if isinstance(bind.dialect, sqlite.dialect):
+        op.execute('DROP TRIGGER IF EXISTS messages_count_insert')
+        op.execute('DROP TRIGGER IF EXISTS messages_count_delete')
+
+        with op.batch_alter_table('rooms') as batch_op:
+            batch_op.drop_column('message_count')
+    else:
+        op.execute('DROP TRIGGER IF EXISTS messages_count_insert ON messages')
+        op.execute('DROP TRIGGER IF EXISTS messages_count_delete ON messages')
+        op.execute(
+            'DROP FUNCTION IF EXISTS messages_count_insert(), '
+            'messages_count_delete()'
+        )
+        op.drop_column('rooms', 'message_count')
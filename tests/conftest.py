@@ -1,15 +1,34 @@
+from contextlib import contextmanager
+from datetime import datetime, timedelta
 from uuid import uuid4
 
 import pytest
 from fastapi.testclient import TestClient
-from sqlalchemy import create_engine
-from sqlalchemy.orm import Session
-from sqlalchemy.pool import StaticPool
+from sqlalchemy import Engine, create_engine, event
+from sqlalchemy.ext.asyncio import async_sessionmaker, create_async_engine
+from sqlalchemy.orm import Session, sessionmaker
+from sqlalchemy.pool import NullPool, StaticPool
 
 from chat_realtime_api.app import app
-from chat_realtime_api.infra.config.security import get_password_hash
-from chat_realtime_api.infra.db.session import get_session
+from chat_realtime_api.infra.cache.recent_messages import recent_messages
+from chat_realtime_api.infra.cache.rooms import room_list
+from chat_realtime_api.infra.cache.tokens import verified_tokens
+from chat_realtime_api.infra.config.security import (
+    create_access_token,
+    get_password_hash,
+)
+from chat_realtime_api.infra.config.settings import Settings
+from chat_realtime_api.infra.db.session import (
+    async_database_url,
+    create_db_engine,
+    enable_sqlite_foreign_keys,
+    get_async_session_factory,
+    get_session,
+    get_session_factory,
+)
 from chat_realtime_api.infra.models.base import table_registry
+from chat_realtime_api.infra.models.messages import MessageModel
+from chat_realtime_api.infra.models.rooms import RoomModel
 from chat_realtime_api.infra.models.users import UserModel
 
 
@@ -51,24 +70,160 @@ def user(session):
     return user
 
 
+@pytest.fixture
+def room(session, user):
+    room = RoomModel(
+        name='Seeded Room',
+        description='A room with seeded messages',
+        id=uuid4(),
+        creator_id=user.id,
+    )
+    session.add(room)
+    session.commit()
+
+    return room
+
+
+@pytest.fixture
+def assert_max_queries():
+    @contextmanager
+    def assert_max_queries(limit):
+        statements = []
+
+        def before_cursor_execute(conn, cursor, statement, *args):  # noqa: PLR0917
+            statements.append(statement)
+
+        event.listen(Engine, 'before_cursor_execute', before_cursor_execute)
+        try:
+            yield statements
+        finally:
+            event.remove(
+                Engine, 'before_cursor_execute', before_cursor_execute
+            )
+
+        assert len(statements) <= limit, '\n'.join(statements)
+
+    return assert_max_queries
+
+
+@pytest.fixture
+def seed_messages(session, room, user):
+    def seed(total):
+        start = datetime(2024, 1, 1)
+        session.add_all([
+            MessageModel(
+                content=f'Message {i}',
+                timestamp=start + timedelta(seconds=i),
+                id=uuid4(),
+                room_id=room.id,
+                user_id=user.id,
+                user=user,
+            )
+            for i in range(total)
+        ])
+        session.commit()
+
+    return seed
+
+
 @pytest.fixture
 def client(session):
     def get_session_override():
         return session
 
+    def get_session_factory_override():
+        return sessionmaker(session.get_bind())
+
     with TestClient(app) as client:
         app.dependency_overrides[get_session] = get_session_override
+        app.dependency_overrides[get_session_factory] = (
+            get_session_factory_override
+        )
         yield client
 
     app.dependency_overrides.clear()
+    recent_messages.clear()
+    room_list.invalidate()
+    verified_tokens.clear()
+
+
+@pytest.fixture
+def file_engine(tmp_path):
+    engine = create_db_engine(
+        Settings(DATABASE_URL=f'sqlite:///{tmp_path / "chat.db"}')
+    )
+    table_registry.metadata.create_all(engine)
+
+    yield engine
+
+    engine.dispose()
+
+
+@pytest.fixture
+def file_token(file_engine):
+    with Session(file_engine) as session:
+        user = UserModel(
+            messages=[],
+            name='Teste',
+            username='teste@test.com',
+            password=get_password_hash('testtest'),
+            id=uuid4(),
+        )
+        session.add(user)
+        session.commit()
+
+        return create_access_token(
+            data={'uid': str(user.id), 'name': user.name, 'sub': user.username}
+        )
+
+
+@pytest.fixture
+def file_client(file_engine):
+    def get_session_override():
+        with Session(file_engine) as session:
+            yield session
+
+    def get_session_factory_override():
+        return sessionmaker(file_engine)
+
+    with TestClient(app) as client:
+        app.dependency_overrides[get_session] = get_session_override
+        app.dependency_overrides[get_session_factory] = (
+            get_session_factory_override
+        )
+        yield client
+
+    app.dependency_overrides.clear()
+    recent_messages.clear()
+    room_list.invalidate()
+    verified_tokens.clear()
+
+
+@pytest.fixture
+def async_client(file_client, file_engine):
+    async_engine = create_async_engine(
+        async_database_url(str(file_engine.url)), poolclass=NullPool
+    )
+    enable_sqlite_foreign_keys(async_engine.sync_engine)
+
+    def get_async_session_factory_override():
+        return async_sessionmaker(async_engine, expire_on_commit=False)
+
+    app.dependency_overrides[get_async_session_factory] = (
+        get_async_session_factory_override
+    )
+
+    return file_client
 
 
 @pytest.fixture
 def session():
-    engine = create_engine(
-        'sqlite:///:memory:',
-        connect_args={'check_same_thread': False},
-        poolclass=StaticPool,
+    engine = enable_sqlite_foreign_keys(
+        create_engine(
+            'sqlite:///:memory:',
+            connect_args={'check_same_thread': False},
+            poolclass=StaticPool,
+        )
     )
     table_registry.metadata.create_all(engine)
 
@@ -0,0 +1,157 @@
+import json
+import socket
+from datetime import datetime
+
+import anyio
+import pytest
+
+from chat_realtime_api.api.v1.routers.ws.manager import (
+    ConnectionManager,
+    Message,
+)
+from chat_realtime_api.infra.broker.base import Envelope
+from chat_realtime_api.infra.broker.factory import create_broker
+from chat_realtime_api.infra.broker.memory import MemoryBroker
+from chat_realtime_api.infra.broker.postgres import PostgresBroker, conninfo
+from chat_realtime_api.infra.broker.unix import UnixSocketBroker
+from chat_realtime_api.infra.config.settings import Settings
+
+
+class FakeWebSocket:
+    async def accept(self):
+        pass
+
+
+def message(content):
+    return Message(content=content, user='Teste', timestamp=datetime.now())
+
+
+async def received(connection):
+    with anyio.fail_after(1):
+        frame, _ = await connection.queue.get()
+
+    return json.loads(frame)['content']
+
+
+@pytest.fixture
+async def workers(tmp_path):
+    managers = [
+        ConnectionManager(broker=UnixSocketBroker(str(tmp_path)))
+        for _ in range(2)
+    ]
+    for manager in managers:
+        await manager.start()
+
+    yield managers
+
+    for manager in managers:
+        await manager.stop()
+
+
+def test_envelope_round_trip():
+    envelope = Envelope(room_id='room', frame='{}', origin='a', exclude=[1])
+
+    assert Envelope.decode(envelope.encode()) == envelope
+
+
+def test_delivery_failures_are_logged(caplog):
+    broker = MemoryBroker()
+
+    def fail(envelope):
+        raise RuntimeError('boom')
+
+    broker.subscribe(fail)
+    broker.deliver(b'not json')
+    broker.deliver(Envelope(room_id='room', frame='{}', origin='a').encode())
+
+    messages = [record.getMessage() for record in caplog.records]
+    assert messages == [
+        "MemoryBroker received an undecodable payload: b'not json'",
+        'MemoryBroker failed to dispatch a message to room room',
+    ]
+    assert all(record.exc_info for record in caplog.records)
+
+
+@pytest.mark.parametrize(
+    ('backend', 'broker_class'),
+    [
+        ('memory', MemoryBroker),
+        ('postgres', PostgresBroker),
+        ('unix', UnixSocketBroker),
+    ],
+)
+def test_create_broker(backend, broker_class):
+    settings = Settings(
+        DATABASE_URL='postgresql+psycopg://user:pass@db:5432/chat',
+        BROKER_BACKEND=backend,
+    )
+
+    assert isinstance(create_broker(settings), broker_class)
+
+
+def test_postgres_broker_fits_the_longest_message():
+    manager = ConnectionManager(
+        broker=PostgresBroker('postgresql://user:pass@db:5432/chat', 'chat')
+    )
+    limit = Settings().WS_MAX_MESSAGE_LENGTH
+
+    assert manager.fits('room', message('"' * limit), exclude={1})
+    assert not manager.fits('room', message('"' * 4 * limit), exclude={1})
+
+
+@pytest.mark.anyio
+async def test_postgres_broker_rejects_oversized_payloads():
+    broker = PostgresBroker('postgresql://user:pass@db:5432/chat', 'chat')
+    envelope = Envelope(room_id='room', frame='x' * 8000, origin='a')
+
+    with pytest.raises(ValueError, match='NOTIFY limit'):
+        await broker.publish(envelope)
+
+
+def test_postgres_conninfo():
+    assert (
+        conninfo('postgresql+psycopg2://user:pass@db:5432/chat')
+        == 'postgresql://user:pass@db:5432/chat'
+    )
+
+
+@pytest.mark.anyio
+async def test_unix_broker_fans_out_across_workers(workers):
+    first, second = workers
+    sender = await first.connect('room', FakeWebSocket())
+    local = await first.connect('room', FakeWebSocket())
+    remote = await second.connect('room', FakeWebSocket())
+    other_room = await second.connect('other', FakeWebSocket())
+
+    await first.broadcast('room', message('Hello'), exclude={sender.id})
+
+    assert await received(local) == 'Hello'
+    assert await received(remote) == 'Hello'
+    assert sender.queue.empty()
+    assert other_room.queue.empty()
+
+
+@pytest.mark.anyio
+async def test_unix_broker_exclude_is_local_to_origin(workers):
+    first, second = workers
+    sender = await first.connect('room', FakeWebSocket())
+    remote = await second.connect('room', FakeWebSocket())
+    assert remote.id != sender.id
+
+    await first.broadcast('room', message('Hello'), exclude={remote.id})
+
+    assert await received(remote) == 'Hello'
+
+
+@pytest.mark.anyio
+async def test_unix_broker_removes_stale_peers(tmp_path, workers):
+    first, _ = workers
+    stale = tmp_path / 'stale.sock'
+    sock = socket.socket(socket.AF_UNIX, socket.SOCK_DGRAM)
+    sock.bind(str(stale))
+    sock.close()
+
+    await first.broadcast('room', message('Hello'))
+
+    assert not stale.exists()
+    assert len(first.broker.peers()) == len(workers)
@@ -0,0 +1,286 @@
+import asyncio
+from http import HTTPStatus
+from threading import Event, Timer
+
+import anyio
+import pytest
+from sqlalchemy import exc, text
+
+from chat_realtime_api.infra.config.security import PasswordHasher
+from chat_realtime_api.infra.config.settings import Settings, get_settings
+from chat_realtime_api.infra.db.executor import BoundedExecutor
+from chat_realtime_api.infra.db.session import (
+    Database,
+    InstrumentedAsyncAdaptedQueuePool,
+    InstrumentedQueuePool,
+    async_database_url,
+)
+from chat_realtime_api.infra.db.warmup import Warmup, hot_calls, warmup
+from chat_realtime_api.infra.models.base import table_registry
+from chat_realtime_api.repositories.messages import MessageRepository
+from chat_realtime_api.repositories.rooms import RoomRepository
+from chat_realtime_api.repositories.users import UserRepository
+from chat_realtime_api.services.errors.exceptions import (
+    ExecutorSaturatedException,
+)
+
+
+@pytest.fixture
+def database(tmp_path):
+    database = Database()
+    database.init(
+        Settings(
+            DATABASE_URL=f'sqlite:///{tmp_path / "db.sqlite"}',
+            DB_POOL_SIZE=1,
+            DB_MAX_OVERFLOW=0,
+            DB_POOL_TIMEOUT=0.1,
+        )
+    )
+
+    yield database
+
+    asyncio.run(database.dispose())
+
+
+def test_engine_is_created_once(database):
+    engine = database.engine
+
+    assert database.init() is engine
+    assert isinstance(engine.pool, InstrumentedQueuePool)
+
+
+def test_pool_stats_checked_out(database):
+    with database.session_factory() as session:
+        session.execute(text('SELECT 1'))
+        assert database.pool_stats().checked_out == 1
+
+    stats = database.pool_stats()
+    assert stats.checked_out == 0
+    assert stats.checked_in == 1
+
+
+def test_pool_stats_waits(database):
+    with database.engine.connect():
+        with pytest.raises(exc.TimeoutError):
+            database.engine.connect()
+
+    stats = database.pool_stats()
+    assert stats.waits == 1
+    assert stats.timeouts == 1
+    assert stats.wait_time > 0
+
+
+def test_pgbouncer_mode_uses_null_pool(tmp_path):
+    database = Database()
+    database.init(
+        Settings(
+            DATABASE_URL=f'sqlite:///{tmp_path / "db.sqlite"}',
+            DB_PGBOUNCER=True,
+        )
+    )
+
+    assert database.pool_stats().pool == 'NullPool'
+
+    asyncio.run(database.dispose())
+
+
+def test_async_engine_is_created_when_enabled(tmp_path):
+    database = Database()
+    database.init(
+        Settings(
+            DATABASE_URL=f'sqlite:///{tmp_path / "db.sqlite"}',
+            DB_ASYNC=True,
+        )
+    )
+
+    assert isinstance(
+        database.async_engine.pool, InstrumentedAsyncAdaptedQueuePool
+    )
+    assert database.async_pool_stats().checked_out == 0
+
+    asyncio.run(database.dispose())
+
+
+@pytest.mark.parametrize(
+    ('database_url', 'expected'),
+    [
+        ('postgresql://u:p@db/chat', 'postgresql+psycopg://u:p@db/chat'),
+        (
+            'postgresql+psycopg2://u:p@db/chat',
+            'postgresql+psycopg://u:p@db/chat',
+        ),
+        (
+            'postgresql+psycopg://u:p@db/chat',
+            'postgresql+psycopg://u:p@db/chat',
+        ),
+        ('sqlite:///chat.db', 'sqlite+aiosqlite:///chat.db'),
+    ],
+)
+def test_async_database_url(database_url, expected):
+    assert (
+        async_database_url(database_url).render_as_string(hide_password=False)
+        == expected
+    )
+
+
+@pytest.mark.anyio
+async def test_executor_runs_blocking_calls():
+    executor = BoundedExecutor(max_workers=2, max_queue=2)
+
+    assert await executor.run(sum, [1, 2, 3]) == 6  # noqa: PLR2004
+    assert executor.stats().completed == 1
+
+    executor.shutdown()
+
+
+@pytest.mark.anyio
+async def test_executor_rejects_when_saturated():
+    executor = BoundedExecutor(max_workers=1, max_queue=1)
+    started = Event()
+    release = Event()
+
+    def block():
+        started.set()
+        release.wait()
+
+    async with anyio.create_task_group() as task_group:
+        try:
+            task_group.start_soon(executor.run, block)
+            assert await anyio.to_thread.run_sync(started.wait, 5)
+
+            task_group.start_soon(executor.run, block)
+            with anyio.fail_after(5):
+                while executor.stats().queued == 0:
+                    await anyio.sleep(0)
+
+            with pytest.raises(ExecutorSaturatedException):
+                await executor.run(block)
+
+            stats = executor.stats()
+            assert stats.running == 1
+            assert stats.queued == 1
+            assert stats.rejected == 1
+            assert stats.saturation == 1.0
+        finally:
+            release.set()
+
+    assert executor.stats().completed == 2  # noqa: PLR2004
+    executor.shutdown()
+
+
+def test_settings_are_parsed_once(monkeypatch):
+    settings = get_settings()
+    monkeypatch.setenv('DB_POOL_SIZE', '99')
+
+    database = Database()
+    database.init()
+
+    assert get_settings() is settings
+    assert database.settings is settings
+    database.engine.dispose()
+
+
+@pytest.mark.anyio
+async def test_dispose_does_not_block_the_event_loop(tmp_path):
+    database = Database()
+    database.init(Settings(DATABASE_URL=f'sqlite:///{tmp_path / "db.sqlite"}'))
+    started = Event()
+    release = Event()
+    fallback = Timer(5, release.set)
+
+    def block():
+        started.set()
+        release.wait()
+
+    fallback.start()
+    async with anyio.create_task_group() as task_group:
+        try:
+            task_group.start_soon(database.executor.run, block)
+            assert await anyio.to_thread.run_sync(started.wait, 5)
+
+            task_group.start_soon(database.dispose)
+            for _ in range(10):
+                await anyio.sleep(0)
+
+            assert not release.is_set()
+        finally:
+            release.set()
+            fallback.cancel()
+
+    assert database.engine is None
+
+
+@pytest.mark.anyio
+@pytest.mark.parametrize(('db_async', 'engines'), [(False, 1), (True, 2)])
+async def test_warmup_opens_connections_and_runs_hot_statements(
+    tmp_path, db_async, engines
+):
+    settings = Settings(
+        DATABASE_URL=f'sqlite:///{tmp_path / "db.sqlite"}',
+        DB_POOL_SIZE=3,
+        DB_ASYNC=db_async,
+        WARMUP_ENABLED=True,
+        WARMUP_CONNECTIONS=2,
+    )
+    database = Database()
+    database.init(settings)
+    table_registry.metadata.create_all(database.engine)
+    hasher = PasswordHasher()
+    warmup = Warmup()
+
+    warmup.start(settings, database, hasher)
+    assert not warmup.stats().ready
+    await warmup.wait()
+
+    stats = warmup.stats()
+    assert stats.ready
+    assert stats.error is None
+    assert stats.connections == 2 * engines
+    assert (
+        stats.statements
+        == len(
+            hot_calls(MessageRepository(), RoomRepository(), UserRepository())
+        )
+        * engines
+    )
+    assert database.pool_stats().checked_in == 2  # noqa: PLR2004
+    assert hasher.stats().completed == 1
+
+    await warmup.stop()
+    hasher.shutdown()
+    await database.dispose()
+
+
+@pytest.mark.anyio
+async def test_failed_warmup_is_not_ready(tmp_path):
+    settings = Settings(
+        DATABASE_URL=f'sqlite:///{tmp_path / "db.sqlite"}',
+        WARMUP_ENABLED=True,
+    )
+    database = Database()
+    database.init(settings)
+    hasher = PasswordHasher()
+    warmup = Warmup()
+
+    warmup.start(settings, database, hasher)
+    await warmup.wait()
+
+    stats = warmup.stats()
+    assert not stats.ready
+    assert 'no such table' in stats.error
+    assert hasher.stats().completed == 0
+
+    await warmup.stop()
+    hasher.shutdown()
+    await database.dispose()
+
+
+def test_readiness_waits_for_warmup(client, monkeypatch):
+    assert client.get('/ready').status_code == HTTPStatus.OK
+
+    monkeypatch.setattr(warmup, 'ready', False)
+    response = client.get('/ready')
+
+    assert response.status_code == HTTPStatus.SERVICE_UNAVAILABLE
+    assert response.headers['Retry-After'] == '1'
+    assert client.get('/').status_code == HTTPStatus.OK
@@ -0,0 +1,11 @@
+from http import HTTPStatus
+
+
+def test_get_metrics(client):
+    response = client.get('/api/v1/metrics')
+
+    assert response.status_code == HTTPStatus.OK
+    assert response.json()['db_pool']['pool'] == 'InstrumentedQueuePool'
+    assert response.json()['db_pool']['checked_out'] == 0
+    assert response.json()['db_executor']['rejected'] == 0
+    assert response.json()['websockets']['evicted'] == 0
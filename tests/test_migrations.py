@@ -0,0 +1,131 @@
+from datetime import datetime
+from importlib.util import module_from_spec, spec_from_file_location
+from uuid import uuid4
+
+import pytest
+from alembic import command
+from alembic.config import Config
+from sqlalchemy import create_engine, inspect, text
+
+from chat_realtime_api.infra.models.triggers import MESSAGE_COUNT_TRIGGERS
+
+HISTORY_INDEX = 'ix_messages_room_id_timestamp_id'
+USER_INDEX = 'ix_messages_user_id_timestamp'
+ROOMS_CREATED_INDEX = 'ix_rooms_created_at_id'
+MESSAGE_COUNT_REVISION = (
+    'migrations/versions/8f2d4b6a1e90_add_message_count_to_rooms.py'
+)
+
+
+def load_revision(path):
+    spec = spec_from_file_location('revision', path)
+    revision = module_from_spec(spec)
+    spec.loader.exec_module(revision)
+
+    return revision
+
+
+def normalized(statements):
+    return [' '.join(statement.split()) for statement in statements]
+
+
+@pytest.fixture
+def migrated(tmp_path, monkeypatch):
+    database_url = f'sqlite:///{tmp_path / "migrated.db"}'
+    monkeypatch.setenv('DATABASE_URL', database_url)
+    config = Config('alembic.ini')
+    engine = create_engine(database_url)
+
+    command.upgrade(config, 'head')
+
+    yield config, engine
+
+    engine.dispose()
+
+
+def test_migration_creates_message_indexes(migrated):
+    config, engine = migrated
+    indexes = {
+        index['name'] for index in inspect(engine).get_indexes('messages')
+    }
+    assert {HISTORY_INDEX, USER_INDEX} <= indexes
+
+    command.downgrade(config, 'b71ab88295b1')
+
+    indexes = {
+        index['name'] for index in inspect(engine).get_indexes('messages')
+    }
+    assert not {HISTORY_INDEX, USER_INDEX} & indexes
+
+
+def test_migration_maintains_message_count(migrated):
+    _, engine = migrated
+    user_id, room_id = uuid4().hex, uuid4().hex
+
+    with engine.begin() as connection:
+        connection.execute(
+            text(
+                'INSERT INTO users (id, name, username, password) '
+                "VALUES (:id, 'Teste', 'teste@test.com', 'x')"
+            ),
+            {'id': user_id},
+        )
+        connection.execute(
+            text(
+                'INSERT INTO rooms (id, name, creator_id) '
+                "VALUES (:id, 'Room', :user_id)"
+            ),
+            {'id': room_id, 'user_id': user_id},
+        )
+        connection.execute(
+            text(
+                'INSERT INTO messages '
+                '(id, room_id, user_id, content, timestamp) '
+                "VALUES (:id, :room_id, :user_id, 'Hello', :timestamp)"
+            ),
+            [
+                {
+                    'id': uuid4().hex,
+                    'room_id': room_id,
+                    'user_id': user_id,
+                    'timestamp': datetime.now(),
+                }
+                for _ in range(3)
+            ],
+        )
+        connection.execute(
+            text(
+                'DELETE FROM messages '
+                'WHERE rowid = (SELECT min(rowid) FROM messages)'
+            )
+        )
+
+    with engine.connect() as connection:
+        count = connection.scalar(
+            text('SELECT message_count FROM rooms WHERE id = :id'),
+            {'id': room_id},
+        )
+
+    assert count == 2  # noqa: PLR2004
+
+
+def test_model_triggers_match_the_migration():
+    revision = load_revision(MESSAGE_COUNT_REVISION)
+
+    assert normalized(MESSAGE_COUNT_TRIGGERS['sqlite']) == normalized(
+        revision.SQLITE_TRIGGERS
+    )
+    assert normalized(MESSAGE_COUNT_TRIGGERS['postgresql']) == normalized(
+        revision.POSTGRESQL_TRIGGERS
+    )
+
+
+def test_migration_creates_room_listing_index(migrated):
+    config, engine = migrated
+    indexes = {index['name'] for index in inspect(engine).get_indexes('rooms')}
+    assert ROOMS_CREATED_INDEX in indexes
+
+    command.downgrade(config, '8f2d4b6a1e90')
+
+    indexes = {index['name'] for index in inspect(engine).get_indexes('rooms')}
+    assert ROOMS_CREATED_INDEX not in indexes
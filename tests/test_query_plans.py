@@ -0,0 +1,92 @@
+from datetime import datetime
+from uuid import uuid4
+
+import pytest
+from sqlalchemy import select
+
+from chat_realtime_api.infra.models.messages import MessageModel
+from chat_realtime_api.infra.sqlalchemy_repositories.messages import (
+    cursor_history_query,
+    history_page_query,
+    recent_messages_query,
+)
+from chat_realtime_api.infra.sqlalchemy_repositories.rooms import (
+    rooms_page_query,
+)
+from chat_realtime_api.repositories.messages import MessageCursor
+from chat_realtime_api.repositories.rooms import RoomCursor
+
+HISTORY_INDEX = 'ix_messages_room_id_timestamp_id'
+USER_INDEX = 'ix_messages_user_id_timestamp'
+ROOMS_CREATED_INDEX = 'ix_rooms_created_at_id'
+
+ROOM_ID = uuid4()
+CURSOR = MessageCursor(timestamp=datetime(2024, 1, 1), id=uuid4())
+NAME_CURSOR = RoomCursor(value='Room', id=uuid4())
+CREATED_CURSOR = RoomCursor(value=datetime(2024, 1, 1), id=uuid4())
+
+
+def query_plan(session, query) -> list[str]:
+    engine = session.get_bind()
+    sql = query.compile(engine, compile_kwargs={'literal_binds': True})
+
+    return [
+        row[3]
+        for row in session.connection().exec_driver_sql(
+            f'EXPLAIN QUERY PLAN {sql}'
+        )
+    ]
+
+
+@pytest.mark.parametrize(
+    'query',
+    [
+        history_page_query(ROOM_ID, 3, 10),
+        recent_messages_query(ROOM_ID, 50),
+        cursor_history_query(ROOM_ID, 10, CURSOR, None),
+        cursor_history_query(ROOM_ID, 10, None, CURSOR),
+    ],
+    ids=['page', 'recent', 'before', 'after'],
+)
+def test_history_queries_use_history_index(session, query):
+    plan = query_plan(session, query)
+
+    assert HISTORY_INDEX in plan[0]
+    assert not any('SCAN messages' in step for step in plan)
+    assert not any('TEMP B-TREE' in step for step in plan)
+
+
+def test_user_messages_use_user_index(session):
+    query = (
+        select(MessageModel)
+        .filter(MessageModel.user_id == uuid4())
+        .order_by(MessageModel.timestamp)
+    )
+
+    plan = query_plan(session, query)
+
+    assert USER_INDEX in plan[0]
+    assert not any('TEMP B-TREE' in step for step in plan)
+
+
+@pytest.mark.parametrize(
+    ('query', 'index'),
+    [
+        (rooms_page_query(20, 'name'), 'sqlite_autoindex_rooms'),
+        (
+            rooms_page_query(20, '-name', after=NAME_CURSOR),
+            'sqlite_autoindex_rooms',
+        ),
+        (rooms_page_query(20, 'created_at'), ROOMS_CREATED_INDEX),
+        (
+            rooms_page_query(20, '-created_at', after=CREATED_CURSOR),
+            ROOMS_CREATED_INDEX,
+        ),
+    ],
+    ids=['name', 'name-after', 'created_at', 'created_at-after'],
+)
+def test_room_listing_uses_an_index(session, query, index):
+    plan = query_plan(session, query)
+
+    assert index in plan[0]
+    assert not any('TEMP B-TREE' in step for step in plan)
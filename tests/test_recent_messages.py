@@ -0,0 +1,297 @@
+from datetime import datetime, timedelta
+from uuid import uuid4
+
+from chat_realtime_api.api.v1.routers.ws.manager import ConnectionManager
+from chat_realtime_api.infra.broker.base import Envelope
+from chat_realtime_api.infra.cache.recent_messages import (
+    MESSAGE_OVERHEAD,
+    RecentMessagesCache,
+    recent_messages,
+)
+from chat_realtime_api.infra.cache.repositories import CachedMessageRepository
+from chat_realtime_api.infra.config.settings import Settings
+from chat_realtime_api.infra.sqlalchemy_repositories.messages import (
+    SqlAlchemyMessageRepository,
+)
+from chat_realtime_api.repositories.messages import (
+    MessageRepoInput,
+    MessageRepoOutput,
+    UserRepoOutput,
+)
+
+PER_ROOM = 3
+
+
+def cache_with(**settings):
+    return RecentMessagesCache().init(
+        Settings(
+            RECENT_MESSAGES_PER_ROOM=settings.get('per_room', PER_ROOM),
+            RECENT_MESSAGES_MAX_ROOMS=settings.get('max_rooms', 10),
+            RECENT_MESSAGES_MAX_BYTES=settings.get('max_bytes', 1024 * 1024),
+        )
+    )
+
+
+def message(room_id, second, content=None):
+    return MessageRepoOutput(
+        id=uuid4(),
+        room_id=room_id,
+        user=UserRepoOutput(id=uuid4(), name='Teste'),
+        content=content or f'Message {second}',
+        timestamp=datetime(2024, 1, 1) + timedelta(seconds=second),
+    )
+
+
+def contents(messages):
+    return [msg.content for msg in messages]
+
+
+def history(client, token, room_id, **params):
+    return client.get(
+        f'/api/v1/rooms/{room_id}/history',
+        headers={'Authorization': f'Bearer {token}'},
+        params=params,
+    )
+
+
+def test_join_replay_is_served_from_memory(
+    client_ws, room, seed_messages, assert_max_queries
+):
+    seed_messages(5)
+    room_id = room.id
+
+    with client_ws(room_id) as ws:
+        first = ws.receive_json()
+    hits = recent_messages.stats().hits
+
+    with assert_max_queries(0), client_ws(room_id) as ws:
+        second = ws.receive_json()
+
+    assert second == first
+    assert recent_messages.stats().hits == hits + 1
+
+
+def test_join_replay_includes_new_messages(client_ws, room, seed_messages):
+    seed_messages(2)
+
+    with client_ws(room.id) as ws1, client_ws(room.id) as ws2:
+        ws1.receive_json()
+        ws2.receive_json()
+        ws1.send_json({'content': 'Fresh'})
+        assert ws2.receive_json()['content'] == 'Fresh'
+
+    with client_ws(room.id) as ws:
+        replay = ws.receive_json()
+
+    assert [msg['content'] for msg in replay['messages']] == [
+        'Message 0',
+        'Message 1',
+        'Fresh',
+    ]
+
+
+def test_first_history_page_is_served_from_memory(
+    client, token, room, seed_messages, assert_max_queries
+):
+    seed_messages(12)
+    room_id = room.id
+    first = history(client, token, room_id, size=5)
+
+    with assert_max_queries(1):
+        second = history(client, token, room_id, size=5)
+
+    assert second.json() == first.json()
+    assert second.json()['pagination']['total_messages'] == 12  # noqa: PLR2004
+    assert second.json()['pagination']['total_pages'] == 3  # noqa: PLR2004
+
+
+def test_history_beyond_first_page_reads_the_database(
+    client, token, room, seed_messages
+):
+    seed_messages(12)
+    history(client, token, room.id, size=5)
+
+    response = history(client, token, room.id, page=3, size=5)
+
+    assert [msg['content'] for msg in response.json()['messages']] == [
+        'Message 10',
+        'Message 11',
+    ]
+
+
+def test_ring_buffer_keeps_the_latest_messages_in_order():
+    cache = cache_with()
+    room_id = uuid4()
+    cache.put_recent(room_id, [message(room_id, i) for i in range(5)])
+
+    cache.append(message(room_id, 10))
+    cache.append(message(room_id, 9))
+    cache.append(message(room_id, 1))
+
+    assert contents(cache.get_recent(room_id, PER_ROOM)) == [
+        'Message 4',
+        'Message 9',
+        'Message 10',
+    ]
+    assert contents(cache.get_recent(room_id, 1)) == ['Message 10']
+
+
+def test_first_page_grows_until_full():
+    cache = cache_with()
+    room_id = uuid4()
+    cache.put_first_page(room_id, [message(room_id, 0)], 1)
+
+    for second in range(1, 5):
+        cache.append(message(room_id, second))
+
+    messages, total = cache.get_first_page(room_id, PER_ROOM, True)
+
+    assert contents(messages) == ['Message 0', 'Message 1', 'Message 2']
+    assert total == 5  # noqa: PLR2004
+
+
+def test_least_recently_used_rooms_are_evicted():
+    cache = cache_with(max_rooms=2)
+    rooms = [uuid4() for _ in range(3)]
+
+    cache.put_recent(rooms[0], [message(rooms[0], 0)])
+    cache.put_recent(rooms[1], [message(rooms[1], 0)])
+    cache.get_recent(rooms[0], 1)
+    cache.put_recent(rooms[2], [message(rooms[2], 0)])
+
+    assert cache.get_recent(rooms[1], 1) is None
+    assert cache.get_recent(rooms[0], 1) is not None
+    assert cache.stats().rooms == 2  # noqa: PLR2004
+    assert cache.stats().evictions == 1
+
+
+def test_memory_cap_evicts_cold_rooms():
+    cache = cache_with(max_bytes=MESSAGE_OVERHEAD * 5)
+    rooms = [uuid4() for _ in range(3)]
+
+    for room_id in rooms:
+        cache.put_recent(room_id, [message(room_id, i) for i in range(2)])
+
+    assert cache.get_recent(rooms[0], 1) is None
+    assert cache.stats().bytes <= cache.max_bytes
+    assert cache.stats().messages == 4  # noqa: PLR2004
+
+
+def test_generations_are_dropped_with_evicted_rooms():
+    cache = cache_with(max_rooms=2)
+
+    for second in range(100):
+        room_id = uuid4()
+        with cache.fill(room_id) as generation:
+            cache.put_recent(room_id, [message(room_id, second)], generation)
+        cache.append(message(room_id, second + 1))
+        cache.append(message(uuid4(), second))
+
+    assert cache.stats().rooms == 2  # noqa: PLR2004
+    assert len(cache._generations) <= 2  # noqa: PLR2004
+
+    cache.clear()
+
+    assert not cache._generations
+
+
+def test_generation_outlives_eviction_while_a_fill_is_in_flight():
+    cache = cache_with(max_rooms=1)
+    room_id = uuid4()
+
+    with cache.fill(room_id) as generation:
+        cache.append(message(room_id, 0))
+        cache.put_recent(uuid4(), [message(uuid4(), 0)])
+        cache.put_recent(room_id, [message(room_id, 1)], generation)
+
+    assert cache.get_recent(room_id, 1) is None
+    assert not cache._generations
+
+
+def test_remote_messages_invalidate_the_room():
+    cache = cache_with()
+    room_id = uuid4()
+    cache.put_recent(room_id, [message(room_id, 0)])
+    manager = ConnectionManager()
+    manager.on_remote_message(lambda room: cache.invalidate(room_id))
+
+    manager.deliver(Envelope(room_id=str(room_id), frame='{}', origin='me'))
+
+    assert cache.get_recent(room_id, 1) is None
+    assert cache.stats().bytes == 0
+
+
+def test_metrics_report_cache_hits_and_misses(
+    client, token, room, seed_messages
+):
+    seed_messages(3)
+    history(client, token, room.id)
+    history(client, token, room.id)
+
+    stats = client.get('/api/v1/metrics').json()['recent_messages']
+
+    assert stats['hits'] >= 1
+    assert stats['misses'] >= 1
+    assert stats['rooms'] == 1
+
+
+class SaveDuringRead(SqlAlchemyMessageRepository):
+    def __init__(self, session, writer, msg_input):
+        super().__init__(session)
+        self.writer = writer
+        self.msg_input = msg_input
+
+    def get_recent_messages_by_room_id(self, room_id, limit):
+        messages = super().get_recent_messages_by_room_id(room_id, limit)
+        self.writer.save(self.msg_input)
+        return messages
+
+    def get_history_by_room_id(self, room_id, page, size, include_totals=True):
+        history = super().get_history_by_room_id(
+            room_id, page, size, include_totals
+        )
+        self.writer.save(self.msg_input)
+        return history
+
+
+def test_save_during_a_cache_miss_does_not_store_a_stale_snapshot(
+    session, room, user, seed_messages
+):
+    seed_messages(1)
+    cache = cache_with()
+    writer = CachedMessageRepository(
+        SqlAlchemyMessageRepository(session), cache
+    )
+    msg_input = MessageRepoInput(
+        room_id=room.id, content='New', user_id=user.id, user_name=user.name
+    )
+    racing = CachedMessageRepository(
+        SaveDuringRead(session, writer, msg_input), cache
+    )
+
+    racing.get_recent_messages_by_room_id(room.id, PER_ROOM)
+    recent = writer.get_recent_messages_by_room_id(room.id, PER_ROOM)
+
+    assert contents(recent) == ['Message 0', 'New']
+
+
+def test_save_during_a_first_page_miss_keeps_the_total_fresh(
+    session, room, user, seed_messages
+):
+    seed_messages(1)
+    cache = cache_with()
+    writer = CachedMessageRepository(
+        SqlAlchemyMessageRepository(session), cache
+    )
+    msg_input = MessageRepoInput(
+        room_id=room.id, content='New', user_id=user.id, user_name=user.name
+    )
+    racing = CachedMessageRepository(
+        SaveDuringRead(session, writer, msg_input), cache
+    )
+
+    racing.get_history_by_room_id(room.id, 1, PER_ROOM)
+    history = writer.get_history_by_room_id(room.id, 1, PER_ROOM)
+
+    assert contents(history.messages) == ['Message 0', 'New']
+    assert history.total_messages == 2  # noqa: PLR2004
@@ -1,4 +1,23 @@
+from dataclasses import FrozenInstanceError
+from datetime import datetime, timedelta
 from http import HTTPStatus
+from uuid import UUID, uuid4
+
+import pytest
+from sqlalchemy import delete
+
+from chat_realtime_api.api.v1.schemas.history import HistorySchema
+from chat_realtime_api.infra.cache.rooms import RoomListCache
+from chat_realtime_api.infra.models.messages import MessageModel
+from chat_realtime_api.infra.models.rooms import RoomModel
+from chat_realtime_api.infra.sqlalchemy_repositories.messages import (
+    SqlAlchemyMessageRepository,
+)
+from chat_realtime_api.infra.sqlalchemy_repositories.rooms import (
+    SqlAlchemyRoomRepository,
+)
+from chat_realtime_api.services.rooms.cursor import encode_cursor
+from chat_realtime_api.services.rooms.get_history import GetHistoryService
 
 
 def test_create_room(client, token, user):
@@ -75,7 +94,7 @@ def test_get_rooms(client, token, user):
         headers={'Authorization': f'Bearer {token}'},
     )
     assert response.status_code == HTTPStatus.OK
-    assert len(response.json()) == 1
+    assert len(response.json()['rooms']) == 1
     assert response.json()['rooms'][0]['name'] == room_name
     assert response.json()['rooms'][0]['description'] == room_description
     assert response.json()['rooms'][0]['creator_id'] == str(user.id)
@@ -117,3 +136,381 @@ def test_history_room_without_messages(client, token, user):
     assert response.json()['pagination']['page_size'] == 10  # noqa: PLR2004
     assert response.json()['pagination']['total_pages'] == 0
     assert response.json()['pagination']['total_messages'] == 0
+
+
+def history(client, token, room_id, **params):
+    return client.get(
+        f'/api/v1/rooms/{room_id}/history',
+        headers={'Authorization': f'Bearer {token}'},
+        params=params,
+    )
+
+
+def contents(response):
+    return [msg['content'] for msg in response.json()['messages']]
+
+
+def test_history_pages_are_ordered(client, token, room, seed_messages):
+    seed_messages(25)
+
+    response = history(client, token, room.id, page=3, size=10)
+
+    assert contents(response) == [f'Message {i}' for i in range(20, 25)]
+    assert response.json()['cursors'] is None
+
+
+def test_history_before_cursor(client, token, room, seed_messages):
+    seed_messages(25)
+    last = history(client, token, room.id, page=3, size=10).json()
+    newest = last['messages'][-1]
+    cursor = encode_cursor(
+        datetime.fromisoformat(newest['timestamp']), UUID(newest['id'])
+    )
+
+    response = history(client, token, room.id, before=cursor, size=10)
+    assert contents(response) == [f'Message {i}' for i in range(14, 24)]
+    assert response.json()['pagination'] is None
+
+    cursors = response.json()['cursors']
+    response = history(client, token, room.id, before=cursors['before'])
+    assert contents(response) == [f'Message {i}' for i in range(4, 14)]
+
+    response = history(
+        client, token, room.id, before=response.json()['cursors']['before']
+    )
+    assert contents(response) == [f'Message {i}' for i in range(4)]
+    assert response.json()['cursors']['before'] is None
+
+    response = history(client, token, room.id, after=cursors['after'])
+    assert contents(response) == ['Message 24']
+    assert response.json()['cursors']['after'] is None
+
+
+def test_history_after_cursor(client, token, room, seed_messages):
+    seed_messages(15)
+    first = history(client, token, room.id, page=1, size=1).json()
+    oldest = first['messages'][0]
+    cursor = encode_cursor(
+        datetime.fromisoformat(oldest['timestamp']), UUID(oldest['id'])
+    )
+
+    response = history(client, token, room.id, after=cursor, size=10)
+
+    assert contents(response) == [f'Message {i}' for i in range(1, 11)]
+    assert response.json()['cursors']['before'] is not None
+
+    response = history(
+        client, token, room.id, after=response.json()['cursors']['after']
+    )
+    assert contents(response) == [f'Message {i}' for i in range(11, 15)]
+    assert response.json()['cursors']['after'] is None
+
+
+def test_history_invalid_cursor(client, token, room):
+    response = history(client, token, room.id, before='not-a-cursor')
+
+    assert response.status_code == HTTPStatus.BAD_REQUEST
+    assert response.json()['detail']['error'] == 'InvalidCursor'
+
+
+def test_history_rejects_both_cursors(client, token, room):
+    cursor = encode_cursor(datetime(2024, 1, 1), room.id)
+
+    response = history(client, token, room.id, before=cursor, after=cursor)
+
+    assert response.status_code == HTTPStatus.UNPROCESSABLE_ENTITY
+
+
+def test_room_message_count_follows_inserts_and_deletes(
+    session, room, seed_messages
+):
+    seed_messages(25)
+    session.refresh(room)
+    assert room.message_count == 25  # noqa: PLR2004
+
+    session.execute(
+        delete(MessageModel).where(MessageModel.room_id == room.id)
+    )
+    session.commit()
+    session.refresh(room)
+    assert room.message_count == 0
+
+
+def test_history_total_pages_on_exact_multiple(
+    client, token, room, seed_messages
+):
+    seed_messages(20)
+
+    response = history(client, token, room.id, size=5)
+
+    assert response.json()['pagination']['total_messages'] == 20  # noqa: PLR2004
+    assert response.json()['pagination']['total_pages'] == 4  # noqa: PLR2004
+
+
+def test_history_without_totals(
+    client, token, room, seed_messages, assert_max_queries
+):
+    seed_messages(20)
+    room_id = room.id
+
+    with assert_max_queries(2):
+        response = history(
+            client, token, room_id, size=5, include_totals=False
+        )
+
+    assert len(response.json()['messages']) == 5  # noqa: PLR2004
+    assert response.json()['pagination']['total_pages'] is None
+    assert response.json()['pagination']['total_messages'] is None
+
+
+def test_history_loads_authors_without_extra_queries(
+    client, token, room, seed_messages, assert_max_queries
+):
+    seed_messages(30)
+    room_id = room.id
+
+    with assert_max_queries(3):
+        response = history(client, token, room_id, size=30)
+
+    assert response.json()['messages'][0]['user']['name'] == 'Teste'
+
+
+def test_cursor_history_loads_authors_without_extra_queries(
+    client, token, room, seed_messages, assert_max_queries
+):
+    seed_messages(30)
+    room_id = room.id
+    cursor = encode_cursor(datetime(2025, 1, 1), room_id)
+
+    with assert_max_queries(2):
+        response = history(client, token, room_id, before=cursor, size=30)
+
+    assert len(response.json()['messages']) == 30  # noqa: PLR2004
+
+
+def list_rooms(client, token, **headers):
+    return client.get(
+        '/api/v1/rooms',
+        headers={'Authorization': f'Bearer {token}', **headers},
+    )
+
+
+def test_list_rooms_returns_etag(client, token, room, assert_max_queries):
+    response = list_rooms(client, token)
+    etag = response.headers['etag']
+
+    with assert_max_queries(0):
+        cached = list_rooms(client, token)
+        not_modified = list_rooms(client, token, **{'If-None-Match': etag})
+
+    assert cached.json() == response.json()
+    assert cached.headers['etag'] == etag
+    assert not_modified.status_code == HTTPStatus.NOT_MODIFIED
+    assert not_modified.content == b''
+    assert not_modified.headers['etag'] == etag
+
+
+def test_list_rooms_matches_weak_and_listed_etags(client, token, room):
+    etag = list_rooms(client, token).headers['etag']
+
+    for header in [f'W/{etag}', f'"other", {etag}', '*']:
+        response = list_rooms(client, token, **{'If-None-Match': header})
+        assert response.status_code == HTTPStatus.NOT_MODIFIED
+
+    response = list_rooms(client, token, **{'If-None-Match': '"other"'})
+    assert response.status_code == HTTPStatus.OK
+
+
+def test_creating_a_room_invalidates_the_list(client, token, room):
+    etag = list_rooms(client, token).headers['etag']
+
+    client.post(
+        '/api/v1/rooms',
+        headers={'Authorization': f'Bearer {token}'},
+        json={'name': 'New Room', 'description': 'Fresh'},
+    )
+    response = list_rooms(client, token, **{'If-None-Match': etag})
+
+    assert response.status_code == HTTPStatus.OK
+    assert response.headers['etag'] != etag
+    assert [room['name'] for room in response.json()['rooms']] == [
+        'New Room',
+        'Seeded Room',
+    ]
+
+
+def test_room_list_is_not_cached_across_an_invalidation():
+    cache = RoomListCache()
+    cache.ttl = 60
+    generation = cache.generation
+
+    cache.invalidate()
+    cache.put('', b'{"rooms": []}', generation)
+
+    assert cache.get('') is None
+
+
+def test_room_list_expires():
+    cache = RoomListCache()
+    cache.ttl = 0
+
+    cache.put('', b'{"rooms": []}', cache.generation)
+
+    assert cache.get('') is None
+
+
+@pytest.fixture
+def many_rooms(session, user):
+    names = ['Alpha', 'Beta', 'Bravo', 'Charlie', 'B%_Room']
+    start = datetime(2024, 1, 1)
+
+    for offset, name in enumerate(names):
+        room = RoomModel(
+            name=name, description=None, id=uuid4(), creator_id=user.id
+        )
+        room.created_at = start + timedelta(minutes=offset)
+        session.add(room)
+    session.commit()
+
+    return names
+
+
+def room_names(response):
+    return [room['name'] for room in response.json()['rooms']]
+
+
+def test_list_rooms_pages_by_name(client, token, many_rooms):
+    pages, cursor = [], None
+
+    while True:
+        params = {'size': 2, **({'after': cursor} if cursor else {})}
+        response = client.get(
+            '/api/v1/rooms',
+            headers={'Authorization': f'Bearer {token}'},
+            params=params,
+        )
+        pages.append(room_names(response))
+        cursor = response.json()['next']
+        if cursor is None:
+            break
+
+    assert pages == [['Alpha', 'B%_Room'], ['Beta', 'Bravo'], ['Charlie']]
+
+
+def test_list_rooms_sorted_by_newest(client, token, many_rooms):
+    response = client.get(
+        '/api/v1/rooms',
+        headers={'Authorization': f'Bearer {token}'},
+        params={'sort': '-created_at', 'size': 3},
+    )
+    assert room_names(response) == ['B%_Room', 'Charlie', 'Bravo']
+
+    response = client.get(
+        '/api/v1/rooms',
+        headers={'Authorization': f'Bearer {token}'},
+        params={'sort': '-created_at', 'after': response.json()['next']},
+    )
+    assert room_names(response) == ['Beta', 'Alpha']
+    assert response.json()['next'] is None
+
+
+def test_list_rooms_by_name_prefix(client, token, many_rooms):
+    response = client.get(
+        '/api/v1/rooms',
+        headers={'Authorization': f'Bearer {token}'},
+        params={'name_prefix': 'Br'},
+    )
+    assert room_names(response) == ['Bravo']
+
+    response = client.get(
+        '/api/v1/rooms',
+        headers={'Authorization': f'Bearer {token}'},
+        params={'name_prefix': 'B%_'},
+    )
+    assert room_names(response) == ['B%_Room']
+
+
+def test_list_all_rooms_requires_the_flag(client, token, many_rooms):
+    response = client.get(
+        '/api/v1/rooms',
+        headers={'Authorization': f'Bearer {token}'},
+        params={'size': 1, 'all': True},
+    )
+
+    assert sorted(room_names(response)) == sorted(many_rooms)
+    assert response.json()['next'] is None
+
+
+def test_list_rooms_rejects_foreign_cursors(client, token, many_rooms):
+    response = client.get(
+        '/api/v1/rooms',
+        headers={'Authorization': f'Bearer {token}'},
+        params={'size': 1},
+    )
+
+    response = client.get(
+        '/api/v1/rooms',
+        headers={'Authorization': f'Bearer {token}'},
+        params={'sort': 'created_at', 'after': response.json()['next']},
+    )
+
+    assert response.status_code == HTTPStatus.BAD_REQUEST
+    assert response.json()['detail']['error'] == 'InvalidCursor'
+
+
+def test_list_rooms_page_size_is_capped(client, token):
+    response = client.get(
+        '/api/v1/rooms',
+        headers={'Authorization': f'Bearer {token}'},
+        params={'size': 1000},
+    )
+
+    assert response.status_code == HTTPStatus.UNPROCESSABLE_ENTITY
+
+
+def test_history_fast_path_matches_the_schema(
+    client, token, room, seed_messages
+):
+    seed_messages(15)
+
+    response = history(client, token, room.id, size=10)
+    cursor = response.json()['messages'][-1]
+    cursor_response = history(
+        client,
+        token,
+        room.id,
+        after=encode_cursor(
+            datetime.fromisoformat(cursor['timestamp']), UUID(cursor['id'])
+        ),
+    )
+
+    for body in [response.json(), cursor_response.json()]:
+        assert (
+            HistorySchema.model_validate(body).model_dump(mode='json') == body
+        )
+    assert response.headers['content-type'] == 'application/json'
+
+
+def test_history_passes_repository_messages_through(
+    session, room, seed_messages
+):
+    seed_messages(3)
+    msg_repo = SqlAlchemyMessageRepository(session)
+    room_output = msg_repo.get_history_by_room_id(room.id, 1, 10)
+    msg_repo.get_history_by_room_id = lambda **_: room_output
+
+    history = GetHistoryService(
+        msg_repo, SqlAlchemyRoomRepository(session)
+    ).execute(room.id, 1, 10)
+
+    assert history.messages is room_output.messages
+    assert len({id(msg.user) for msg in history.messages}) == 1
+    assert not hasattr(history.messages[0], '__dict__')
+    with pytest.raises(FrozenInstanceError):
+        history.messages[0].content = 'Changed'
+
+
+def test_history_page_size_is_capped(client, token, room):
+    response = history(client, token, room.id, size=1000)
+
+    assert response.status_code == HTTPStatus.UNPROCESSABLE_ENTITY
@@ -1,4 +1,18 @@
+import asyncio
 from http import HTTPStatus
+from threading import Event, Thread
+from time import sleep, time
+
+from chat_realtime_api.app import app
+from chat_realtime_api.infra.cache.tokens import TokenCache
+from chat_realtime_api.infra.config import security
+from chat_realtime_api.infra.config.security import (
+    PasswordHasher,
+    create_access_token,
+    get_password_hasher,
+)
+from chat_realtime_api.infra.config.settings import Settings
+from chat_realtime_api.infra.db.executor import BoundedExecutor
 
 
 def test_login(client, user):
@@ -25,3 +39,112 @@ def test_refresh_token(client, token):
     assert 'token_type' in data
     assert data['name'] == 'Teste'
     assert data['token_type'] == 'bearer'
+
+
+def test_login_with_async_database(async_client, file_token):
+    response = async_client.post(
+        '/api/v1/auth/login',
+        data={'username': 'teste@test.com', 'password': 'testtest'},
+    )
+
+    assert response.status_code == HTTPStatus.OK
+    assert response.json()['name'] == 'Teste'
+
+
+def test_login_with_wrong_password(client, user):
+    response = client.post(
+        '/api/v1/auth/login',
+        data={'username': user.username, 'password': 'wrong'},
+    )
+
+    assert response.status_code == HTTPStatus.UNAUTHORIZED
+    assert (
+        client.get('/api/v1/metrics').json()['hash_executor']['completed'] >= 1
+    )
+
+
+def test_login_is_rejected_when_hashing_is_saturated(client, user):
+    hasher = PasswordHasher()
+    hasher.executor = BoundedExecutor(
+        max_workers=1, max_queue=0, name='hash', retry_after=7
+    )
+    release = Event()
+    blocker = Thread(
+        target=asyncio.run, args=(hasher.executor.run(release.wait),)
+    )
+    blocker.start()
+    while hasher.stats().running == 0:
+        sleep(0.01)
+    app.dependency_overrides[get_password_hasher] = lambda: hasher
+
+    try:
+        response = client.post(
+            '/api/v1/auth/login',
+            data={'username': user.username, 'password': user.clean_password},
+        )
+    finally:
+        release.set()
+        blocker.join()
+        hasher.shutdown()
+
+    assert response.status_code == HTTPStatus.SERVICE_UNAVAILABLE
+    assert response.headers['Retry-After'] == '7'
+    assert response.json()['detail']['error'] == 'ServiceUnavailable'
+
+
+def test_repeated_requests_reuse_the_verified_token(
+    client, token, monkeypatch
+):
+    headers = {'Authorization': f'Bearer {token}'}
+    client.get('/api/v1/rooms', headers=headers)
+    decoded = []
+    monkeypatch.setattr(
+        security, 'decode', lambda *args, **_: decoded.append(args)
+    )
+
+    response = client.get('/api/v1/rooms', headers=headers)
+
+    assert response.status_code == HTTPStatus.OK
+    assert decoded == []
+    stats = client.get('/api/v1/metrics').json()['tokens']
+    assert stats['hits'] >= 1
+    assert stats['size'] == 1
+
+
+def test_token_without_uid_is_rejected(client):
+    token = create_access_token(data={'name': 'Teste', 'sub': 'a@b.com'})
+
+    response = client.get(
+        '/api/v1/rooms', headers={'Authorization': f'Bearer {token}'}
+    )
+
+    assert response.status_code == HTTPStatus.UNAUTHORIZED
+
+
+def test_token_cache_expires_at_exp():
+    cache = TokenCache().init(Settings(TOKEN_CACHE_MAX_ENTRIES=2))
+    claims = {'uid': '1', 'name': 'Teste', 'username': 'a@b.com'}
+
+    cache.put('expired', claims, time() - 1)
+    cache.put('expiring', claims, time() + 0.05)
+    assert cache.get('expired') is None
+    assert cache.get('expiring') == claims
+
+    sleep(0.1)
+
+    assert cache.get('expiring') is None
+    assert cache.stats().size == 0
+
+
+def test_token_cache_evicts_least_recently_used():
+    cache = TokenCache().init(Settings(TOKEN_CACHE_MAX_ENTRIES=2))
+    claims = {'uid': '1', 'name': 'Teste', 'username': 'a@b.com'}
+
+    for token in ['a', 'b']:
+        cache.put(token, claims, time() + 60)
+    cache.get('a')
+    cache.put('c', claims, time() + 60)
+
+    assert cache.get('b') is None
+    assert cache.get('a') == claims
+    assert cache.stats().evictions == 1
@@ -0,0 +1,166 @@
+from uuid import uuid4
+
+import anyio
+import pytest
+from sqlalchemy import func, select
+
+from chat_realtime_api.infra.models.messages import MessageModel
+from chat_realtime_api.infra.sqlalchemy_repositories.messages import (
+    SqlAlchemyMessageRepository,
+)
+from chat_realtime_api.services.errors.exceptions import RoomNotFoundException
+from chat_realtime_api.services.messages.create import (
+    CreateMessageInput,
+    CreateMessagesService,
+)
+from chat_realtime_api.services.messages.write_behind import (
+    WriteBehindBuffer,
+)
+
+SENDERS = 20
+
+
+def message_input(room_id, user_id, content='Hello'):
+    return CreateMessageInput(
+        room_id=room_id, content=content, user_id=user_id, user_name='Teste'
+    )
+
+
+async def submit_all(buffer, inputs):
+    results = [None] * len(inputs)
+
+    async def submit(index, input):
+        try:
+            results[index] = await buffer.submit(input)
+        except Exception as e:
+            results[index] = e
+
+    async with anyio.create_task_group() as task_group:
+        for index, input in enumerate(inputs):
+            task_group.start_soon(submit, index, input)
+
+    return results
+
+
+@pytest.fixture
+def save_many(session):
+    calls = []
+
+    async def save_many(inputs):
+        calls.append(len(inputs))
+        service = CreateMessagesService(SqlAlchemyMessageRepository(session))
+        return service.execute(inputs)
+
+    save_many.calls = calls
+    return save_many
+
+
+@pytest.mark.anyio
+async def test_concurrent_senders_share_one_commit(
+    session, room, user, save_many, assert_max_queries
+):
+    room_id, user_id = room.id, user.id
+    buffer = WriteBehindBuffer(save_many, interval=0.05, max_batch=100)
+    await buffer.start()
+
+    with assert_max_queries(1):
+        results = await submit_all(
+            buffer,
+            [
+                message_input(room_id, user_id, f'Message {i}')
+                for i in range(SENDERS)
+            ],
+        )
+
+    await buffer.stop()
+
+    assert save_many.calls == [SENDERS]
+    assert [result.content for result in results] == [
+        f'Message {i}' for i in range(SENDERS)
+    ]
+    assert session.scalar(select(func.count(MessageModel.id))) == SENDERS
+    assert buffer.stats().batches == 1
+
+
+@pytest.mark.anyio
+async def test_batches_are_capped_by_max_batch(session, room, user, save_many):
+    room_id, user_id = room.id, user.id
+    buffer = WriteBehindBuffer(save_many, interval=1, max_batch=5)
+    await buffer.start()
+
+    with anyio.fail_after(0.5):
+        await submit_all(
+            buffer, [message_input(room_id, user_id) for _ in range(12)]
+        )
+
+    await buffer.stop()
+
+    assert save_many.calls == [5, 5, 2]
+
+
+@pytest.mark.anyio
+async def test_missing_room_fails_only_its_sender(
+    session, room, user, save_many
+):
+    room_id, user_id = room.id, user.id
+    buffer = WriteBehindBuffer(save_many, interval=0.01, max_batch=100)
+    await buffer.start()
+
+    results = await submit_all(
+        buffer,
+        [
+            message_input(room_id, user_id),
+            message_input(uuid4(), user_id),
+            message_input(room_id, user_id),
+        ],
+    )
+
+    await buffer.stop()
+
+    assert results[0].room_id == room_id
+    assert isinstance(results[1], RoomNotFoundException)
+    assert results[2].room_id == room_id
+    assert (
+        session.scalar(select(func.count(MessageModel.id))) == len(results) - 1
+    )
+
+
+@pytest.mark.anyio
+async def test_stop_flushes_pending_messages(session, room, user, save_many):
+    room_id, user_id = room.id, user.id
+    buffer = WriteBehindBuffer(save_many, interval=60, max_batch=100)
+    await buffer.start()
+
+    async with anyio.create_task_group() as task_group:
+        task_group.start_soon(
+            buffer.submit, message_input(room_id, user_id, 'Last words')
+        )
+        await anyio.sleep(0.01)
+
+        with anyio.fail_after(1):
+            await buffer.stop()
+
+    assert save_many.calls == [1]
+    assert session.scalar(select(MessageModel.content)) == 'Last words'
+
+
+@pytest.mark.anyio
+async def test_failed_batch_fails_every_sender(caplog):
+    async def save_many(inputs):
+        raise RuntimeError('database is down')
+
+    buffer = WriteBehindBuffer(save_many, interval=0.01, max_batch=100)
+    await buffer.start()
+    room_id = uuid4()
+
+    results = await submit_all(
+        buffer, [message_input(room_id, uuid4()) for _ in range(3)]
+    )
+
+    await buffer.stop()
+
+    assert all(isinstance(result, RuntimeError) for result in results)
+    assert buffer.stats().failed == len(results)
+    assert caplog.records[0].getMessage() == (
+        f'Failed to write a batch of 3 messages for rooms {room_id}'
+    )
@@ -1,7 +1,74 @@
+import json
+import random
+from contextlib import ExitStack
+from datetime import datetime
 from http import HTTPStatus
+from uuid import uuid4
 
+import anyio
 import pytest
+from fastapi import status
 from fastapi.websockets import WebSocketDisconnect
+from sqlalchemy import func, select
+
+from chat_realtime_api.api.v1.routers.ws import chat
+from chat_realtime_api.api.v1.routers.ws.manager import (
+    DISCONNECT,
+    DROP_NEWEST,
+    DROP_OLDEST,
+    ConnectionManager,
+    Message,
+)
+from chat_realtime_api.infra.config.settings import get_settings
+from chat_realtime_api.infra.models.messages import MessageModel
+from chat_realtime_api.infra.sqlalchemy_repositories.messages import (
+    SqlAlchemyMessageRepository,
+)
+from chat_realtime_api.infra.sqlalchemy_repositories.rooms import (
+    SqlAlchemyRoomRepository,
+)
+from chat_realtime_api.services.errors.exceptions import RoomNotFoundException
+from chat_realtime_api.services.messages.create import (
+    CreateMessageInput,
+    CreateMessageService,
+    CreateMessagesService,
+)
+from chat_realtime_api.services.messages.get import GetMessageService
+
+IDLE_SOCKETS = 20
+BATCH_SENDERS = 3
+STORM_SOCKETS = 50_000
+
+
+class FakeWebSocket:
+    def __init__(self, delay: float = 0):
+        self.delay = delay
+        self.messages = []
+        self.close_code = None
+
+    async def accept(self):
+        pass
+
+    async def send_text(self, data):
+        await anyio.sleep(self.delay)
+        self.messages.append(json.loads(data))
+
+    async def close(self, code):
+        self.close_code = code
+
+
+def queued(connection):
+    return [
+        json.loads(frame)['content'] for frame, _ in connection.queue._queue
+    ]
+
+
+async def broadcast_all(manager, contents):
+    for content in contents:
+        await manager.broadcast(
+            'room',
+            Message(content=content, user='Teste', timestamp=datetime.now()),
+        )
 
 
 def test_websocket_unauthorized(client, token):
@@ -90,3 +157,367 @@ def test_websocket_broadcast(client, client_ws, token):
         assert message_ws1['content'] == 'User Teste has joined the chat.'
         assert message_ws2['content'] == 'User Teste has joined the chat.'
         assert message_ws3['content'] == 'Hello from Client 1'
+
+
+def test_websocket_rejects_long_messages(
+    client_ws, session, room, monkeypatch
+):
+    monkeypatch.setattr(chat.chat_runtime.settings, 'WS_MAX_MESSAGE_LENGTH', 5)
+
+    with client_ws(room.id) as ws1, client_ws(room.id) as ws2:
+        ws1.receive_json()
+        ws2.send_json({'content': 'Too long'})
+        assert ws2.receive_json() == {'error': 'Message is too long.'}
+
+        ws2.send_json({'content': 'Short'})
+        assert ws1.receive_json()['content'] == 'Short'
+
+    assert session.scalar(select(MessageModel.content)) == 'Short'
+
+
+def test_websocket_replay_keeps_broadcasts_made_while_loading(
+    client_ws, room, user, monkeypatch
+):
+    load = chat.get_room_messages
+    manager = chat.get_chat_runtime().manager
+
+    async def save(content, *factories):
+        msg = await chat.create_message(
+            CreateMessageInput(
+                room_id=room.id,
+                content=content,
+                user_id=user.id,
+                user_name=user.name,
+            ),
+            *factories,
+        )
+        return Message(
+            content=msg.content,
+            user=user.name,
+            timestamp=msg.timestamp,
+            id=msg.id,
+        )
+
+    async def load_during_broadcasts(room_id, limit, *factories):
+        replayed = await save('Before replay', *factories)
+        messages = await load(room_id, limit, *factories)
+        live = await save('After replay', *factories)
+
+        await manager.broadcast(str(room_id), replayed)
+        await manager.broadcast(str(room_id), live)
+
+        return messages
+
+    with client_ws(room.id) as ws1:
+        monkeypatch.setattr(chat, 'get_room_messages', load_during_broadcasts)
+
+        with client_ws(room.id) as ws2:
+            history = ws2.receive_json()['messages']
+            assert [msg['content'] for msg in history] == ['Before replay']
+            assert ws2.receive_json()['content'] == 'After replay'
+
+            ws1.send_json({'content': 'Live'})
+            assert ws2.receive_json()['content'] == 'Live'
+
+
+@pytest.fixture
+def write_behind_batches(session, monkeypatch):
+    settings = get_settings()
+    monkeypatch.setattr(settings, 'WRITE_BEHIND_ENABLED', True)
+    monkeypatch.setattr(settings, 'WRITE_BEHIND_INTERVAL', 5.0)
+    monkeypatch.setattr(settings, 'WRITE_BEHIND_MAX_BATCH', BATCH_SENDERS)
+    batches = []
+
+    async def save_many(inputs):
+        batches.append(sorted(input.content for input in inputs))
+        service = CreateMessagesService(SqlAlchemyMessageRepository(session))
+        return service.execute(inputs)
+
+    monkeypatch.setattr(chat, 'create_messages', save_many)
+
+    return batches
+
+
+def test_websocket_write_behind(
+    write_behind_batches, client, client_ws, session, room
+):
+    contents = [f'Batched {i}' for i in range(BATCH_SENDERS)]
+
+    with ExitStack() as stack:
+        sockets = [
+            stack.enter_context(client_ws(room.id))
+            for _ in range(BATCH_SENDERS)
+        ]
+        for ws, content in zip(sockets, contents):
+            ws.send_json({'content': content})
+
+        for index, ws in enumerate(sockets):
+            received = set()
+            while len(received) < BATCH_SENDERS - 1:
+                frame = ws.receive_json()
+                if frame['content'].startswith('Batched'):
+                    received.add(frame['content'])
+
+            assert write_behind_batches == [contents]
+            assert received == set(contents) - {contents[index]}
+
+        stats = chat.get_chat_runtime().write_behind.stats()
+        assert stats.batches == 1
+        assert stats.messages == BATCH_SENDERS
+
+    assert sorted(session.scalars(select(MessageModel.content))) == contents
+
+
+def test_websocket_async_session(async_client, file_token):
+    headers = {'Authorization': f'Bearer {file_token}'}
+
+    response = async_client.post(
+        '/api/v1/rooms',
+        headers=headers,
+        json={'name': 'Async Room', 'description': 'A room on AsyncSession'},
+    )
+    assert response.status_code == HTTPStatus.CREATED
+    room_id = response.json()['id']
+
+    url = f'/api/v1/chat/{room_id}?token={file_token}'
+    with (
+        async_client.websocket_connect(url) as ws1,
+        async_client.websocket_connect(url) as ws2,
+    ):
+        ws1.send_json({'content': 'Hello from AsyncSession'})
+
+        message_ws2 = ws2.receive_json()
+        assert message_ws2['content'] == 'Hello from AsyncSession'
+        assert message_ws2['user'] == 'Teste'
+
+    response = async_client.get(
+        f'/api/v1/rooms/{room_id}/history', headers=headers
+    )
+    assert response.json()['pagination']['total_messages'] == 1
+
+
+def test_idle_websockets_hold_no_connections(
+    file_client, file_engine, file_token
+):
+    response = file_client.post(
+        '/api/v1/rooms',
+        headers={'Authorization': f'Bearer {file_token}'},
+        json={'name': 'Idle Room', 'description': 'A room of idle sockets'},
+    )
+    room_id = response.json()['id']
+    url = f'/api/v1/chat/{room_id}?token={file_token}'
+
+    with ExitStack() as stack:
+        for _ in range(IDLE_SOCKETS):
+            ws = stack.enter_context(file_client.websocket_connect(url))
+            ws.send_json({'ping': True})
+            assert ws.receive_json() == {'error': 'Invalid message format.'}
+
+        assert file_engine.pool.checkedout() == 0
+
+
+@pytest.mark.anyio
+async def test_broadcast_is_bounded_by_send_timeout():
+    manager = ConnectionManager(send_timeout=0.1)
+    healthy = [FakeWebSocket(delay=0.05) for _ in range(10)]
+    stalled = FakeWebSocket(delay=60)
+
+    with anyio.fail_after(1):
+        async with anyio.create_task_group() as task_group:
+            for websocket in [*healthy, stalled]:
+                connection = await manager.connect('room', websocket)
+                task_group.start_soon(manager.run_writer, 'room', connection)
+
+            await broadcast_all(manager, ['Hello'])
+            await anyio.sleep(0.3)
+            task_group.cancel_scope.cancel()
+
+    assert all(len(websocket.messages) == 1 for websocket in healthy)
+    assert stalled.messages == []
+    assert stalled.close_code == status.WS_1013_TRY_AGAIN_LATER
+    assert len(manager.active_connections['room']) == len(healthy)
+    assert manager.room_stats['room'].evicted == 1
+
+
+@pytest.mark.anyio
+async def test_overflow_drop_oldest():
+    manager = ConnectionManager(queue_size=2, overflow_policy=DROP_OLDEST)
+    connection = await manager.connect('room', FakeWebSocket())
+
+    await broadcast_all(manager, ['1', '2', '3'])
+
+    assert queued(connection) == ['2', '3']
+    assert manager.room_stats['room'].dropped == 1
+
+
+@pytest.mark.anyio
+async def test_overflow_drop_newest():
+    manager = ConnectionManager(queue_size=2, overflow_policy=DROP_NEWEST)
+    connection = await manager.connect('room', FakeWebSocket())
+
+    await broadcast_all(manager, ['1', '2', '3'])
+
+    assert queued(connection) == ['1', '2']
+    assert manager.room_stats['room'].dropped == 1
+
+
+@pytest.mark.anyio
+async def test_overflow_disconnect():
+    manager = ConnectionManager(
+        queue_size=2,
+        overflow_policy=DISCONNECT,
+        overflow_close_code=status.WS_1008_POLICY_VIOLATION,
+    )
+    websocket = FakeWebSocket()
+    connection = await manager.connect('room', websocket)
+
+    await broadcast_all(manager, ['1', '2', '3'])
+    with anyio.fail_after(1):
+        await manager.run_writer('room', connection)
+
+    assert websocket.messages == []
+    assert websocket.close_code == status.WS_1008_POLICY_VIOLATION
+    assert 'room' not in manager.active_connections
+    assert 'room' not in manager.room_stats
+    assert manager.stats().evicted == 1
+
+
+@pytest.mark.anyio
+async def test_broadcast_encodes_frame_once():
+    manager = ConnectionManager()
+    connections = [
+        await manager.connect('room', FakeWebSocket()) for _ in range(3)
+    ]
+
+    await broadcast_all(manager, ['Hello'])
+
+    frames = [connection.queue.get_nowait()[0] for connection in connections]
+    assert all(frame is frames[0] for frame in frames)
+    assert json.loads(frames[0])['content'] == 'Hello'
+
+
+@pytest.mark.anyio
+async def test_join_leave_storm():
+    manager = ConnectionManager()
+
+    with anyio.fail_after(10):
+        connections = [
+            await manager.connect('room', FakeWebSocket())
+            for _ in range(STORM_SOCKETS)
+        ]
+        assert manager.stats().connections == STORM_SOCKETS
+
+        random.shuffle(connections)
+        for connection in connections:
+            assert manager.disconnect('room', connection)
+            assert not manager.disconnect('room', connection)
+
+    assert manager.active_connections == {}
+    assert manager.room_stats == {}
+
+
+@pytest.mark.anyio
+async def test_evictions_during_broadcast_skip_no_recipient():
+    manager = ConnectionManager(queue_size=1, overflow_policy=DISCONNECT)
+    connections = [
+        await manager.connect('room', FakeWebSocket())
+        for _ in range(STORM_SOCKETS)
+    ]
+    slow = connections[::2]
+    for connection in slow:
+        manager.push('room', connection, 'backlog')
+
+    await broadcast_all(manager, ['Hello'])
+
+    assert manager.room_stats['room'].evicted == len(slow)
+    assert manager.stats().connections == STORM_SOCKETS - len(slow)
+    assert all(
+        json.loads(connection.queue.get_nowait()[0])['content'] == 'Hello'
+        for connection in manager.active_connections['room'].values()
+    )
+
+
+def test_websocket_skips_empty_history(client, client_ws, token):
+    response = client.post(
+        '/api/v1/rooms',
+        headers={'Authorization': f'Bearer {token}'},
+        json={'name': 'Replay Room', 'description': 'A room to replay'},
+    )
+    room_id = response.json()['id']
+
+    with client_ws(room_id) as ws1, client_ws(room_id):
+        message = ws1.receive_json()
+
+    assert message['content'] == 'User Teste has joined the chat.'
+
+
+def test_websocket_replay_is_batched_and_bounded(
+    client_ws, room, seed_messages, monkeypatch
+):
+    monkeypatch.setattr(chat.chat_runtime.settings, 'WS_HISTORY_LIMIT', 3)
+    seed_messages(5)
+
+    with client_ws(room.id) as ws:
+        history = ws.receive_json()
+
+    assert [msg['content'] for msg in history['messages']] == [
+        'Message 2',
+        'Message 3',
+        'Message 4',
+    ]
+
+
+def test_recent_messages_use_a_single_statement(
+    session, room, user, seed_messages, assert_max_queries
+):
+    seed_messages(30)
+    room_id, user_name = room.id, user.name
+    service = GetMessageService(
+        SqlAlchemyMessageRepository(session),
+        SqlAlchemyRoomRepository(session),
+    )
+    session.expunge_all()
+
+    with assert_max_queries(1):
+        messages = service.execute(room_id, 10)
+
+    assert [msg.content for msg in messages] == [
+        f'Message {i}' for i in range(20, 30)
+    ]
+    assert all(msg.user.name == user_name for msg in messages)
+
+
+def test_create_message_is_a_single_statement(
+    session, room, user, assert_max_queries
+):
+    room_id, user_id = room.id, user.id
+    service = CreateMessageService(SqlAlchemyMessageRepository(session))
+
+    with assert_max_queries(1):
+        message = service.execute(
+            CreateMessageInput(
+                room_id=room_id,
+                content='Hello',
+                user_id=user_id,
+                user_name='Teste',
+            )
+        )
+
+    assert message.room_id == room_id
+    assert message.content == 'Hello'
+
+
+def test_create_message_in_missing_room(session, user):
+    service = CreateMessageService(SqlAlchemyMessageRepository(session))
+
+    with pytest.raises(RoomNotFoundException):
+        service.execute(
+            CreateMessageInput(
+                room_id=uuid4(),
+                content='Hello',
+                user_id=user.id,
+                user_name='Teste',
+            )
+        )
+
+    assert session.scalar(select(func.count(MessageModel.id))) == 0